@@ -73,5 +73,12 @@ def dev(
     )
 
 
+@app.command()
+def reindex_chats():
+    from open_webui.models.chats import Chats
+
+    typer.echo(f"Indexed {Chats.reindex_chats()} chats for search")
+
+
 if __name__ == "__main__":
     app()
@@ -271,6 +271,29 @@ else:
     except Exception:
         DATABASE_POOL_RECYCLE = 3600
 
+DATABASE_EXECUTOR_MAX_WORKERS = os.environ.get("DATABASE_EXECUTOR_MAX_WORKERS", "")
+
+if DATABASE_EXECUTOR_MAX_WORKERS == "":
+    # Threads beyond the connection pool would only wait on `pool_timeout`
+    DATABASE_EXECUTOR_MAX_WORKERS = (
+        DATABASE_POOL_SIZE + DATABASE_POOL_MAX_OVERFLOW
+        if DATABASE_POOL_SIZE > 0
+        else None
+    )
+else:
+    try:
+        DATABASE_EXECUTOR_MAX_WORKERS = int(DATABASE_EXECUTOR_MAX_WORKERS)
+    except Exception:
+        DATABASE_EXECUTOR_MAX_WORKERS = None
+
+PASSWORD_HASH_MAX_WORKERS = os.environ.get("PASSWORD_HASH_MAX_WORKERS", "")
+
+try:
+    PASSWORD_HASH_MAX_WORKERS = int(PASSWORD_HASH_MAX_WORKERS)
+except Exception:
+    # bcrypt releases the GIL, so threads hash in parallel up to the core count
+    PASSWORD_HASH_MAX_WORKERS = os.cpu_count() or 1
+
 RESET_CONFIG_ON_START = (
     os.environ.get("RESET_CONFIG_ON_START", "False").lower() == "true"
 )
@@ -280,6 +303,69 @@ ENABLE_REALTIME_CHAT_SAVE = (
     os.environ.get("ENABLE_REALTIME_CHAT_SAVE", "False").lower() == "true"
 )
 
+CHAT_SAVE_FLUSH_INTERVAL = os.environ.get("CHAT_SAVE_FLUSH_INTERVAL", "1")
+
+try:
+    CHAT_SAVE_FLUSH_INTERVAL = float(CHAT_SAVE_FLUSH_INTERVAL)
+except Exception:
+    CHAT_SAVE_FLUSH_INTERVAL = 1.0
+
+CHAT_SAVE_FLUSH_BYTES = os.environ.get("CHAT_SAVE_FLUSH_BYTES", "16384")
+
+try:
+    CHAT_SAVE_FLUSH_BYTES = int(CHAT_SAVE_FLUSH_BYTES)
+except Exception:
+    CHAT_SAVE_FLUSH_BYTES = 16384
+
+# Background chat response handlers running at once per worker, and queued
+# beyond that; 0 disables the limit
+CHAT_RESPONSE_MAX_CONCURRENCY = os.environ.get("CHAT_RESPONSE_MAX_CONCURRENCY", "64")
+
+try:
+    CHAT_RESPONSE_MAX_CONCURRENCY = int(CHAT_RESPONSE_MAX_CONCURRENCY)
+except Exception:
+    CHAT_RESPONSE_MAX_CONCURRENCY = 64
+
+CHAT_RESPONSE_MAX_QUEUE = os.environ.get("CHAT_RESPONSE_MAX_QUEUE", "128")
+
+try:
+    CHAT_RESPONSE_MAX_QUEUE = int(CHAT_RESPONSE_MAX_QUEUE)
+except Exception:
+    CHAT_RESPONSE_MAX_QUEUE = 128
+
+# Background chat response handlers per user and worker, running or queued
+CHAT_RESPONSE_MAX_CONCURRENCY_PER_USER = os.environ.get(
+    "CHAT_RESPONSE_MAX_CONCURRENCY_PER_USER", "8"
+)
+
+try:
+    CHAT_RESPONSE_MAX_CONCURRENCY_PER_USER = int(CHAT_RESPONSE_MAX_CONCURRENCY_PER_USER)
+except Exception:
+    CHAT_RESPONSE_MAX_CONCURRENCY_PER_USER = 8
+
+USER_LAST_ACTIVE_FLUSH_INTERVAL = os.environ.get(
+    "USER_LAST_ACTIVE_FLUSH_INTERVAL", "60"
+)
+
+try:
+    USER_LAST_ACTIVE_FLUSH_INTERVAL = float(USER_LAST_ACTIVE_FLUSH_INTERVAL)
+except Exception:
+    USER_LAST_ACTIVE_FLUSH_INTERVAL = 60.0
+
+USER_IDENTITY_CACHE_TTL = os.environ.get("USER_IDENTITY_CACHE_TTL", "30")
+
+try:
+    USER_IDENTITY_CACHE_TTL = float(USER_IDENTITY_CACHE_TTL)
+except Exception:
+    USER_IDENTITY_CACHE_TTL = 30.0
+
+USER_IDENTITY_CACHE_SIZE = os.environ.get("USER_IDENTITY_CACHE_SIZE", "10000")
+
+try:
+    USER_IDENTITY_CACHE_SIZE = int(USER_IDENTITY_CACHE_SIZE)
+except Exception:
+    USER_IDENTITY_CACHE_SIZE = 10000
+
 ####################################
 # REDIS
 ####################################
@@ -332,6 +418,22 @@ WEBSOCKET_MANAGER = os.environ.get("WEBSOCKET_MANAGER", "")
 
 WEBSOCKET_REDIS_URL = os.environ.get("WEBSOCKET_REDIS_URL", REDIS_URL)
 
+WEBSOCKET_PRESENCE_INTERVAL = os.environ.get("WEBSOCKET_PRESENCE_INTERVAL", "0.5")
+
+try:
+    WEBSOCKET_PRESENCE_INTERVAL = float(WEBSOCKET_PRESENCE_INTERVAL)
+except Exception:
+    WEBSOCKET_PRESENCE_INTERVAL = 0.5
+
+WEBSOCKET_PRESENCE_SYNC_INTERVAL = os.environ.get(
+    "WEBSOCKET_PRESENCE_SYNC_INTERVAL", "30"
+)
+
+try:
+    WEBSOCKET_PRESENCE_SYNC_INTERVAL = float(WEBSOCKET_PRESENCE_SYNC_INTERVAL)
+except Exception:
+    WEBSOCKET_PRESENCE_SYNC_INTERVAL = 30.0
+
 AIOHTTP_CLIENT_TIMEOUT = os.environ.get("AIOHTTP_CLIENT_TIMEOUT", "")
 
 if AIOHTTP_CLIENT_TIMEOUT == "":
@@ -356,6 +458,66 @@ else:
     except Exception:
         AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST = 5
 
+MODEL_LIST_REFRESH_INTERVAL = os.environ.get("MODEL_LIST_REFRESH_INTERVAL", "300")
+
+try:
+    MODEL_LIST_REFRESH_INTERVAL = int(MODEL_LIST_REFRESH_INTERVAL)
+except Exception:
+    MODEL_LIST_REFRESH_INTERVAL = 300
+
+AIOHTTP_CLIENT_POOL_LIMIT = os.environ.get("AIOHTTP_CLIENT_POOL_LIMIT", "0")
+
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT = int(AIOHTTP_CLIENT_POOL_LIMIT)
+except Exception:
+    AIOHTTP_CLIENT_POOL_LIMIT = 0
+
+AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = os.environ.get(
+    "AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST", "0"
+)
+
+try:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = int(AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST)
+except Exception:
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST = 0
+
+AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = os.environ.get(
+    "AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT", "30"
+)
+
+try:
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = float(AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT)
+except Exception:
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT = 30.0
+
+AIOHTTP_CLIENT_DNS_CACHE_TTL = os.environ.get("AIOHTTP_CLIENT_DNS_CACHE_TTL", "300")
+
+try:
+    AIOHTTP_CLIENT_DNS_CACHE_TTL = int(AIOHTTP_CLIENT_DNS_CACHE_TTL)
+except Exception:
+    AIOHTTP_CLIENT_DNS_CACHE_TTL = 300
+
+WEBHOOK_QUEUE_SIZE = os.environ.get("WEBHOOK_QUEUE_SIZE", "1000")
+
+try:
+    WEBHOOK_QUEUE_SIZE = int(WEBHOOK_QUEUE_SIZE)
+except Exception:
+    WEBHOOK_QUEUE_SIZE = 1000
+
+WEBHOOK_MAX_RETRIES = os.environ.get("WEBHOOK_MAX_RETRIES", "3")
+
+try:
+    WEBHOOK_MAX_RETRIES = int(WEBHOOK_MAX_RETRIES)
+except Exception:
+    WEBHOOK_MAX_RETRIES = 3
+
+WEBHOOK_TIMEOUT = os.environ.get("WEBHOOK_TIMEOUT", "10")
+
+try:
+    WEBHOOK_TIMEOUT = int(WEBHOOK_TIMEOUT)
+except Exception:
+    WEBHOOK_TIMEOUT = 10
+
 ####################################
 # OFFLINE_MODE
 ####################################
@@ -0,0 +1,87 @@
+import json
+import logging
+import threading
+import uuid
+from typing import Callable, Optional
+
+from open_webui.env import SRC_LOG_LEVELS, WEBSOCKET_MANAGER, WEBSOCKET_REDIS_URL
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["DB"])
+
+
+class InvalidationBus:
+    """
+    Fans cache invalidation events out to every subscriber in this process and,
+    when a Redis URL is configured, to the other workers over Redis pub/sub.
+    """
+
+    CHANNEL = "open-webui:invalidate"
+
+    def __init__(self, redis_url: Optional[str] = None):
+        self.redis_url = redis_url
+        self.sender_id = str(uuid.uuid4())
+
+        self.subscribers: dict[str, list[Callable[[Optional[str]], None]]] = {}
+
+        self.redis = None
+        self.listener = None
+        self.lock = threading.Lock()
+
+    def subscribe(self, name: str, callback: Callable[[Optional[str]], None]):
+        self.subscribers.setdefault(name, []).append(callback)
+        self._start_listener()
+
+    def publish(self, name: str, payload: Optional[str] = None):
+        self._notify(name, payload)
+
+        if self.redis is not None:
+            try:
+                self.redis.publish(
+                    self.CHANNEL,
+                    json.dumps(
+                        {"sender": self.sender_id, "name": name, "payload": payload}
+                    ),
+                )
+            except Exception as e:
+                log.warning(f"Failed to publish invalidation for {name}: {e}")
+
+    def _notify(self, name: str, payload: Optional[str]):
+        for callback in self.subscribers.get(name, []):
+            try:
+                callback(payload)
+            except Exception as e:
+                log.exception(e)
+
+    def _handle_message(self, message):
+        try:
+            data = json.loads(message["data"])
+        except Exception:
+            return
+
+        if data.get("sender") != self.sender_id:
+            self._notify(data.get("name"), data.get("payload"))
+
+    def _start_listener(self):
+        if self.redis_url is None:
+            return
+
+        with self.lock:
+            if self.listener is not None:
+                return
+
+            try:
+                import redis
+
+                self.redis = redis.Redis.from_url(self.redis_url, decode_responses=True)
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.CHANNEL: self._handle_message})
+                self.listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+            except Exception as e:
+                log.warning(f"Cross-worker cache invalidation is unavailable: {e}")
+                self.redis = None
+
+
+invalidation_bus = InvalidationBus(
+    WEBSOCKET_REDIS_URL if WEBSOCKET_MANAGER == "redis" else None
+)
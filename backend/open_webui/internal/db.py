@@ -1,9 +1,13 @@
+import asyncio
+import functools
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from typing import Any, Optional
 
 from open_webui.env import (
+    DATABASE_EXECUTOR_MAX_WORKERS,
     DATABASE_POOL_MAX_OVERFLOW,
     DATABASE_POOL_RECYCLE,
     DATABASE_POOL_SIZE,
@@ -82,3 +86,19 @@ def get_session():
 
 
 get_db = contextmanager(get_session)
+
+
+# Bounded pool for running the synchronous `*Table` methods from async code
+db_executor = ThreadPoolExecutor(
+    max_workers=DATABASE_EXECUTOR_MAX_WORKERS, thread_name_prefix="open-webui-db"
+)
+
+
+async def run_in_db_executor(func, *args, **kwargs):
+    """
+    Runs a blocking database call on `db_executor` so it does not stall the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        db_executor, functools.partial(func, *args, **kwargs)
+    )
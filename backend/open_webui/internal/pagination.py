@@ -0,0 +1,49 @@
+import base64
+import json
+from typing import Any, Optional
+
+from sqlalchemy import tuple_
+
+# Response header carrying the cursor of the next page, when there is one
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encodes the sort key of the last row of a page into an opaque cursor.
+    """
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, length: int = 2) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def after_cursor(columns: list, cursor: str, descending: bool = True):
+    """
+    Filter selecting the rows that come after `cursor` when ordering by `columns`,
+    which lets the database seek through an index instead of skipping rows.
+    """
+    values = decode_cursor(cursor, len(columns))
+
+    if descending:
+        return tuple_(*columns) < tuple_(*values)
+    return tuple_(*columns) > tuple_(*values)
+
+
+def set_next_cursor(response, items: list, limit: Optional[int], *fields: str):
+    """
+    Adds the cursor of the page following `items` to the response headers,
+    unless `items` is a partial (last) page.
+    """
+    if limit and len(items) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            *[getattr(items[-1], field) for field in fields]
+        )
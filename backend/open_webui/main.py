@@ -37,6 +37,7 @@ from starlette.responses import Response
 
 from open_webui.socket.main import (
     app as socket_app,
+    periodic_presence_sync,
     periodic_usage_pool_cleanup,
 )
 from open_webui.routers import (
@@ -56,7 +57,8 @@ from open_webui.routers import (
     utils,
 )
 
-from open_webui.internal.db import Session
+from open_webui.internal.db import Session, run_in_db_executor
+from open_webui.internal.pagination import NEXT_CURSOR_HEADER
 
 from open_webui.models.functions import Functions
 from open_webui.models.models import Models
@@ -130,6 +132,7 @@ from open_webui.config import (
     AppConfig,
     reset_config,
 )
+from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import (
     CHANGELOG,
     GLOBAL_LOG_LEVEL,
@@ -153,12 +156,17 @@ from open_webui.utils.models import (
     get_all_models,
     get_all_base_models,
     check_model_access,
+    model_registry,
 )
 from open_webui.utils.chat import (
     generate_chat_completion as chat_completion_handler,
     chat_action as chat_action_handler,
 )
 from open_webui.utils.middleware import process_chat_payload, process_chat_response
+from open_webui.utils.last_active import last_active_buffer
+from open_webui.utils.message_buffer import message_buffer
+from open_webui.utils.http_client import HTTPClientRegistry
+from open_webui.utils.webhook import webhook_dispatcher
 from open_webui.utils.access_control import has_access
 
 from open_webui.utils.auth import (
@@ -169,7 +177,14 @@ from open_webui.utils.auth import (
 from open_webui.utils.oauth import oauth_manager
 from open_webui.utils.security_headers import SecurityHeadersMiddleware
 
-from open_webui.tasks import stop_task, list_tasks  # Import from tasks.py
+from open_webui.tasks import (  # Import from tasks.py
+    TaskLimitExceeded,
+    get_task,
+    list_tasks,
+    periodic_heartbeat,
+    stop_task,
+    task_limiter,
+)
 
 if SAFE_MODE:
     print("SAFE MODE ENABLED")
@@ -213,9 +228,22 @@ async def lifespan(app: FastAPI):
     if RESET_CONFIG_ON_START:
         reset_config()
 
+    app.state.HTTP_CLIENTS = HTTPClientRegistry()
+    webhook_dispatcher.start(app.state.HTTP_CLIENTS)
+
     asyncio.create_task(periodic_usage_pool_cleanup())
+    asyncio.create_task(periodic_presence_sync())
+    asyncio.create_task(periodic_heartbeat())
+    asyncio.create_task(message_buffer.periodic_flush())
+    asyncio.create_task(last_active_buffer.periodic_flush())
+    asyncio.create_task(model_registry.periodic_refresh(app))
     yield
 
+    await message_buffer.flush_all()
+    await run_in_db_executor(last_active_buffer.flush)
+    await webhook_dispatcher.stop()
+    await app.state.HTTP_CLIENTS.close()
+
 
 app = FastAPI(
     docs_url="/docs" if ENV == "dev" else None,
@@ -395,6 +423,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -439,9 +468,16 @@ async def get_models(request: Request, user=Depends(get_verified_user)):
     t_start = time.time()
 
     def get_filtered_models(models, user):
+        model_infos = {
+            model_info.id: model_info
+            for model_info in Models.get_models_by_ids(
+                [model["id"] for model in models]
+            )
+        }
+
         filtered_models = []
         for model in models:
-            model_info = Models.get_model_by_id(model["id"])
+            model_info = model_infos.get(model["id"])
             if model_info:
                 if user.id == model_info.user_id or has_access(
                     user.id, type="read", access_control=model_info.access_control
@@ -494,8 +530,7 @@ async def chat_completion(
     form_data: dict,
     user=Depends(get_verified_user),
 ):
-    if not request.app.state.MODELS:
-        await get_all_models(request)
+    await get_all_models(request)
 
     tasks = form_data.pop("background_tasks", None)
     try:
@@ -507,7 +542,7 @@ async def chat_completion(
         # Check if user has access to the model
         if not BYPASS_MODEL_ACCESS_CONTROL and user.role == "user":
             try:
-                check_model_access(user, model)
+                await run_in_db_executor(check_model_access, user, model)
             except Exception as e:
                 raise e
 
@@ -521,9 +556,20 @@ async def chat_completion(
         }
         form_data["metadata"] = metadata
 
+        if metadata["session_id"] and metadata["chat_id"] and metadata["message_id"]:
+            # Shed load before opening an upstream stream that the background
+            # response handler could not take on
+            task_limiter.check(user.id)
+
         form_data, events = await process_chat_payload(
             request, form_data, metadata, user, model
         )
+    except TaskLimitExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -535,6 +581,12 @@ async def chat_completion(
         return await process_chat_response(
             request, response, form_data, user, events, metadata, tasks
         )
+    except TaskLimitExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -562,6 +614,13 @@ async def chat_action(
 
 @app.post("/api/tasks/stop/{task_id}")
 async def stop_task_endpoint(task_id: str, user=Depends(get_verified_user)):
+    task = await get_task(task_id)
+    if task and user.role != "admin" and task["user_id"] != user.id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
+        )
+
     try:
         result = await stop_task(task_id)  # Use the function from tasks.py
         return result
@@ -571,7 +630,14 @@ async def stop_task_endpoint(task_id: str, user=Depends(get_verified_user)):
 
 @app.get("/api/tasks")
 async def list_tasks_endpoint(user=Depends(get_verified_user)):
-    return {"tasks": list_tasks()}  # Use the function from tasks.py
+    user_id = None if user.role == "admin" else user.id
+    return {"tasks": await list_tasks(user_id)}  # Use the function from tasks.py
+
+
+@app.get("/api/tasks/metrics")
+async def get_task_metrics(user=Depends(get_admin_user)):
+    # Concurrency and queue depth of this worker's background response handlers
+    return task_limiter.metrics()
 
 
 ##################################
@@ -0,0 +1,33 @@
+"""Add chat message table
+
+Revision ID: 3e0e00844bb0
+Revises: 7826ab40b532
+Create Date: 2025-01-06 03:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "3e0e00844bb0"
+down_revision = "7826ab40b532"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "chat_message",
+        sa.Column("chat_id", sa.Text(), nullable=False),
+        sa.Column("message_id", sa.Text(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=True),
+        sa.Column("seq", sa.BigInteger(), nullable=True),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.Column("updated_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("chat_id", "message_id", name="pk_chat_id_message_id"),
+        sa.UniqueConstraint("chat_id", "seq", name="uq_chat_id_seq"),
+    )
+
+
+def downgrade():
+    op.drop_table("chat_message")
@@ -0,0 +1,150 @@
+"""Add chat search index
+
+Revision ID: 5b1e7a2c9d40
+Revises: d31026856c01
+Create Date: 2025-01-10 01:00:00.000000
+
+"""
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, column
+
+revision = "5b1e7a2c9d40"
+down_revision = "d31026856c01"
+branch_labels = None
+depends_on = None
+
+MAX_CONTENT_LENGTH = 2**18
+
+
+def get_search_content(chat: dict) -> str:
+    messages = chat.get("history", {}).get("messages", {})
+    messages = list(messages.values()) if messages else chat.get("messages", [])
+
+    content = "\n".join(
+        message["content"]
+        for message in messages
+        if isinstance(message, dict) and isinstance(message.get("content"), str)
+    )
+    return content[:MAX_CONTENT_LENGTH]
+
+
+def upgrade():
+    op.create_table(
+        "chat_search",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("chat_id", sa.Text(), nullable=False, unique=True),
+        sa.Column("user_id", sa.Text(), nullable=True),
+        sa.Column("title", sa.Text(), nullable=True),
+        sa.Column("content", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_chat_search_user_id", "chat_search", ["user_id"])
+
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        # External content FTS5 table kept in sync with chat_search by triggers
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE chat_search_fts USING fts5(
+                title, content,
+                content='chat_search', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER chat_search_ai AFTER INSERT ON chat_search BEGIN
+                INSERT INTO chat_search_fts(rowid, title, content)
+                VALUES (new.id, new.title, new.content);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER chat_search_ad AFTER DELETE ON chat_search BEGIN
+                INSERT INTO chat_search_fts(chat_search_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER chat_search_au AFTER UPDATE ON chat_search BEGIN
+                INSERT INTO chat_search_fts(chat_search_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO chat_search_fts(rowid, title, content)
+                VALUES (new.id, new.title, new.content);
+            END
+            """
+        )
+    elif conn.dialect.name == "postgresql":
+        op.execute(
+            """
+            ALTER TABLE chat_search ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(content, ''))
+            ) STORED
+            """
+        )
+        op.execute(
+            "CREATE INDEX chat_search_vector_idx ON chat_search USING GIN (search_vector)"
+        )
+
+    # Backfill the index from the existing chats
+    chat = table(
+        "chat",
+        column("id", sa.String()),
+        column("user_id", sa.String()),
+        column("title", sa.Text()),
+        column("chat", sa.JSON()),
+    )
+    chat_search = table(
+        "chat_search",
+        column("chat_id", sa.Text()),
+        column("user_id", sa.Text()),
+        column("title", sa.Text()),
+        column("content", sa.Text()),
+    )
+
+    result = conn.execute(
+        sa.select(chat.c.id, chat.c.user_id, chat.c.title, chat.c.chat).where(
+            chat.c.user_id.notlike("shared-%")
+        )
+    )
+
+    rows = []
+    for id, user_id, title, chat_data in result:
+        if isinstance(chat_data, str):
+            chat_data = json.loads(chat_data)
+
+        rows.append(
+            {
+                "chat_id": id,
+                "user_id": user_id,
+                "title": title,
+                "content": get_search_content(chat_data or {}),
+            }
+        )
+
+        if len(rows) >= 500:
+            op.bulk_insert(chat_search, rows)
+            rows = []
+
+    if rows:
+        op.bulk_insert(chat_search, rows)
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS chat_search_au")
+        op.execute("DROP TRIGGER IF EXISTS chat_search_ad")
+        op.execute("DROP TRIGGER IF EXISTS chat_search_ai")
+        op.execute("DROP TABLE IF EXISTS chat_search_fts")
+
+    op.drop_index("ix_chat_search_user_id", table_name="chat_search")
+    op.drop_table("chat_search")
@@ -0,0 +1,77 @@
+"""Add chat tag table
+
+Revision ID: 8f3c6d1a2b57
+Revises: 5b1e7a2c9d40
+Create Date: 2025-01-11 01:00:00.000000
+
+"""
+
+import json
+import time
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, column
+
+revision = "8f3c6d1a2b57"
+down_revision = "5b1e7a2c9d40"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "chat_tag",
+        sa.Column("chat_id", sa.Text(), nullable=False),
+        sa.Column("tag_id", sa.Text(), nullable=False),
+        sa.Column("user_id", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("chat_id", "tag_id", name="pk_chat_id_tag_id"),
+    )
+    op.create_index("chat_tag_user_id_tag_id_idx", "chat_tag", ["user_id", "tag_id"])
+
+    # Backfill from the `tags` list in each chat's meta
+    chat = table(
+        "chat",
+        column("id", sa.String()),
+        column("user_id", sa.String()),
+        column("meta", sa.JSON()),
+    )
+    chat_tag = table(
+        "chat_tag",
+        column("chat_id", sa.Text()),
+        column("tag_id", sa.Text()),
+        column("user_id", sa.Text()),
+        column("created_at", sa.BigInteger()),
+    )
+
+    conn = op.get_bind()
+    now = int(time.time())
+
+    result = conn.execute(
+        sa.select(chat.c.id, chat.c.user_id, chat.c.meta).where(
+            chat.c.user_id.notlike("shared-%")
+        )
+    )
+
+    rows = []
+    for id, user_id, meta in result:
+        if isinstance(meta, str):
+            meta = json.loads(meta)
+
+        for tag_id in dict.fromkeys((meta or {}).get("tags", [])):
+            rows.append(
+                {"chat_id": id, "tag_id": tag_id, "user_id": user_id, "created_at": now}
+            )
+
+        if len(rows) >= 500:
+            op.bulk_insert(chat_tag, rows)
+            rows = []
+
+    if rows:
+        op.bulk_insert(chat_tag, rows)
+
+
+def downgrade():
+    op.drop_index("chat_tag_user_id_tag_id_idx", table_name="chat_tag")
+    op.drop_table("chat_tag")
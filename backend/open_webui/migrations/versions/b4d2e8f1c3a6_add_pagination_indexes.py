@@ -0,0 +1,33 @@
+"""Add pagination indexes
+
+Revision ID: b4d2e8f1c3a6
+Revises: 8f3c6d1a2b57
+Create Date: 2025-01-12 00:00:00.000000
+
+"""
+
+from alembic import op
+
+revision = "b4d2e8f1c3a6"
+down_revision = "8f3c6d1a2b57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Composite indexes matching the (sort key, id) cursors of the list endpoints
+    op.create_index(
+        "chat_user_id_updated_at_id_idx", "chat", ["user_id", "updated_at", "id"]
+    )
+    op.create_index(
+        "message_channel_id_created_at_id_idx",
+        "message",
+        ["channel_id", "created_at", "id"],
+    )
+    op.create_index("feedback_updated_at_id_idx", "feedback", ["updated_at", "id"])
+
+
+def downgrade():
+    op.drop_index("feedback_updated_at_id_idx", table_name="feedback")
+    op.drop_index("message_channel_id_created_at_id_idx", table_name="message")
+    op.drop_index("chat_user_id_updated_at_id_idx", table_name="chat")
@@ -0,0 +1,61 @@
+"""Add secondary indexes
+
+Revision ID: c7a9e2d4f5b8
+Revises: b4d2e8f1c3a6
+Create Date: 2025-01-12 01:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "c7a9e2d4f5b8"
+down_revision = "b4d2e8f1c3a6"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns), matching the filters and orderings used in `models/`
+INDEXES = [
+    (
+        "chat_user_id_folder_id_updated_at_idx",
+        "chat",
+        ["user_id", "folder_id", "updated_at"],
+    ),
+    (
+        "chat_user_id_archived_pinned_updated_at_idx",
+        "chat",
+        ["user_id", "archived", "pinned", "updated_at"],
+    ),
+    ("message_parent_id_created_at_idx", "message", ["parent_id", "created_at"]),
+    ("message_reaction_message_id_idx", "message_reaction", ["message_id"]),
+    ("feedback_user_id_updated_at_idx", "feedback", ["user_id", "updated_at"]),
+    ("feedback_type_updated_at_idx", "feedback", ["type", "updated_at"]),
+    ("folder_user_id_parent_id_idx", "folder", ["user_id", "parent_id"]),
+]
+
+
+def get_existing_indexes():
+    """
+    Yields the indexes whose table and columns exist, as some columns (e.g.
+    `message.parent_id`) are only present in databases created from the models.
+    """
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    for name, table_name, columns in INDEXES:
+        if table_name not in tables:
+            continue
+
+        existing_columns = {c["name"] for c in inspector.get_columns(table_name)}
+        if set(columns) <= existing_columns:
+            yield name, table_name, columns
+
+
+def upgrade():
+    for name, table_name, columns in get_existing_indexes():
+        op.create_index(name, table_name, columns)
+
+
+def downgrade():
+    for name, table_name, _ in reversed(list(get_existing_indexes())):
+        op.drop_index(name, table_name=table_name)
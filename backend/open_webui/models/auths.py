@@ -1,9 +1,10 @@
 import logging
+import time
 import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, get_db
-from open_webui.models.users import UserModel, Users
+from open_webui.models.users import User, UserModel, Users
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel
 from sqlalchemy import Boolean, Column, String, Text
@@ -127,6 +128,43 @@ class AuthsTable:
             else:
                 return None
 
+    def insert_new_auths(self, form_data: list[AddUserForm]) -> list[UserModel]:
+        """
+        Inserts users whose `password` is already hashed, all in one transaction.
+        """
+        with get_db() as db:
+            log.info(f"insert_new_auths: {len(form_data)}")
+
+            users = [
+                UserModel(
+                    id=str(uuid.uuid4()),
+                    name=form.name,
+                    email=form.email,
+                    role=form.role,
+                    profile_image_url=form.profile_image_url,
+                    last_active_at=int(time.time()),
+                    created_at=int(time.time()),
+                    updated_at=int(time.time()),
+                )
+                for form in form_data
+            ]
+
+            db.add_all(
+                [
+                    Auth(
+                        id=user.id,
+                        email=user.email,
+                        password=form.password,
+                        active=True,
+                    )
+                    for user, form in zip(users, form_data)
+                ]
+            )
+            db.add_all([User(**user.model_dump()) for user in users])
+            db.commit()
+
+            return users
+
     def authenticate_user(self, email: str, password: str) -> Optional[UserModel]:
         log.info(f"authenticate_user: {email}")
         try:
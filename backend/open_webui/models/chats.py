@@ -1,15 +1,30 @@
 import json
+import re
 import time
 import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, get_db
+from open_webui.internal.pagination import after_cursor
 from open_webui.models.tags import TagModel, Tag, Tags
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    JSON,
+    PrimaryKeyConstraint,
+    UniqueConstraint,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import or_, func, select, and_, text, column
 from sqlalchemy.sql import exists
 
 ####################
@@ -35,6 +50,92 @@ class Chat(Base):
     meta = Column(JSON, server_default="{}")
     folder_id = Column(Text, nullable=True)
 
+    __table_args__ = (
+        # Keyset pagination of a user's chats by (updated_at, id)
+        Index("chat_user_id_updated_at_id_idx", "user_id", "updated_at", "id"),
+        Index(
+            "chat_user_id_folder_id_updated_at_idx",
+            "user_id",
+            "folder_id",
+            "updated_at",
+        ),
+        Index(
+            "chat_user_id_archived_pinned_updated_at_idx",
+            "user_id",
+            "archived",
+            "pinned",
+            "updated_at",
+        ),
+    )
+
+
+class ChatMessage(Base):
+    __tablename__ = "chat_message"
+
+    # Pending per-message updates, folded into `Chat.chat` on compaction
+    chat_id = Column(Text)
+    message_id = Column(Text)
+    data = Column(JSON)
+    # Order of the updates within a chat, the last one being the current message
+    seq = Column(BigInteger)
+
+    created_at = Column(BigInteger)
+    updated_at = Column(BigInteger)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("chat_id", "message_id", name="pk_chat_id_message_id"),
+        UniqueConstraint("chat_id", "seq", name="uq_chat_id_seq"),
+    )
+
+
+# Attempts at a message update that races other updates of the same chat
+UPSERT_MESSAGE_RETRIES = 5
+
+
+class ChatTag(Base):
+    __tablename__ = "chat_tag"
+
+    # Mirrors `Chat.meta["tags"]` so that tag lookups can use an index
+    chat_id = Column(Text, nullable=False)
+    tag_id = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+
+    created_at = Column(BigInteger)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("chat_id", "tag_id", name="pk_chat_id_tag_id"),
+        Index("chat_tag_user_id_tag_id_idx", "user_id", "tag_id"),
+    )
+
+
+class ChatSearch(Base):
+    __tablename__ = "chat_search"
+
+    # Full-text search document per chat, indexed by the `chat_search_fts` FTS5
+    # table on SQLite and by the `search_vector` GIN index on PostgreSQL
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    chat_id = Column(Text, unique=True, nullable=False)
+    user_id = Column(Text, index=True)
+
+    title = Column(Text)
+    content = Column(Text)
+
+
+# Large chats are only indexed up to this many characters of message content
+CHAT_SEARCH_MAX_CONTENT_LENGTH = 2**18
+
+
+def get_chat_search_content(chat: dict) -> str:
+    messages = chat.get("history", {}).get("messages", {})
+    messages = list(messages.values()) if messages else chat.get("messages", [])
+
+    content = "\n".join(
+        message["content"]
+        for message in messages
+        if isinstance(message, dict) and isinstance(message.get("content"), str)
+    )
+    return content[:CHAT_SEARCH_MAX_CONTENT_LENGTH]
+
 
 class ChatModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -55,6 +156,59 @@ class ChatModel(BaseModel):
     folder_id: Optional[str] = None
 
 
+class ChatListModel(BaseModel):
+    """
+    A chat row without the `chat` blob, for list views.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    user_id: str
+    title: str
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+    share_id: Optional[str] = None
+    archived: bool = False
+    pinned: Optional[bool] = False
+
+    meta: dict = {}
+    folder_id: Optional[str] = None
+
+
+class ChatSearchResultModel(ChatListModel):
+    # Relevance of the match, lower is better; None when not searching text
+    rank: Optional[float] = None
+
+
+CHAT_LIST_COLUMNS = (
+    Chat.id,
+    Chat.user_id,
+    Chat.title,
+    Chat.created_at,
+    Chat.updated_at,
+    Chat.share_id,
+    Chat.archived,
+    Chat.pinned,
+    Chat.meta,
+    Chat.folder_id,
+)
+
+
+class ChatMessageModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    chat_id: str
+    message_id: str
+    data: dict
+    seq: Optional[int] = None
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
 ####################
 # Forms
 ####################
@@ -93,6 +247,19 @@ class ChatResponse(BaseModel):
     folder_id: Optional[str] = None
 
 
+class ChatListResponse(BaseModel):
+    id: str
+    user_id: str
+    title: str
+    updated_at: int  # timestamp in epoch
+    created_at: int  # timestamp in epoch
+    share_id: Optional[str] = None  # id of the chat to be shared
+    archived: bool
+    pinned: Optional[bool] = False
+    meta: dict = {}
+    folder_id: Optional[str] = None
+
+
 class ChatTitleIdResponse(BaseModel):
     id: str
     title: str
@@ -101,6 +268,53 @@ class ChatTitleIdResponse(BaseModel):
 
 
 class ChatTable:
+    def _set_chat_tags(self, db, chat_item: Chat):
+        db.query(ChatTag).filter_by(chat_id=chat_item.id).delete()
+        db.add_all(
+            [
+                ChatTag(
+                    chat_id=chat_item.id,
+                    tag_id=tag_id,
+                    user_id=chat_item.user_id,
+                    created_at=int(time.time()),
+                )
+                for tag_id in dict.fromkeys((chat_item.meta or {}).get("tags", []))
+            ]
+        )
+
+    def _update_chat_search(self, db, chat_item: Chat):
+        search = db.query(ChatSearch).filter_by(chat_id=chat_item.id).first()
+        if search is None:
+            search = ChatSearch(chat_id=chat_item.id, user_id=chat_item.user_id)
+            db.add(search)
+
+        search.title = chat_item.title
+        search.content = get_chat_search_content(chat_item.chat or {})
+
+    def reindex_chats(self, batch_size: int = 500) -> int:
+        """
+        Rebuilds the full-text search index from the chat table.
+        """
+        count = 0
+        with get_db() as db:
+            db.query(ChatSearch).delete()
+            db.commit()
+
+            chat_ids = [
+                id
+                for (id,) in db.query(Chat.id)
+                .filter(Chat.user_id.notlike("shared-%"))
+                .all()
+            ]
+            for idx in range(0, len(chat_ids), batch_size):
+                batch = chat_ids[idx : idx + batch_size]
+                for chat_item in db.query(Chat).filter(Chat.id.in_(batch)).all():
+                    self._update_chat_search(db, chat_item)
+                db.commit()
+                count += len(batch)
+
+        return count
+
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
         with get_db() as db:
             id = str(uuid.uuid4())
@@ -121,6 +335,7 @@ class ChatTable:
 
             result = Chat(**chat.model_dump())
             db.add(result)
+            self._update_chat_search(db, result)
             db.commit()
             db.refresh(result)
             return ChatModel.model_validate(result) if result else None
@@ -150,6 +365,8 @@ class ChatTable:
 
             result = Chat(**chat.model_dump())
             db.add(result)
+            self._set_chat_tags(db, result)
+            self._update_chat_search(db, result)
             db.commit()
             db.refresh(result)
             return ChatModel.model_validate(result) if result else None
@@ -161,6 +378,10 @@ class ChatTable:
                 chat_item.chat = chat
                 chat_item.title = chat["title"] if "title" in chat else "New Chat"
                 chat_item.updated_at = int(time.time())
+                self._update_chat_search(db, chat_item)
+
+                # The saved chat supersedes the pending message updates
+                db.query(ChatMessage).filter_by(chat_id=id).delete()
                 db.commit()
                 db.refresh(chat_item)
 
@@ -221,48 +442,163 @@ class ChatTable:
 
         return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
 
-    def upsert_message_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, message: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+    def get_pending_messages_by_chat_id(self, id: str) -> list[ChatMessageModel]:
+        with get_db() as db:
+            chat_messages = (
+                db.query(ChatMessage)
+                .filter_by(chat_id=id)
+                .order_by(func.coalesce(ChatMessage.seq, 0).asc())
+                .all()
+            )
+            return [
+                ChatMessageModel.model_validate(chat_message)
+                for chat_message in chat_messages
+            ]
+
+    def _merge_pending_messages(
+        self, chat: dict, chat_messages: list[ChatMessageModel]
+    ) -> dict:
+        if not chat_messages:
+            return chat
 
-        chat = chat.chat
         history = chat.get("history", {})
+        messages = {**history.get("messages", {})}
 
-        if message_id in history.get("messages", {}):
-            history["messages"][message_id] = {
-                **history["messages"][message_id],
-                **message,
+        for chat_message in chat_messages:
+            messages[chat_message.message_id] = {
+                **messages.get(chat_message.message_id, {}),
+                **chat_message.data,
             }
-        else:
-            history["messages"][message_id] = message
 
-        history["currentId"] = message_id
+        return {
+            **chat,
+            "history": {
+                **history,
+                "messages": messages,
+                "currentId": chat_messages[-1].message_id,
+            },
+        }
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+    def _get_chats_with_pending_messages(self, db, query) -> list[ChatModel]:
+        """
+        Runs a query of `Chat` rows and overlays each chat's pending messages,
+        loaded in a single query.
+        """
+        chats = [ChatModel.model_validate(chat) for chat in query.all()]
+        if not chats:
+            return chats
+
+        chat_ids = query.with_entities(Chat.id).order_by(None).subquery()
+        chat_messages = {}
+        for chat_message in (
+            db.query(ChatMessage)
+            .filter(ChatMessage.chat_id.in_(select(chat_ids.c.id)))
+            .order_by(ChatMessage.chat_id, func.coalesce(ChatMessage.seq, 0).asc())
+        ):
+            chat_messages.setdefault(chat_message.chat_id, []).append(
+                ChatMessageModel.model_validate(chat_message)
+            )
+
+        for chat in chats:
+            if chat.id in chat_messages:
+                chat.chat = self._merge_pending_messages(
+                    chat.chat, chat_messages[chat.id]
+                )
+        return chats
+
+    def upsert_message_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, message: dict
+    ) -> Optional[ChatMessageModel]:
+        """
+        Records a message update without rewriting the chat blob; the pending row
+        is overlaid on reads and folded into `Chat.chat` by `compact_messages_by_chat_id`.
+        """
+        for _ in range(UPSERT_MESSAGE_RETRIES):
+            try:
+                with get_db() as db:
+                    chat_message = db.get(ChatMessage, (id, message_id))
+                    seq = (
+                        db.query(func.coalesce(func.max(ChatMessage.seq), 0))
+                        .filter_by(chat_id=id)
+                        .scalar()
+                        + 1
+                    )
+
+                    if chat_message is None:
+                        if db.query(Chat.id).filter_by(id=id).first() is None:
+                            return None
+
+                        chat_message = ChatMessage(
+                            chat_id=id,
+                            message_id=message_id,
+                            data=message,
+                            seq=seq,
+                            created_at=int(time.time()),
+                            updated_at=int(time.time()),
+                        )
+                        db.add(chat_message)
+                    else:
+                        chat_message.data = {**chat_message.data, **message}
+                        chat_message.seq = seq
+                        chat_message.updated_at = int(time.time())
+
+                    db.commit()
+                    db.refresh(chat_message)
+                    return ChatMessageModel.model_validate(chat_message)
+            except IntegrityError:
+                # A concurrent update of the chat took the same seq (or inserted
+                # the same message), so retry on top of it
+                continue
+            except Exception:
+                return None
+        return None
 
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
+    ) -> Optional[ChatMessageModel]:
+        message = self.get_message_by_id_and_message_id(id, message_id)
+        if not message:
             return None
 
-        chat = chat.chat
-        history = chat.get("history", {})
+        status_history = message.get("statusHistory", [])
+        status_history.append(status)
 
-        if message_id in history.get("messages", {}):
-            status_history = history["messages"][message_id].get("statusHistory", [])
-            status_history.append(status)
-            history["messages"][message_id]["statusHistory"] = status_history
+        return self.upsert_message_to_chat_by_id_and_message_id(
+            id, message_id, {"statusHistory": status_history}
+        )
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+    def compact_messages_by_chat_id(self, id: str) -> Optional[ChatModel]:
+        try:
+            with get_db() as db:
+                chat_item = db.get(Chat, id)
+                chat_messages = (
+                    db.query(ChatMessage)
+                    .filter_by(chat_id=id)
+                    .order_by(func.coalesce(ChatMessage.seq, 0).asc())
+                    .all()
+                )
+
+                if chat_messages:
+                    chat_item.chat = self._merge_pending_messages(
+                        chat_item.chat,
+                        [
+                            ChatMessageModel.model_validate(chat_message)
+                            for chat_message in chat_messages
+                        ],
+                    )
+                    chat_item.updated_at = int(time.time())
+                    self._update_chat_search(db, chat_item)
+
+                    db.query(ChatMessage).filter_by(chat_id=id).delete()
+                    db.commit()
+                    db.refresh(chat_item)
+
+                return ChatModel.model_validate(chat_item)
+        except Exception:
+            return None
 
     def insert_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
+        self.compact_messages_by_chat_id(chat_id)
         with get_db() as db:
             # Get the existing chat to share
             chat = db.get(Chat, chat_id)
@@ -295,6 +631,7 @@ class ChatTable:
             return shared_chat if (shared_result and result) else None
 
     def update_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
+        self.compact_messages_by_chat_id(chat_id)
         try:
             with get_db() as db:
                 chat = db.get(Chat, chat_id)
@@ -374,16 +711,16 @@ class ChatTable:
 
     def get_archived_chat_list_by_user_id(
         self, user_id: str, skip: int = 0, limit: int = 50
-    ) -> list[ChatModel]:
+    ) -> list[ChatListModel]:
         with get_db() as db:
             all_chats = (
-                db.query(Chat)
+                db.query(*CHAT_LIST_COLUMNS)
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
                 # .limit(limit).offset(skip)
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListModel.model_validate(chat) for chat in all_chats]
 
     def get_chat_list_by_user_id(
         self,
@@ -391,21 +728,28 @@ class ChatTable:
         include_archived: bool = False,
         skip: int = 0,
         limit: int = 50,
-    ) -> list[ChatModel]:
+        cursor: Optional[str] = None,
+    ) -> list[ChatListModel]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id).filter_by(folder_id=None)
+            query = (
+                db.query(*CHAT_LIST_COLUMNS)
+                .filter_by(user_id=user_id)
+                .filter_by(folder_id=None)
+            )
             if not include_archived:
                 query = query.filter_by(archived=False)
 
-            query = query.order_by(Chat.updated_at.desc())
+            query = query.order_by(Chat.updated_at.desc(), Chat.id.desc())
 
-            if skip:
+            if cursor:
+                query = query.filter(after_cursor([Chat.updated_at, Chat.id], cursor))
+            elif skip:
                 query = query.offset(skip)
             if limit:
                 query = query.limit(limit)
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListModel.model_validate(chat) for chat in all_chats]
 
     def get_chat_title_id_list_by_user_id(
         self,
@@ -413,6 +757,7 @@ class ChatTable:
         include_archived: bool = False,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> list[ChatTitleIdResponse]:
         with get_db() as db:
             query = db.query(Chat).filter_by(user_id=user_id).filter_by(folder_id=None)
@@ -421,11 +766,13 @@ class ChatTable:
             if not include_archived:
                 query = query.filter_by(archived=False)
 
-            query = query.order_by(Chat.updated_at.desc()).with_entities(
-                Chat.id, Chat.title, Chat.updated_at, Chat.created_at
-            )
+            query = query.order_by(
+                Chat.updated_at.desc(), Chat.id.desc()
+            ).with_entities(Chat.id, Chat.title, Chat.updated_at, Chat.created_at)
 
-            if skip:
+            if cursor:
+                query = query.filter(after_cursor([Chat.updated_at, Chat.id], cursor))
+            elif skip:
                 query = query.offset(skip)
             if limit:
                 query = query.limit(limit)
@@ -447,22 +794,25 @@ class ChatTable:
 
     def get_chat_list_by_chat_ids(
         self, chat_ids: list[str], skip: int = 0, limit: int = 50
-    ) -> list[ChatModel]:
+    ) -> list[ChatListModel]:
         with get_db() as db:
             all_chats = (
-                db.query(Chat)
+                db.query(*CHAT_LIST_COLUMNS)
                 .filter(Chat.id.in_(chat_ids))
                 .filter_by(archived=False)
                 .order_by(Chat.updated_at.desc())
                 .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListModel.model_validate(chat) for chat in all_chats]
 
     def get_chat_by_id(self, id: str) -> Optional[ChatModel]:
         try:
             with get_db() as db:
-                chat = db.get(Chat, id)
-                return ChatModel.model_validate(chat)
+                chat = ChatModel.model_validate(db.get(Chat, id))
+                chat.chat = self._merge_pending_messages(
+                    chat.chat, self.get_pending_messages_by_chat_id(id)
+                )
+                return chat
         except Exception:
             return None
 
@@ -483,8 +833,13 @@ class ChatTable:
     def get_chat_by_id_and_user_id(self, id: str, user_id: str) -> Optional[ChatModel]:
         try:
             with get_db() as db:
-                chat = db.query(Chat).filter_by(id=id, user_id=user_id).first()
-                return ChatModel.model_validate(chat)
+                chat = ChatModel.model_validate(
+                    db.query(Chat).filter_by(id=id, user_id=user_id).first()
+                )
+                chat.chat = self._merge_pending_messages(
+                    chat.chat, self.get_pending_messages_by_chat_id(id)
+                )
+                return chat
         except Exception:
             return None
 
@@ -495,7 +850,7 @@ class ChatTable:
                 # .limit(limit).offset(skip)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._get_chats_with_pending_messages(db, all_chats)
 
     def get_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -504,16 +859,16 @@ class ChatTable:
                 .filter_by(user_id=user_id)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._get_chats_with_pending_messages(db, all_chats)
 
-    def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
+    def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatListModel]:
         with get_db() as db:
             all_chats = (
-                db.query(Chat)
+                db.query(*CHAT_LIST_COLUMNS)
                 .filter_by(user_id=user_id, pinned=True, archived=False)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListModel.model_validate(chat) for chat in all_chats]
 
     def get_archived_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -522,7 +877,7 @@ class ChatTable:
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._get_chats_with_pending_messages(db, all_chats)
 
     def get_chats_by_user_id_and_search_text(
         self,
@@ -531,14 +886,20 @@ class ChatTable:
         include_archived: bool = False,
         skip: int = 0,
         limit: int = 60,
-    ) -> list[ChatModel]:
+        cursor: Optional[str] = None,
+    ) -> list[ChatSearchResultModel]:
         """
-        Filters chats based on a search query using Python, allowing pagination using skip and limit.
+        Searches the user's chats through the full-text index, best matches first, allowing pagination using skip and limit or a cursor.
         """
         search_text = search_text.lower().strip()
 
         if not search_text:
-            return self.get_chat_list_by_user_id(user_id, include_archived, skip, limit)
+            return [
+                ChatSearchResultModel(**chat.model_dump())
+                for chat in self.get_chat_list_by_user_id(
+                    user_id, include_archived, skip, limit, cursor
+                )
+            ]
 
         search_text_words = search_text.split(" ")
 
@@ -553,140 +914,134 @@ class ChatTable:
             word for word in search_text_words if not word.startswith("tag:")
         ]
 
-        search_text = " ".join(search_text_words)
+        search_text = " ".join(search_text_words).strip()
+
+        # Prefix match every word, so results update as the user types
+        search_terms = re.findall(r"\w+", search_text)
+        if search_text and not search_terms:
+            # e.g. only punctuation, which the full-text index does not hold
+            return []
 
         with get_db() as db:
-            query = db.query(Chat).filter(Chat.user_id == user_id)
+            query = db.query(*CHAT_LIST_COLUMNS).filter(Chat.user_id == user_id)
 
             if not include_archived:
                 query = query.filter(Chat.archived == False)
 
-            query = query.order_by(Chat.updated_at.desc())
-
-            # Check if the database dialect is either 'sqlite' or 'postgresql'
-            dialect_name = db.bind.dialect.name
-            if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
+            # Check if there are any tags to filter, it should have all the tags
+            if "none" in tag_ids:
+                query = query.filter(~exists().where(ChatTag.chat_id == Chat.id))
+            elif tag_ids:
                 query = query.filter(
-                    (
-                        Chat.title.ilike(
-                            f"%{search_text}%"
-                        )  # Case-insensitive search in title
-                        | text(
-                            """
-                            EXISTS (
-                                SELECT 1 
-                                FROM json_each(Chat.chat, '$.messages') AS message 
-                                WHERE LOWER(message.value->>'content') LIKE '%' || :search_text || '%'
+                    and_(
+                        *[
+                            Chat.id.in_(
+                                select(ChatTag.chat_id).where(
+                                    ChatTag.user_id == user_id,
+                                    ChatTag.tag_id == tag_id,
+                                )
                             )
-                            """
-                        )
-                    ).params(search_text=search_text)
+                            for tag_id in tag_ids
+                        ]
+                    )
                 )
 
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(
+            # Check if the database dialect is either 'sqlite' or 'postgresql'
+            dialect_name = db.bind.dialect.name
+            if dialect_name == "sqlite":
+                if search_terms:
+                    search = (
                         text(
                             """
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_each(Chat.meta, '$.tags') AS tag
-                            )
+                            SELECT chat_search.chat_id AS chat_id, bm25(chat_search_fts) AS rank
+                            FROM chat_search_fts
+                            JOIN chat_search ON chat_search.id = chat_search_fts.rowid
+                            WHERE chat_search_fts MATCH :search_query
+                            AND chat_search.user_id = :user_id
                             """
                         )
-                    )
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(
-                                    f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_each(Chat.meta, '$.tags') AS tag
-                                        WHERE tag.value = :tag_id_{tag_idx}
-                                    )
-                                    """
-                                ).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
+                        .bindparams(
+                            search_query=" ".join(
+                                f'"{term}"*' for term in search_terms
+                            ),
+                            user_id=user_id,
                         )
+                        .columns(column("chat_id", Text), column("rank", Float))
+                        .subquery("search")
                     )
 
             elif dialect_name == "postgresql":
-                # PostgreSQL relies on proper JSON query for search
-                query = query.filter(
-                    (
-                        Chat.title.ilike(
-                            f"%{search_text}%"
-                        )  # Case-insensitive search in title
-                        | text(
-                            """
-                            EXISTS (
-                                SELECT 1
-                                FROM json_array_elements(Chat.chat->'messages') AS message
-                                WHERE LOWER(message->>'content') LIKE '%' || :search_text || '%'
-                            )
-                            """
-                        )
-                    ).params(search_text=search_text)
-                )
-
-                # Check if there are any tags to filter, it should have all the tags
-                if "none" in tag_ids:
-                    query = query.filter(
+                if search_terms:
+                    search = (
                         text(
                             """
-                            NOT EXISTS (
-                                SELECT 1
-                                FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                            )
+                            SELECT chat_search.chat_id AS chat_id, -ts_rank(chat_search.search_vector, search_query) AS rank
+                            FROM chat_search, to_tsquery('simple', :search_query) AS search_query
+                            WHERE chat_search.search_vector @@ search_query
+                            AND chat_search.user_id = :user_id
                             """
                         )
-                    )
-                elif tag_ids:
-                    query = query.filter(
-                        and_(
-                            *[
-                                text(
-                                    f"""
-                                    EXISTS (
-                                        SELECT 1
-                                        FROM json_array_elements_text(Chat.meta->'tags') AS tag
-                                        WHERE tag = :tag_id_{tag_idx}
-                                    )
-                                    """
-                                ).params(**{f"tag_id_{tag_idx}": tag_id})
-                                for tag_idx, tag_id in enumerate(tag_ids)
-                            ]
+                        .bindparams(
+                            search_query=" & ".join(
+                                f"{term}:*" for term in search_terms
+                            ),
+                            user_id=user_id,
                         )
+                        .columns(column("chat_id", Text), column("rank", Float))
+                        .subquery("search")
                     )
             else:
                 raise NotImplementedError(
                     f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
-            # Perform pagination at the SQL level
-            all_chats = query.offset(skip).limit(limit).all()
+            if search_terms:
+                # Title substring matches rank after the full-text matches
+                rank = func.coalesce(search.c.rank, 0)
+                query = (
+                    query.outerjoin(search, search.c.chat_id == Chat.id)
+                    .filter(
+                        or_(
+                            search.c.chat_id.isnot(None),
+                            Chat.title.ilike(f"%{search_text}%"),
+                        )
+                    )
+                    .add_columns(rank.label("rank"))
+                    .order_by(rank, Chat.id)
+                )
+                if cursor:
+                    query = query.filter(
+                        after_cursor([rank, Chat.id], cursor, descending=False)
+                    )
+            else:
+                query = query.order_by(Chat.updated_at.desc(), Chat.id.desc())
+                if cursor:
+                    query = query.filter(
+                        after_cursor([Chat.updated_at, Chat.id], cursor)
+                    )
 
-            print(len(all_chats))
+            # Perform pagination at the SQL level
+            if not cursor:
+                query = query.offset(skip)
+            all_chats = query.limit(limit).all()
 
             # Validate and return chats
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatSearchResultModel.model_validate(chat) for chat in all_chats]
 
     def get_chats_by_folder_id_and_user_id(
         self, folder_id: str, user_id: str
-    ) -> list[ChatModel]:
+    ) -> list[ChatListModel]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(folder_id=folder_id, user_id=user_id)
+            query = db.query(*CHAT_LIST_COLUMNS).filter_by(
+                folder_id=folder_id, user_id=user_id
+            )
             query = query.filter(or_(Chat.pinned == False, Chat.pinned == None))
             query = query.filter_by(archived=False)
 
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return [ChatListModel.model_validate(chat) for chat in all_chats]
 
     def get_chats_by_folder_ids_and_user_id(
         self, folder_ids: list[str], user_id: str
@@ -700,8 +1055,7 @@ class ChatTable:
 
             query = query.order_by(Chat.updated_at.desc())
 
-            all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._get_chats_with_pending_messages(db, query)
 
     def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str
@@ -726,34 +1080,18 @@ class ChatTable:
 
     def get_chat_list_by_user_id_and_tag_name(
         self, user_id: str, tag_name: str, skip: int = 0, limit: int = 50
-    ) -> list[ChatModel]:
+    ) -> list[ChatListModel]:
         with get_db() as db:
-            query = db.query(Chat).filter_by(user_id=user_id)
             tag_id = tag_name.replace(" ", "_").lower()
 
-            print(db.bind.dialect.name)
-            if db.bind.dialect.name == "sqlite":
-                # SQLite JSON1 querying for tags within the meta JSON field
-                query = query.filter(
-                    text(
-                        f"EXISTS (SELECT 1 FROM json_each(Chat.meta, '$.tags') WHERE json_each.value = :tag_id)"
-                    )
-                ).params(tag_id=tag_id)
-            elif db.bind.dialect.name == "postgresql":
-                # PostgreSQL JSON query for tags within the meta JSON field (for `json` type)
-                query = query.filter(
-                    text(
-                        "EXISTS (SELECT 1 FROM json_array_elements_text(Chat.meta->'tags') elem WHERE elem = :tag_id)"
-                    )
-                ).params(tag_id=tag_id)
-            else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
-                )
-
-            all_chats = query.all()
-            print("all_chats", all_chats)
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            all_chats = (
+                db.query(*CHAT_LIST_COLUMNS)
+                .join(ChatTag, ChatTag.chat_id == Chat.id)
+                .filter(ChatTag.user_id == user_id, ChatTag.tag_id == tag_id)
+                .order_by(Chat.updated_at.desc())
+                .all()
+            )
+            return [ChatListModel.model_validate(chat) for chat in all_chats]
 
     def add_chat_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str
@@ -771,6 +1109,7 @@ class ChatTable:
                         **chat.meta,
                         "tags": list(set(chat.meta.get("tags", []) + [tag_id])),
                     }
+                    self._set_chat_tags(db, chat)
 
                 db.commit()
                 db.refresh(chat)
@@ -779,40 +1118,19 @@ class ChatTable:
             return None
 
     def count_chats_by_tag_name_and_user_id(self, tag_name: str, user_id: str) -> int:
-        with get_db() as db:  # Assuming `get_db()` returns a session object
-            query = db.query(Chat).filter_by(user_id=user_id, archived=False)
-
-            # Normalize the tag_name for consistency
+        with get_db() as db:
             tag_id = tag_name.replace(" ", "_").lower()
 
-            if db.bind.dialect.name == "sqlite":
-                # SQLite JSON1 support for querying the tags inside the `meta` JSON field
-                query = query.filter(
-                    text(
-                        f"EXISTS (SELECT 1 FROM json_each(Chat.meta, '$.tags') WHERE json_each.value = :tag_id)"
-                    )
-                ).params(tag_id=tag_id)
-
-            elif db.bind.dialect.name == "postgresql":
-                # PostgreSQL JSONB support for querying the tags inside the `meta` JSON field
-                query = query.filter(
-                    text(
-                        "EXISTS (SELECT 1 FROM json_array_elements_text(Chat.meta->'tags') elem WHERE elem = :tag_id)"
-                    )
-                ).params(tag_id=tag_id)
-
-            else:
-                raise NotImplementedError(
-                    f"Unsupported dialect: {db.bind.dialect.name}"
+            return (
+                db.query(ChatTag)
+                .join(Chat, Chat.id == ChatTag.chat_id)
+                .filter(
+                    ChatTag.user_id == user_id,
+                    ChatTag.tag_id == tag_id,
+                    Chat.archived == False,
                 )
-
-            # Get the count of matching records
-            count = query.count()
-
-            # Debugging output for inspection
-            print(f"Count of chats for tag '{tag_name}':", count)
-
-            return count
+                .count()
+            )
 
     def delete_tag_by_id_and_user_id_and_tag_name(
         self, id: str, user_id: str, tag_name: str
@@ -828,6 +1146,7 @@ class ChatTable:
                     **chat.meta,
                     "tags": list(set(tags)),
                 }
+                db.query(ChatTag).filter_by(chat_id=id, tag_id=tag_id).delete()
                 db.commit()
                 return True
         except Exception:
@@ -841,6 +1160,7 @@ class ChatTable:
                     **chat.meta,
                     "tags": [],
                 }
+                db.query(ChatTag).filter_by(chat_id=id).delete()
                 db.commit()
 
                 return True
@@ -850,6 +1170,9 @@ class ChatTable:
     def delete_chat_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                db.query(ChatMessage).filter_by(chat_id=id).delete()
+                db.query(ChatSearch).filter_by(chat_id=id).delete()
+                db.query(ChatTag).filter_by(chat_id=id).delete()
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -860,7 +1183,10 @@ class ChatTable:
     def delete_chat_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
-                db.query(Chat).filter_by(id=id, user_id=user_id).delete()
+                if db.query(Chat).filter_by(id=id, user_id=user_id).delete():
+                    db.query(ChatMessage).filter_by(chat_id=id).delete()
+                    db.query(ChatSearch).filter_by(chat_id=id).delete()
+                    db.query(ChatTag).filter_by(chat_id=id).delete()
                 db.commit()
 
                 return True and self.delete_shared_chat_by_chat_id(id)
@@ -872,6 +1198,13 @@ class ChatTable:
             with get_db() as db:
                 self.delete_shared_chats_by_user_id(user_id)
 
+                db.query(ChatMessage).filter(
+                    ChatMessage.chat_id.in_(
+                        select(Chat.id).where(Chat.user_id == user_id)
+                    )
+                ).delete(synchronize_session=False)
+                db.query(ChatSearch).filter_by(user_id=user_id).delete()
+                db.query(ChatTag).filter_by(user_id=user_id).delete()
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -881,10 +1214,30 @@ class ChatTable:
 
     def delete_chats_by_user_id_and_folder_id(
         self, user_id: str, folder_id: str
+    ) -> bool:
+        return self.delete_chats_by_user_id_and_folder_ids(user_id, [folder_id])
+
+    def delete_chats_by_user_id_and_folder_ids(
+        self, user_id: str, folder_ids: list[str]
     ) -> bool:
         try:
             with get_db() as db:
-                db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
+                chat_ids = select(Chat.id).where(
+                    Chat.user_id == user_id, Chat.folder_id.in_(folder_ids)
+                )
+
+                db.query(ChatMessage).filter(ChatMessage.chat_id.in_(chat_ids)).delete(
+                    synchronize_session=False
+                )
+                db.query(ChatSearch).filter(ChatSearch.chat_id.in_(chat_ids)).delete(
+                    synchronize_session=False
+                )
+                db.query(ChatTag).filter(ChatTag.chat_id.in_(chat_ids)).delete(
+                    synchronize_session=False
+                )
+                db.query(Chat).filter(
+                    Chat.user_id == user_id, Chat.folder_id.in_(folder_ids)
+                ).delete(synchronize_session=False)
                 db.commit()
 
                 return True
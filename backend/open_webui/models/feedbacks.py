@@ -4,11 +4,12 @@ import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, get_db
+from open_webui.internal.pagination import after_cursor
 from open_webui.models.chats import Chats
 
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
+from sqlalchemy import BigInteger, Column, Index, Text, JSON, Boolean
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -31,6 +32,13 @@ class Feedback(Base):
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    __table_args__ = (
+        # Keyset pagination of feedbacks by (updated_at, id)
+        Index("feedback_updated_at_id_idx", "updated_at", "id"),
+        Index("feedback_user_id_updated_at_idx", "user_id", "updated_at"),
+        Index("feedback_type_updated_at_idx", "type", "updated_at"),
+    )
+
 
 class FeedbackModel(BaseModel):
     id: str
@@ -143,14 +151,22 @@ class FeedbackTable:
         except Exception:
             return None
 
-    def get_all_feedbacks(self) -> list[FeedbackModel]:
+    def get_all_feedbacks(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> list[FeedbackModel]:
         with get_db() as db:
-            return [
-                FeedbackModel.model_validate(feedback)
-                for feedback in db.query(Feedback)
-                .order_by(Feedback.updated_at.desc())
-                .all()
-            ]
+            query = db.query(Feedback).order_by(
+                Feedback.updated_at.desc(), Feedback.id.desc()
+            )
+
+            if cursor:
+                query = query.filter(
+                    after_cursor([Feedback.updated_at, Feedback.id], cursor)
+                )
+            if limit:
+                query = query.limit(limit)
+
+            return [FeedbackModel.model_validate(feedback) for feedback in query.all()]
 
     def get_feedbacks_by_type(self, type: str) -> list[FeedbackModel]:
         with get_db() as db:
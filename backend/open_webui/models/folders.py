@@ -8,7 +8,7 @@ from open_webui.models.chats import Chats
 
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, Text, JSON, Boolean
+from sqlalchemy import BigInteger, Column, Index, Text, JSON, Boolean, select
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -31,6 +31,8 @@ class Folder(Base):
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    __table_args__ = (Index("folder_user_id_parent_id_idx", "user_id", "parent_id"),)
+
 
 class FolderModel(BaseModel):
     id: str
@@ -57,6 +59,39 @@ class FolderForm(BaseModel):
 
 
 class FolderTable:
+    def _get_subtree_ids_query(self, id: str, user_id: str):
+        """
+        Recursive query for the ids of a folder and all of its descendants.
+        UNION (rather than UNION ALL) stops the walk on cyclic data.
+        """
+        tree = (
+            select(Folder.id)
+            .where(Folder.id == id, Folder.user_id == user_id)
+            .cte("folder_tree", recursive=True)
+        )
+        tree = tree.union(
+            select(Folder.id)
+            .join(tree, Folder.parent_id == tree.c.id)
+            .where(Folder.user_id == user_id)
+        )
+        return select(tree.c.id)
+
+    def _get_ancestor_ids_query(self, id: str, user_id: str):
+        """
+        Recursive query for the ids of a folder and all of its ancestors.
+        """
+        ancestors = (
+            select(Folder.id, Folder.parent_id)
+            .where(Folder.id == id, Folder.user_id == user_id)
+            .cte("folder_ancestors", recursive=True)
+        )
+        ancestors = ancestors.union(
+            select(Folder.id, Folder.parent_id)
+            .join(ancestors, Folder.id == ancestors.c.parent_id)
+            .where(Folder.user_id == user_id)
+        )
+        return select(ancestors.c.id)
+
     def insert_new_folder(
         self, user_id: str, name: str, parent_id: Optional[str] = None
     ) -> Optional[FolderModel]:
@@ -101,28 +136,39 @@ class FolderTable:
 
     def get_children_folders_by_id_and_user_id(
         self, id: str, user_id: str
-    ) -> Optional[FolderModel]:
+    ) -> Optional[list[FolderModel]]:
         try:
             with get_db() as db:
-                folders = []
-
-                def get_children(folder):
-                    children = self.get_folders_by_parent_id_and_user_id(
-                        folder.id, user_id
-                    )
-                    for child in children:
-                        get_children(child)
-                        folders.append(child)
-
-                folder = db.query(Folder).filter_by(id=id, user_id=user_id).first()
-                if not folder:
+                if not db.query(Folder.id).filter_by(id=id, user_id=user_id).first():
                     return None
 
-                get_children(folder)
-                return folders
+                return [
+                    FolderModel.model_validate(folder)
+                    for folder in db.query(Folder)
+                    .filter(
+                        Folder.id.in_(self._get_subtree_ids_query(id, user_id)),
+                        Folder.id != id,
+                    )
+                    .all()
+                ]
         except Exception:
             return None
 
+    def is_folder_in_subtree(self, id: str, root_id: str, user_id: str) -> bool:
+        """
+        Whether folder `id` is `root_id` or one of its descendants.
+        """
+        with get_db() as db:
+            ancestor_ids = self._get_ancestor_ids_query(id, user_id).subquery()
+            return (
+                db.execute(
+                    select(ancestor_ids.c.id)
+                    .where(ancestor_ids.c.id == root_id)
+                    .limit(1)
+                ).first()
+                is not None
+            )
+
     def get_folders_by_user_id(self, user_id: str) -> list[FolderModel]:
         with get_db() as db:
             return [
@@ -237,30 +283,24 @@ class FolderTable:
     def delete_folder_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
-                folder = db.query(Folder).filter_by(id=id, user_id=user_id).first()
-                if not folder:
+                folder_ids = [
+                    folder_id
+                    for (folder_id,) in db.execute(
+                        self._get_subtree_ids_query(id, user_id)
+                    ).all()
+                ]
+                if not folder_ids:
                     return False
 
-                # Delete all chats in the folder
-                Chats.delete_chats_by_user_id_and_folder_id(user_id, folder.id)
+                # Delete all chats in the folder and its children
+                if not Chats.delete_chats_by_user_id_and_folder_ids(
+                    user_id, folder_ids
+                ):
+                    return False
 
-                # Delete all children folders
-                def delete_children(folder):
-                    folder_children = self.get_folders_by_parent_id_and_user_id(
-                        folder.id, user_id
-                    )
-                    for folder_child in folder_children:
-                        Chats.delete_chats_by_user_id_and_folder_id(
-                            user_id, folder_child.id
-                        )
-                        delete_children(folder_child)
-
-                        folder = db.query(Folder).filter_by(id=folder_child.id).first()
-                        db.delete(folder)
-                        db.commit()
-
-                delete_children(folder)
-                db.delete(folder)
+                db.query(Folder).filter(
+                    Folder.user_id == user_id, Folder.id.in_(folder_ids)
+                ).delete(synchronize_session=False)
                 db.commit()
                 return True
         except Exception as e:
@@ -2,6 +2,7 @@ import logging
 import time
 from typing import Optional
 
+from open_webui.internal.cache import invalidation_bus
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.users import Users
 from open_webui.env import SRC_LOG_LEVELS
@@ -81,6 +82,9 @@ class FunctionValves(BaseModel):
 
 
 class FunctionsTable:
+    def invalidate_cache(self):
+        invalidation_bus.publish("functions")
+
     def insert_new_function(
         self, user_id: str, type: str, form_data: FunctionForm
     ) -> Optional[FunctionModel]:
@@ -100,6 +104,7 @@ class FunctionsTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                self.invalidate_cache()
                 if result:
                     return FunctionModel.model_validate(result)
                 else:
@@ -183,6 +188,7 @@ class FunctionsTable:
                 function.updated_at = int(time.time())
                 db.commit()
                 db.refresh(function)
+                self.invalidate_cache()
                 return self.get_function_by_id(id)
             except Exception:
                 return None
@@ -238,6 +244,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                self.invalidate_cache()
                 return self.get_function_by_id(id)
             except Exception:
                 return None
@@ -252,6 +259,7 @@ class FunctionsTable:
                     }
                 )
                 db.commit()
+                self.invalidate_cache()
                 return True
             except Exception:
                 return None
@@ -261,6 +269,7 @@ class FunctionsTable:
             try:
                 db.query(Function).filter_by(id=id).delete()
                 db.commit()
+                self.invalidate_cache()
 
                 return True
             except Exception:
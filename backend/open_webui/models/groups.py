@@ -1,9 +1,11 @@
 import json
 import logging
+import threading
 import time
 from typing import Optional
 import uuid
 
+from open_webui.internal.cache import invalidation_bus
 from open_webui.internal.db import Base, get_db
 from open_webui.env import SRC_LOG_LEVELS
 
@@ -11,7 +13,7 @@ from open_webui.models.files import FileMetadataResponse
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON, func
+from sqlalchemy import BigInteger, Column, Index, PrimaryKeyConstraint, Text, JSON
 
 
 log = logging.getLogger(__name__)
@@ -41,6 +43,20 @@ class Group(Base):
     updated_at = Column(BigInteger)
 
 
+class GroupMember(Base):
+    __tablename__ = "group_member"
+
+    group_id = Column(Text, nullable=False)
+    user_id = Column(Text, nullable=False)
+    created_at = Column(BigInteger)
+
+    __table_args__ = (
+        # The primary key also serves lookups by group_id
+        PrimaryKeyConstraint("group_id", "user_id", name="pk_group_id_user_id"),
+        Index("group_member_user_id_idx", "user_id"),
+    )
+
+
 class GroupModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     id: str
@@ -89,6 +105,32 @@ class GroupUpdateForm(GroupForm):
 
 
 class GroupTable:
+    def __init__(self):
+        # user_id -> groups the user is a member of, filled on first lookup and
+        # cleared after any group change so that access checks skip the database
+        self._groups_by_member_id: dict[str, list[GroupModel]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        invalidation_bus.subscribe("groups", lambda _: self._invalidate_cache())
+
+    def _invalidate_cache(self):
+        with self._lock:
+            self._generation += 1
+            self._groups_by_member_id = {}
+
+    def invalidate_cache(self):
+        invalidation_bus.publish("groups")
+
+    def _set_group_members(self, db, id: str, user_ids: list[str]):
+        db.query(GroupMember).filter_by(group_id=id).delete()
+        db.add_all(
+            [
+                GroupMember(group_id=id, user_id=user_id, created_at=int(time.time()))
+                for user_id in dict.fromkeys(user_ids)
+            ]
+        )
+
     def insert_new_group(
         self, user_id: str, form_data: GroupForm
     ) -> Optional[GroupModel]:
@@ -108,6 +150,7 @@ class GroupTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                self.invalidate_cache()
                 if result:
                     return GroupModel.model_validate(result)
                 else:
@@ -124,20 +167,28 @@ class GroupTable:
             ]
 
     def get_groups_by_member_id(self, user_id: str) -> list[GroupModel]:
+        with self._lock:
+            groups = self._groups_by_member_id.get(user_id)
+            generation = self._generation
+        if groups is not None:
+            return list(groups)
+
         with get_db() as db:
-            return [
+            groups = [
                 GroupModel.model_validate(group)
                 for group in db.query(Group)
-                .filter(
-                    func.json_array_length(Group.user_ids) > 0
-                )  # Ensure array exists
-                .filter(
-                    Group.user_ids.cast(String).like(f'%"{user_id}"%')
-                )  # String-based check
+                .join(GroupMember, GroupMember.group_id == Group.id)
+                .filter(GroupMember.user_id == user_id)
                 .order_by(Group.updated_at.desc())
                 .all()
             ]
 
+        with self._lock:
+            # Only cache the result if no group changed while it was being read
+            if generation == self._generation:
+                self._groups_by_member_id[user_id] = groups
+        return list(groups)
+
     def get_group_by_id(self, id: str) -> Optional[GroupModel]:
         try:
             with get_db() as db:
@@ -146,12 +197,30 @@ class GroupTable:
         except Exception:
             return None
 
-    def get_group_user_ids_by_id(self, id: str) -> Optional[str]:
-        group = self.get_group_by_id(id)
-        if group:
-            return group.user_ids
-        else:
-            return None
+    def get_group_user_ids_by_id(self, id: str) -> Optional[list[str]]:
+        with get_db() as db:
+            if db.query(Group.id).filter_by(id=id).first() is None:
+                return None
+
+            return [
+                user_id
+                for (user_id,) in db.query(GroupMember.user_id)
+                .filter_by(group_id=id)
+                .all()
+            ]
+
+    def get_user_ids_by_group_ids(self, group_ids: list[str]) -> list[str]:
+        if not group_ids:
+            return []
+
+        with get_db() as db:
+            return [
+                user_id
+                for (user_id,) in db.query(GroupMember.user_id)
+                .filter(GroupMember.group_id.in_(group_ids))
+                .distinct()
+                .all()
+            ]
 
     def update_group_by_id(
         self, id: str, form_data: GroupUpdateForm, overwrite: bool = False
@@ -164,7 +233,10 @@ class GroupTable:
                         "updated_at": int(time.time()),
                     }
                 )
+                if form_data.user_ids is not None:
+                    self._set_group_members(db, id, form_data.user_ids)
                 db.commit()
+                self.invalidate_cache()
                 return self.get_group_by_id(id=id)
         except Exception as e:
             log.exception(e)
@@ -173,8 +245,10 @@ class GroupTable:
     def delete_group_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                db.query(GroupMember).filter_by(group_id=id).delete()
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                self.invalidate_cache()
                 return True
         except Exception:
             return False
@@ -182,8 +256,10 @@ class GroupTable:
     def delete_all_groups(self) -> bool:
         with get_db() as db:
             try:
+                db.query(GroupMember).delete()
                 db.query(Group).delete()
                 db.commit()
+                self.invalidate_cache()
 
                 return True
             except Exception:
@@ -4,11 +4,12 @@ import uuid
 from typing import Optional
 
 from open_webui.internal.db import Base, get_db
+from open_webui.internal.pagination import after_cursor
 from open_webui.models.tags import TagModel, Tag, Tags
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, Index, String, Text, JSON
 from sqlalchemy import or_, func, select, and_, text
 from sqlalchemy.sql import exists
 
@@ -25,6 +26,8 @@ class MessageReaction(Base):
     name = Column(Text)
     created_at = Column(BigInteger)
 
+    __table_args__ = (Index("message_reaction_message_id_idx", "message_id"),)
+
 
 class MessageReactionModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -52,6 +55,13 @@ class Message(Base):
     created_at = Column(BigInteger)  # time_ns
     updated_at = Column(BigInteger)  # time_ns
 
+    __table_args__ = (
+        # Keyset pagination of a channel's messages by (created_at, id)
+        Index("message_channel_id_created_at_id_idx", "channel_id", "created_at", "id"),
+        # Thread replies by parent
+        Index("message_parent_id_created_at_idx", "parent_id", "created_at"),
+    )
+
 
 class MessageModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -158,17 +168,27 @@ class MessageTable:
             ]
 
     def get_messages_by_channel_id(
-        self, channel_id: str, skip: int = 0, limit: int = 50
+        self,
+        channel_id: str,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[str] = None,
     ) -> list[MessageModel]:
         with get_db() as db:
-            all_messages = (
+            query = (
                 db.query(Message)
                 .filter_by(channel_id=channel_id, parent_id=None)
-                .order_by(Message.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-                .all()
+                .order_by(Message.created_at.desc(), Message.id.desc())
             )
+
+            if cursor:
+                query = query.filter(
+                    after_cursor([Message.created_at, Message.id], cursor)
+                )
+            else:
+                query = query.offset(skip)
+
+            all_messages = query.limit(limit).all()
             return [MessageModel.model_validate(message) for message in all_messages]
 
     def get_messages_by_parent_id(
@@ -1,7 +1,9 @@
 import logging
+import threading
 import time
 from typing import Optional
 
+from open_webui.internal.cache import invalidation_bus
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.env import SRC_LOG_LEVELS
 
@@ -143,6 +145,37 @@ class ModelForm(BaseModel):
 
 
 class ModelsTable:
+    def __init__(self):
+        # Snapshot of every model info by id, rebuilt lazily after any model
+        # change so that access checks on model lists do not query per model
+        self._snapshot: Optional[dict[str, ModelModel]] = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        invalidation_bus.subscribe("models", lambda _: self._invalidate_snapshot())
+
+    def _invalidate_snapshot(self):
+        with self._lock:
+            self._generation += 1
+            self._snapshot = None
+
+    def invalidate_snapshot(self):
+        invalidation_bus.publish("models")
+
+    def get_snapshot(self) -> dict[str, ModelModel]:
+        with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            generation = self._generation
+
+        snapshot = {model.id: model for model in self.get_all_models()}
+
+        with self._lock:
+            # Only keep the snapshot if no model changed while it was being built
+            if generation == self._generation:
+                self._snapshot = snapshot
+        return snapshot
+
     def insert_new_model(
         self, form_data: ModelForm, user_id: str
     ) -> Optional[ModelModel]:
@@ -160,6 +193,7 @@ class ModelsTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                self.invalidate_snapshot()
 
                 if result:
                     return ModelModel.model_validate(result)
@@ -206,6 +240,10 @@ class ModelsTable:
             or has_access(user_id, permission, model.access_control)
         ]
 
+    def get_models_by_ids(self, ids: list[str]) -> list[ModelModel]:
+        snapshot = self.get_snapshot()
+        return [snapshot[id] for id in ids if id in snapshot]
+
     def get_model_by_id(self, id: str) -> Optional[ModelModel]:
         try:
             with get_db() as db:
@@ -226,6 +264,7 @@ class ModelsTable:
                     }
                 )
                 db.commit()
+                self.invalidate_snapshot()
 
                 return self.get_model_by_id(id)
             except Exception:
@@ -241,6 +280,7 @@ class ModelsTable:
                     .update(model.model_dump(exclude={"id"}))
                 )
                 db.commit()
+                self.invalidate_snapshot()
 
                 model = db.get(Model, id)
                 db.refresh(model)
@@ -255,6 +295,7 @@ class ModelsTable:
             with get_db() as db:
                 db.query(Model).filter_by(id=id).delete()
                 db.commit()
+                self.invalidate_snapshot()
 
                 return True
         except Exception:
@@ -265,6 +306,7 @@ class ModelsTable:
             with get_db() as db:
                 db.query(Model).delete()
                 db.commit()
+                self.invalidate_snapshot()
 
                 return True
         except Exception:
@@ -1,10 +1,15 @@
+import hashlib
+import threading
 import time
+from collections import OrderedDict
 from typing import Optional
 
+from open_webui.env import USER_IDENTITY_CACHE_SIZE, USER_IDENTITY_CACHE_TTL
+from open_webui.internal.cache import invalidation_bus
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.models.chats import Chats
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text
+from sqlalchemy import BigInteger, Column, String, Text, bindparam, or_, update
 
 ####################
 # User DB Schema
@@ -90,6 +95,77 @@ class UserUpdateForm(BaseModel):
 
 
 class UsersTable:
+    def __init__(self):
+        # Users resolved by authentication, keyed by "id:<user_id>" or
+        # "api_key:<sha256 of the key>", evicted least recently used first and
+        # dropped on any change to the user, here or on another worker
+        self._identities: OrderedDict[str, tuple[float, UserModel]] = OrderedDict()
+        self._identity_keys_by_user_id: dict[str, set[str]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        invalidation_bus.subscribe("users", self._invalidate_identity)
+
+    def _invalidate_identity(self, user_id: Optional[str]):
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._identities.clear()
+                self._identity_keys_by_user_id.clear()
+                return
+
+            for key in self._identity_keys_by_user_id.pop(user_id, set()):
+                self._identities.pop(key, None)
+
+    def invalidate_identity(self, user_id: str):
+        invalidation_bus.publish("users", user_id)
+
+    def _get_identity(self, key: str, get_user) -> Optional[UserModel]:
+        with self._lock:
+            entry = self._identities.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._identities.move_to_end(key)
+                return entry[1].model_copy()
+            generation = self._generation
+
+        user = get_user()
+        if user is None:
+            return None
+
+        with self._lock:
+            # Only cache the user if it did not change while it was being read
+            if generation == self._generation:
+                self._identities[key] = (
+                    time.monotonic() + USER_IDENTITY_CACHE_TTL,
+                    user,
+                )
+                self._identities.move_to_end(key)
+                self._identity_keys_by_user_id.setdefault(user.id, set()).add(key)
+
+                while len(self._identities) > USER_IDENTITY_CACHE_SIZE:
+                    evicted_key, (_, evicted) = self._identities.popitem(last=False)
+                    keys = self._identity_keys_by_user_id.get(evicted.id)
+                    if keys is not None:
+                        keys.discard(evicted_key)
+                        if not keys:
+                            del self._identity_keys_by_user_id[evicted.id]
+        return user.model_copy()
+
+    def get_identity_by_id(self, id: str) -> Optional[UserModel]:
+        """
+        `get_user_by_id` for authentication, served from the identity cache.
+        """
+        return self._get_identity(f"id:{id}", lambda: self.get_user_by_id(id))
+
+    def get_identity_by_api_key(self, api_key: str) -> Optional[UserModel]:
+        """
+        `get_user_by_api_key` for authentication, served from the identity cache.
+        """
+        return self._get_identity(
+            f"api_key:{hashlib.sha256(api_key.encode()).hexdigest()}",
+            lambda: self.get_user_by_api_key(api_key),
+        )
+
     def insert_new_user(
         self,
         id: str,
@@ -175,6 +251,18 @@ class UsersTable:
             users = db.query(User).filter(User.id.in_(user_ids)).all()
             return [UserModel.model_validate(user) for user in users]
 
+    def get_existing_emails(self, emails: list[str]) -> set[str]:
+        if not emails:
+            return set()
+
+        with get_db() as db:
+            return {
+                email
+                for (email,) in db.query(User.email)
+                .filter(User.email.in_(emails))
+                .all()
+            }
+
     def get_num_users(self) -> Optional[int]:
         with get_db() as db:
             return db.query(User).count()
@@ -208,6 +296,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                self.invalidate_identity(id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -222,6 +311,7 @@ class UsersTable:
                     {"profile_image_url": profile_image_url}
                 )
                 db.commit()
+                self.invalidate_identity(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -241,6 +331,36 @@ class UsersTable:
         except Exception:
             return None
 
+    def update_users_last_active(self, last_active: dict[str, int]) -> bool:
+        """
+        Writes `{user_id: timestamp}` in one batch, never moving a user's
+        `last_active_at` backwards.
+        """
+        if not last_active:
+            return True
+
+        try:
+            with get_db() as db:
+                db.connection().execute(
+                    update(User)
+                    .where(
+                        User.id == bindparam("user_id"),
+                        or_(
+                            User.last_active_at == None,
+                            User.last_active_at < bindparam("timestamp"),
+                        ),
+                    )
+                    .values(last_active_at=bindparam("timestamp")),
+                    [
+                        {"user_id": user_id, "timestamp": timestamp}
+                        for user_id, timestamp in last_active.items()
+                    ],
+                )
+                db.commit()
+                return True
+        except Exception:
+            return False
+
     def update_user_oauth_sub_by_id(
         self, id: str, oauth_sub: str
     ) -> Optional[UserModel]:
@@ -248,6 +368,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"oauth_sub": oauth_sub})
                 db.commit()
+                self.invalidate_identity(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -259,6 +380,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update(updated)
                 db.commit()
+                self.invalidate_identity(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -276,6 +398,7 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                    self.invalidate_identity(id)
 
                 return True
             else:
@@ -288,6 +411,7 @@ class UsersTable:
             with get_db() as db:
                 result = db.query(User).filter_by(id=id).update({"api_key": api_key})
                 db.commit()
+                self.invalidate_identity(id)
                 return True if result == 1 else False
         except Exception:
             return False
@@ -1,4 +1,7 @@
+import csv
 import datetime
+import io
+import json
 import logging
 import re
 import time
@@ -7,8 +10,8 @@ from ssl import CERT_REQUIRED, PROTOCOL_TLS
 from typing import Optional
 
 from aiohttp import ClientSession
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import RedirectResponse, Response
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 from ldap3 import ALL, Connection, Server, Tls
 from ldap3.utils.conv import escape_filter_chars
 from open_webui.config import (
@@ -37,6 +40,7 @@ from open_webui.models.auths import (
     UpdateProfileForm,
     UserResponse,
 )
+from open_webui.internal.db import run_in_db_executor
 from open_webui.models.users import Users
 from open_webui.utils.access_control import get_permissions
 from open_webui.utils.auth import (
@@ -44,12 +48,12 @@ from open_webui.utils.auth import (
     create_token,
     get_admin_user,
     get_current_user,
-    get_password_hash,
     get_verified_user,
+    password_hash_pool,
 )
 from open_webui.utils.misc import parse_duration, validate_email_format
 from open_webui.utils.webhook import post_webhook
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 router = APIRouter()
 
@@ -147,10 +151,12 @@ async def update_password(
     if WEBUI_AUTH_TRUSTED_EMAIL_HEADER:
         raise HTTPException(400, detail=ERROR_MESSAGES.ACTION_PROHIBITED)
     if session_user:
-        user = Auths.authenticate_user(session_user.email, form_data.password)
+        user = await password_hash_pool.run(
+            Auths.authenticate_user, session_user.email, form_data.password
+        )
 
         if user:
-            hashed = get_password_hash(form_data.new_password)
+            hashed = await password_hash_pool.hash(form_data.new_password)
             return Auths.update_user_password_by_id(user.id, hashed)
         else:
             raise HTTPException(400, detail=ERROR_MESSAGES.INVALID_PASSWORD)
@@ -329,7 +335,9 @@ async def signin(request: Request, response: Response, form_data: SigninForm):
         admin_password = "admin"
 
         if Users.get_user_by_email(admin_email.lower()):
-            user = Auths.authenticate_user(admin_email.lower(), admin_password)
+            user = await password_hash_pool.run(
+                Auths.authenticate_user, admin_email.lower(), admin_password
+            )
         else:
             if Users.get_num_users() != 0:
                 raise HTTPException(400, detail=ERROR_MESSAGES.EXISTING_USERS)
@@ -340,9 +348,13 @@ async def signin(request: Request, response: Response, form_data: SigninForm):
                 SignupForm(email=admin_email, password=admin_password, name="User"),
             )
 
-            user = Auths.authenticate_user(admin_email.lower(), admin_password)
+            user = await password_hash_pool.run(
+                Auths.authenticate_user, admin_email.lower(), admin_password
+            )
     else:
-        user = Auths.authenticate_user(form_data.email.lower(), form_data.password)
+        user = await password_hash_pool.run(
+            Auths.authenticate_user, form_data.email.lower(), form_data.password
+        )
 
     if user:
         expires_delta = parse_duration(request.app.state.config.JWT_EXPIRES_IN)
@@ -430,7 +442,7 @@ async def signup(request: Request, response: Response, form_data: SignupForm):
             # Disable signup after the first user is created
             request.app.state.config.ENABLE_SIGNUP = False
 
-        hashed = get_password_hash(form_data.password)
+        hashed = await password_hash_pool.hash(form_data.password)
         user = Auths.insert_new_auth(
             form_data.email.lower(),
             hashed,
@@ -543,7 +555,7 @@ async def add_user(form_data: AddUserForm, user=Depends(get_admin_user)):
         raise HTTPException(400, detail=ERROR_MESSAGES.EMAIL_TAKEN)
 
     try:
-        hashed = get_password_hash(form_data.password)
+        hashed = await password_hash_pool.hash(form_data.password)
         user = Auths.insert_new_auth(
             form_data.email.lower(),
             hashed,
@@ -569,6 +581,177 @@ async def add_user(form_data: AddUserForm, user=Depends(get_admin_user)):
         raise HTTPException(500, detail=ERROR_MESSAGES.DEFAULT(err))
 
 
+############################
+# AddUsers (bulk import)
+############################
+
+# Rows validated, hashed and inserted together
+USER_IMPORT_BATCH_SIZE = 100
+
+
+def read_user_import_rows(file: UploadFile, content: str):
+    """
+    Yields `(row number, dict)` for each user in a CSV file (with a header row)
+    or a JSON Lines file, or `(row number, error)` for unparsable lines.
+    """
+    if (file.filename or "").endswith((".jsonl", ".ndjson")) or file.content_type in (
+        "application/jsonl",
+        "application/x-ndjson",
+    ):
+        for row_number, line in enumerate(content.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+                yield row_number, row if isinstance(row, dict) else "Invalid row"
+            except json.JSONDecodeError:
+                yield row_number, "Invalid JSON"
+    else:
+        for row_number, row in enumerate(csv.DictReader(io.StringIO(content)), start=2):
+            # DictReader puts the fields beyond the header in a list under None
+            if None in row:
+                yield row_number, "Invalid row"
+                continue
+            yield row_number, {
+                (key or "").strip().lower(): (value or "").strip()
+                for key, value in row.items()
+            }
+
+
+async def import_users(rows):
+    created, failed = 0, 0
+    seen_emails = set()
+
+    async def process(batch):
+        nonlocal created, failed
+        results, forms = [], []
+
+        existing_emails = await run_in_db_executor(
+            Users.get_existing_emails,
+            [row.email for _, _, row in batch if isinstance(row, AddUserForm)],
+        )
+
+        for row_number, email, row in batch:
+            if not isinstance(row, AddUserForm):
+                results.append(
+                    {
+                        "row": row_number,
+                        "email": email,
+                        "status": "error",
+                        "detail": row,
+                    }
+                )
+            elif row.email in existing_emails:
+                results.append(
+                    {
+                        "row": row_number,
+                        "email": row.email,
+                        "status": "error",
+                        "detail": ERROR_MESSAGES.EMAIL_TAKEN,
+                    }
+                )
+            else:
+                forms.append((row_number, row))
+
+        hashes = await password_hash_pool.hash_many(
+            [form.password for _, form in forms]
+        )
+        for (_, form), hashed in zip(forms, hashes):
+            form.password = hashed
+
+        try:
+            users = await run_in_db_executor(
+                Auths.insert_new_auths, [form for _, form in forms]
+            )
+            results.extend(
+                {
+                    "row": row_number,
+                    "email": user.email,
+                    "status": "created",
+                    "id": user.id,
+                }
+                for (row_number, _), user in zip(forms, users)
+            )
+        except Exception as e:
+            log.exception(e)
+            results.extend(
+                {
+                    "row": row_number,
+                    "email": form.email,
+                    "status": "error",
+                    "detail": ERROR_MESSAGES.CREATE_USER_ERROR,
+                }
+                for row_number, form in forms
+            )
+
+        results.sort(key=lambda result: result["row"])
+        for result in results:
+            if result["status"] == "created":
+                created += 1
+            else:
+                failed += 1
+            yield json.dumps(result) + "\n"
+
+    batch = []
+    for row_number, row in rows:
+        email = None
+        if isinstance(row, dict):
+            email = row.get("email")
+            try:
+                row = AddUserForm(**{key: value for key, value in row.items() if value})
+                row.email = row.email.lower()
+
+                if not validate_email_format(row.email):
+                    row = ERROR_MESSAGES.INVALID_EMAIL_FORMAT
+                elif row.role not in ["pending", "user", "admin"]:
+                    row = ERROR_MESSAGES.DEFAULT(f"Invalid role: {row.role}")
+                elif row.email in seen_emails:
+                    row = ERROR_MESSAGES.DEFAULT("Duplicate email in file")
+                else:
+                    seen_emails.add(row.email)
+            except ValidationError as e:
+                row = ERROR_MESSAGES.DEFAULT(
+                    ", ".join(
+                        f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                        for error in e.errors()
+                    )
+                )
+
+        batch.append((row_number, email, row))
+        if len(batch) >= USER_IMPORT_BATCH_SIZE:
+            async for line in process(batch):
+                yield line
+            batch = []
+
+    if batch:
+        async for line in process(batch):
+            yield line
+
+    yield json.dumps({"created": created, "failed": failed}) + "\n"
+
+
+@router.post("/add/bulk")
+async def add_users(file: UploadFile = File(...), user=Depends(get_admin_user)):
+    """
+    Imports users from a CSV (name, email, password[, role, profile_image_url])
+    or JSON Lines file, streaming one JSON result per row followed by a summary.
+    """
+    try:
+        # The upload is closed once this handler returns, before the response
+        # is streamed, so its content is read up front
+        content = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("File must be UTF-8 encoded"),
+        )
+
+    return StreamingResponse(
+        import_users(read_user_import_rows(file, content)),
+        media_type="application/x-ndjson",
+    )
+
+
 ############################
 # GetAdminDetails
 ############################
@@ -678,6 +861,17 @@ async def update_admin_config(
     }
 
 
+############################
+# PasswordHashMetrics
+############################
+
+
+@router.get("/admin/password/metrics")
+async def get_password_hash_metrics(user=Depends(get_admin_user)):
+    # Queue depth and timings of this worker's password hashing pool
+    return password_hash_pool.metrics()
+
+
 class LdapServerConfig(BaseModel):
     label: str
     host: str
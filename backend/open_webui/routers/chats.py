@@ -5,6 +5,7 @@ from typing import Optional
 from open_webui.models.chats import (
     ChatForm,
     ChatImportForm,
+    ChatListResponse,
     ChatResponse,
     Chats,
     ChatTitleIdResponse,
@@ -13,9 +14,10 @@ from open_webui.models.tags import TagModel, Tags
 from open_webui.models.folders import Folders
 
 from open_webui.config import ENABLE_ADMIN_CHAT_ACCESS, ENABLE_ADMIN_EXPORT
+from open_webui.internal.pagination import set_next_cursor
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import SRC_LOG_LEVELS
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel
 
 
@@ -35,13 +37,27 @@ router = APIRouter()
 @router.get("/", response_model=list[ChatTitleIdResponse])
 @router.get("/list", response_model=list[ChatTitleIdResponse])
 async def get_session_user_chat_list(
-    user=Depends(get_verified_user), page: Optional[int] = None
+    response: Response,
+    user=Depends(get_verified_user),
+    page: Optional[int] = None,
+    cursor: Optional[str] = None,
 ):
-    if page is not None:
+    if page is not None or cursor is not None:
         limit = 60
-        skip = (page - 1) * limit
+        skip = (page - 1) * limit if page is not None else 0
 
-        return Chats.get_chat_title_id_list_by_user_id(user.id, skip=skip, limit=limit)
+        try:
+            chats = Chats.get_chat_title_id_list_by_user_id(
+                user.id, skip=skip, limit=limit, cursor=cursor
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ERROR_MESSAGES.DEFAULT(e),
+            )
+
+        set_next_cursor(response, chats, limit, "updated_at", "id")
+        return chats
     else:
         return Chats.get_chat_title_id_list_by_user_id(user.id)
 
@@ -74,18 +90,30 @@ async def delete_all_user_chats(request: Request, user=Depends(get_verified_user
 @router.get("/list/user/{user_id}", response_model=list[ChatTitleIdResponse])
 async def get_user_chat_list_by_user_id(
     user_id: str,
+    response: Response,
     user=Depends(get_admin_user),
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
 ):
     if not ENABLE_ADMIN_CHAT_ACCESS:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
-    return Chats.get_chat_list_by_user_id(
-        user_id, include_archived=True, skip=skip, limit=limit
-    )
+
+    try:
+        chats = Chats.get_chat_list_by_user_id(
+            user_id, include_archived=True, skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
+
+    set_next_cursor(response, chats, limit, "updated_at", "id")
+    return chats
 
 
 ############################
@@ -140,7 +168,11 @@ async def import_chat(form_data: ChatImportForm, user=Depends(get_verified_user)
 
 @router.get("/search", response_model=list[ChatTitleIdResponse])
 async def search_user_chats(
-    text: str, page: Optional[int] = None, user=Depends(get_verified_user)
+    text: str,
+    response: Response,
+    page: Optional[int] = None,
+    cursor: Optional[str] = None,
+    user=Depends(get_verified_user),
 ):
     if page is None:
         page = 1
@@ -148,16 +180,26 @@ async def search_user_chats(
     limit = 60
     skip = (page - 1) * limit
 
-    chat_list = [
-        ChatTitleIdResponse(**chat.model_dump())
-        for chat in Chats.get_chats_by_user_id_and_search_text(
-            user.id, text, skip=skip, limit=limit
+    try:
+        chats = Chats.get_chats_by_user_id_and_search_text(
+            user.id, text, skip=skip, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
         )
-    ]
+
+    if chats and chats[-1].rank is not None:
+        set_next_cursor(response, chats, limit, "rank", "id")
+    else:
+        set_next_cursor(response, chats, limit, "updated_at", "id")
+
+    chat_list = [ChatTitleIdResponse(**chat.model_dump()) for chat in chats]
 
     # Delete tag if no chat is found
     words = text.strip().split(" ")
-    if page == 1 and len(words) == 1 and words[0].startswith("tag:"):
+    if page == 1 and cursor is None and len(words) == 1 and words[0].startswith("tag:"):
         tag_id = words[0].replace("tag:", "")
         if len(chat_list) == 0:
             if Tags.get_tag_by_name_and_user_id(tag_id, user.id):
@@ -192,12 +234,9 @@ async def get_chats_by_folder_id(folder_id: str, user=Depends(get_verified_user)
 ############################
 
 
-@router.get("/pinned", response_model=list[ChatResponse])
+@router.get("/pinned", response_model=list[ChatListResponse])
 async def get_user_pinned_chats(user=Depends(get_verified_user)):
-    return [
-        ChatResponse(**chat.model_dump())
-        for chat in Chats.get_pinned_chats_by_user_id(user.id)
-    ]
+    return Chats.get_pinned_chats_by_user_id(user.id)
 
 
 ############################
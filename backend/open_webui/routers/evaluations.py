@@ -1,5 +1,5 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from pydantic import BaseModel
 
 from open_webui.models.users import Users, UserModel
@@ -11,6 +11,7 @@ from open_webui.models.feedbacks import (
 )
 
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.internal.pagination import set_next_cursor
 from open_webui.utils.auth import get_admin_user, get_verified_user
 
 router = APIRouter()
@@ -61,8 +62,21 @@ class FeedbackUserResponse(FeedbackResponse):
 
 
 @router.get("/feedbacks/all", response_model=list[FeedbackUserResponse])
-async def get_all_feedbacks(user=Depends(get_admin_user)):
-    feedbacks = Feedbacks.get_all_feedbacks()
+async def get_all_feedbacks(
+    response: Response,
+    user=Depends(get_admin_user),
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+):
+    try:
+        feedbacks = Feedbacks.get_all_feedbacks(limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
+
+    set_next_cursor(response, feedbacks, limit, "updated_at", "id")
     return [
         FeedbackUserResponse(
             **feedback.model_dump(), user=Users.get_user_by_id(feedback.user_id)
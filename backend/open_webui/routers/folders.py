@@ -152,6 +152,16 @@ async def update_folder_parent_id_by_id(
 ):
     folder = Folders.get_folder_by_id_and_user_id(id, user.id)
     if folder:
+        if form_data.parent_id and Folders.is_folder_in_subtree(
+            form_data.parent_id, id, user.id
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ERROR_MESSAGES.DEFAULT(
+                    "Folder cannot be moved into itself or its subfolders"
+                ),
+            )
+
         existing_folder = Folders.get_folder_by_parent_id_and_user_id_and_name(
             form_data.parent_id, user.id, folder.name
         )
@@ -5,9 +5,8 @@ import logging
 from pathlib import Path
 from typing import Optional
 
+import aiofiles
 import aiohttp
-from aiocache import cached
-import requests
 
 
 from fastapi import Depends, HTTPException, Request, APIRouter
@@ -15,6 +14,7 @@ from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 from starlette.background import BackgroundTask
 
+from open_webui.internal.cache import invalidation_bus
 from open_webui.models.models import Models
 from open_webui.config import (
     CACHE_DIR,
@@ -50,28 +50,30 @@ log.setLevel(SRC_LOG_LEVELS["OPENAI"])
 ##########################################
 
 
-async def send_get_request(url, key=None):
+def get_http_session(request: Request, url: str) -> aiohttp.ClientSession:
+    return request.app.state.HTTP_CLIENTS.get_session(url)
+
+
+async def send_get_request(request: Request, url, key=None):
     timeout = aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST)
     try:
-        async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-            async with session.get(
-                url, headers={**({"Authorization": f"Bearer {key}"} if key else {})}
-            ) as response:
-                return await response.json()
+        session = get_http_session(request, url)
+        async with session.get(
+            url,
+            headers={**({"Authorization": f"Bearer {key}"} if key else {})},
+            timeout=timeout,
+        ) as response:
+            return await response.json()
     except Exception as e:
         # Handle connection error here
         log.error(f"Connection error: {e}")
         return None
 
 
-async def cleanup_response(
-    response: Optional[aiohttp.ClientResponse],
-    session: Optional[aiohttp.ClientSession],
-):
+async def cleanup_response(response: Optional[aiohttp.ClientResponse]):
+    # Returns the connection to the pool, or closes it if the body was not consumed
     if response:
-        response.close()
-    if session:
-        await session.close()
+        response.release()
 
 
 def openai_o1_handler(payload):
@@ -150,6 +152,9 @@ async def update_config(
         if url not in config_urls:
             request.app.state.config.OPENAI_API_CONFIGS.pop(url, None)
 
+    # Fetch the upstream model lists again with the new connections
+    invalidation_bus.publish("openai_models")
+
     return {
         "ENABLE_OPENAI_API": request.app.state.config.ENABLE_OPENAI_API,
         "OPENAI_API_BASE_URLS": request.app.state.config.OPENAI_API_BASE_URLS,
@@ -182,9 +187,11 @@ async def speech(request: Request, user=Depends(get_verified_user)):
 
         r = None
         try:
-            r = requests.post(
+            session = get_http_session(request, url)
+            async with session.post(
                 url=f"{url}/audio/speech",
                 data=body,
+                timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
                 headers={
                     "Content-Type": "application/json",
                     "Authorization": f"Bearer {request.app.state.config.OPENAI_API_KEYS[idx]}",
@@ -207,37 +214,41 @@ async def speech(request: Request, user=Depends(get_verified_user)):
                         else {}
                     ),
                 },
-                stream=True,
-            )
-
-            r.raise_for_status()
+            ) as r:
+                if r.status != 200:
+                    detail = None
+                    try:
+                        res = await r.json()
+                        if "error" in res:
+                            detail = f"External: {res['error']}"
+                    except Exception:
+                        pass
+
+                    raise HTTPException(
+                        status_code=r.status,
+                        detail=(
+                            detail if detail else "Open WebUI: Server Connection Error"
+                        ),
+                    )
 
-            # Save the streaming content to a file
-            with open(file_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    f.write(chunk)
+                # Save the streaming content to a file
+                async with aiofiles.open(file_path, "wb") as f:
+                    async for chunk in r.content.iter_chunked(8192):
+                        await f.write(chunk)
 
-            with open(file_body_path, "w") as f:
-                json.dump(json.loads(body.decode("utf-8")), f)
+            async with aiofiles.open(file_body_path, "w") as f:
+                await f.write(json.dumps(json.loads(body.decode("utf-8"))))
 
             # Return the saved file
             return FileResponse(file_path)
 
+        except HTTPException as e:
+            raise e
         except Exception as e:
             log.exception(e)
-
-            detail = None
-            if r is not None:
-                try:
-                    res = r.json()
-                    if "error" in res:
-                        detail = f"External: {res['error']}"
-                except Exception:
-                    detail = f"External: {e}"
-
             raise HTTPException(
-                status_code=r.status_code if r else 500,
-                detail=detail if detail else "Open WebUI: Server Connection Error",
+                status_code=r.status if r else 500,
+                detail=f"External: {e}" if r else "Open WebUI: Server Connection Error",
             )
 
     except ValueError:
@@ -266,7 +277,9 @@ async def get_all_models_responses(request: Request) -> list:
         if url not in request.app.state.config.OPENAI_API_CONFIGS:
             request_tasks.append(
                 send_get_request(
-                    f"{url}/models", request.app.state.config.OPENAI_API_KEYS[idx]
+                    request,
+                    f"{url}/models",
+                    request.app.state.config.OPENAI_API_KEYS[idx],
                 )
             )
         else:
@@ -279,6 +292,7 @@ async def get_all_models_responses(request: Request) -> list:
                 if len(model_ids) == 0:
                     request_tasks.append(
                         send_get_request(
+                            request,
                             f"{url}/models",
                             request.app.state.config.OPENAI_API_KEYS[idx],
                         )
@@ -325,9 +339,16 @@ async def get_all_models_responses(request: Request) -> list:
 
 async def get_filtered_models(models, user):
     # Filter models based on user access control
+    model_infos = {
+        model_info.id: model_info
+        for model_info in Models.get_models_by_ids(
+            [model["id"] for model in models.get("data", [])]
+        )
+    }
+
     filtered_models = []
     for model in models.get("data", []):
-        model_info = Models.get_model_by_id(model["id"])
+        model_info = model_infos.get(model["id"])
         if model_info:
             if user.id == model_info.user_id or has_access(
                 user.id, type="read", access_control=model_info.access_control
@@ -336,7 +357,6 @@ async def get_filtered_models(models, user):
     return filtered_models
 
 
-@cached(ttl=3)
 async def get_all_models(request: Request) -> dict[str, list]:
     log.info("get_all_models()")
 
@@ -403,103 +423,35 @@ async def get_models(
     }
 
     if url_idx is None:
-        models = await get_all_models(request)
+        # The model registry keeps the merged upstream lists up to date
+        from open_webui.utils.models import model_registry
+
+        models = {"data": await model_registry.get_openai_models(request)}
     else:
         url = request.app.state.config.OPENAI_API_BASE_URLS[url_idx]
         key = request.app.state.config.OPENAI_API_KEYS[url_idx]
 
         r = None
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(
-                total=AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST
-            )
-        ) as session:
-            try:
-                async with session.get(
-                    f"{url}/models",
-                    headers={
-                        "Authorization": f"Bearer {key}",
-                        "Content-Type": "application/json",
-                        **(
-                            {
-                                "X-OpenWebUI-User-Name": user.name,
-                                "X-OpenWebUI-User-Id": user.id,
-                                "X-OpenWebUI-User-Email": user.email,
-                                "X-OpenWebUI-User-Role": user.role,
-                            }
-                            if ENABLE_FORWARD_USER_INFO_HEADERS
-                            else {}
-                        ),
-                    },
-                ) as r:
-                    if r.status != 200:
-                        # Extract response error details if available
-                        error_detail = f"HTTP Error: {r.status}"
-                        res = await r.json()
-                        if "error" in res:
-                            error_detail = f"External Error: {res['error']}"
-                        raise Exception(error_detail)
-
-                    response_data = await r.json()
-
-                    # Check if we're calling OpenAI API based on the URL
-                    if "api.openai.com" in url:
-                        # Filter models according to the specified conditions
-                        response_data["data"] = [
-                            model
-                            for model in response_data.get("data", [])
-                            if not any(
-                                name in model["id"]
-                                for name in [
-                                    "babbage",
-                                    "dall-e",
-                                    "davinci",
-                                    "embedding",
-                                    "tts",
-                                    "whisper",
-                                ]
-                            )
-                        ]
-
-                    models = response_data
-            except aiohttp.ClientError as e:
-                # ClientError covers all aiohttp requests issues
-                log.exception(f"Client error: {str(e)}")
-                raise HTTPException(
-                    status_code=500, detail="Open WebUI: Server Connection Error"
-                )
-            except Exception as e:
-                log.exception(f"Unexpected error: {e}")
-                error_detail = f"Unexpected error: {str(e)}"
-                raise HTTPException(status_code=500, detail=error_detail)
-
-    if user.role == "user" and not BYPASS_MODEL_ACCESS_CONTROL:
-        models["data"] = get_filtered_models(models, user)
-
-    return models
-
-
-class ConnectionVerificationForm(BaseModel):
-    url: str
-    key: str
-
-
-@router.post("/verify")
-async def verify_connection(
-    form_data: ConnectionVerificationForm, user=Depends(get_admin_user)
-):
-    url = form_data.url
-    key = form_data.key
-
-    async with aiohttp.ClientSession(
-        timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST)
-    ) as session:
+        session = get_http_session(request, url)
         try:
             async with session.get(
                 f"{url}/models",
+                timeout=aiohttp.ClientTimeout(
+                    total=AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST
+                ),
                 headers={
                     "Authorization": f"Bearer {key}",
                     "Content-Type": "application/json",
+                    **(
+                        {
+                            "X-OpenWebUI-User-Name": user.name,
+                            "X-OpenWebUI-User-Id": user.id,
+                            "X-OpenWebUI-User-Email": user.email,
+                            "X-OpenWebUI-User-Role": user.role,
+                        }
+                        if ENABLE_FORWARD_USER_INFO_HEADERS
+                        else {}
+                    ),
                 },
             ) as r:
                 if r.status != 200:
@@ -511,8 +463,27 @@ async def verify_connection(
                     raise Exception(error_detail)
 
                 response_data = await r.json()
-                return response_data
 
+                # Check if we're calling OpenAI API based on the URL
+                if "api.openai.com" in url:
+                    # Filter models according to the specified conditions
+                    response_data["data"] = [
+                        model
+                        for model in response_data.get("data", [])
+                        if not any(
+                            name in model["id"]
+                            for name in [
+                                "babbage",
+                                "dall-e",
+                                "davinci",
+                                "embedding",
+                                "tts",
+                                "whisper",
+                            ]
+                        )
+                    ]
+
+                models = response_data
         except aiohttp.ClientError as e:
             # ClientError covers all aiohttp requests issues
             log.exception(f"Client error: {str(e)}")
@@ -524,6 +495,60 @@ async def verify_connection(
             error_detail = f"Unexpected error: {str(e)}"
             raise HTTPException(status_code=500, detail=error_detail)
 
+    if user.role == "user" and not BYPASS_MODEL_ACCESS_CONTROL:
+        models["data"] = await get_filtered_models(models, user)
+
+    return models
+
+
+class ConnectionVerificationForm(BaseModel):
+    url: str
+    key: str
+
+
+@router.post("/verify")
+async def verify_connection(
+    request: Request,
+    form_data: ConnectionVerificationForm,
+    user=Depends(get_admin_user),
+):
+    url = form_data.url
+    key = form_data.key
+
+    session = get_http_session(request, url)
+    try:
+        async with session.get(
+            f"{url}/models",
+            timeout=aiohttp.ClientTimeout(
+                total=AIOHTTP_CLIENT_TIMEOUT_OPENAI_MODEL_LIST
+            ),
+            headers={
+                "Authorization": f"Bearer {key}",
+                "Content-Type": "application/json",
+            },
+        ) as r:
+            if r.status != 200:
+                # Extract response error details if available
+                error_detail = f"HTTP Error: {r.status}"
+                res = await r.json()
+                if "error" in res:
+                    error_detail = f"External Error: {res['error']}"
+                raise Exception(error_detail)
+
+            response_data = await r.json()
+            return response_data
+
+    except aiohttp.ClientError as e:
+        # ClientError covers all aiohttp requests issues
+        log.exception(f"Client error: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail="Open WebUI: Server Connection Error"
+        )
+    except Exception as e:
+        log.exception(f"Unexpected error: {e}")
+        error_detail = f"Unexpected error: {str(e)}"
+        raise HTTPException(status_code=500, detail=error_detail)
+
 
 @router.post("/chat/completions")
 async def generate_chat_completion(
@@ -625,14 +650,13 @@ async def generate_chat_completion(
     response = None
 
     try:
-        session = aiohttp.ClientSession(
-            trust_env=True, timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT)
-        )
+        session = get_http_session(request, url)
 
         r = await session.request(
             method="POST",
             url=f"{url}/chat/completions",
             data=payload,
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
             headers={
                 "Authorization": f"Bearer {key}",
                 "Content-Type": "application/json",
@@ -657,9 +681,7 @@ async def generate_chat_completion(
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             try:
@@ -685,10 +707,8 @@ async def generate_chat_completion(
             detail=detail if detail else "Open WebUI: Server Connection Error",
         )
     finally:
-        if not streaming and session:
-            if r:
-                r.close()
-            await session.close()
+        if not streaming:
+            await cleanup_response(r)
 
 
 @router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
@@ -708,7 +728,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
     streaming = False
 
     try:
-        session = aiohttp.ClientSession(trust_env=True)
+        session = get_http_session(request, url)
         r = await session.request(
             method=request.method,
             url=f"{url}/{path}",
@@ -737,9 +757,7 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
                 r.content,
                 status_code=r.status,
                 headers=dict(r.headers),
-                background=BackgroundTask(
-                    cleanup_response, response=r, session=session
-                ),
+                background=BackgroundTask(cleanup_response, response=r),
             )
         else:
             response_data = await r.json()
@@ -762,7 +780,5 @@ async def proxy(path: str, request: Request, user=Depends(get_verified_user)):
             detail=detail if detail else "Open WebUI: Server Connection Error",
         )
     finally:
-        if not streaming and session:
-            if r:
-                r.close()
-            await session.close()
+        if not streaming:
+            await cleanup_response(r)
@@ -4,16 +4,29 @@ import logging
 import sys
 import time
 
+from open_webui.internal.db import run_in_db_executor
 from open_webui.models.users import Users, UserNameResponse
-from open_webui.models.chats import Chats
+from open_webui.utils.message_buffer import message_buffer
 
 from open_webui.env import (
     ENABLE_WEBSOCKET_SUPPORT,
     WEBSOCKET_MANAGER,
+    WEBSOCKET_PRESENCE_INTERVAL,
+    WEBSOCKET_PRESENCE_SYNC_INTERVAL,
     WEBSOCKET_REDIS_URL,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock
+from open_webui.socket.utils import (
+    PresenceBroadcaster,
+    RedisLock,
+    RedisSessionPool,
+    RedisUsagePool,
+    RedisUserPool,
+    SessionPool,
+    UsagePool,
+    UserPool,
+    get_redis,
+)
 
 from open_webui.env import (
     GLOBAL_LOG_LEVEL,
@@ -53,64 +66,65 @@ TIMEOUT_DURATION = 3
 
 if WEBSOCKET_MANAGER == "redis":
     log.debug("Using Redis to manage websockets.")
-    SESSION_POOL = RedisDict("open-webui:session_pool", redis_url=WEBSOCKET_REDIS_URL)
-    USER_POOL = RedisDict("open-webui:user_pool", redis_url=WEBSOCKET_REDIS_URL)
-    USAGE_POOL = RedisDict("open-webui:usage_pool", redis_url=WEBSOCKET_REDIS_URL)
+    redis_client = get_redis(WEBSOCKET_REDIS_URL)
+
+    SESSION_POOL = RedisSessionPool(redis_client, "open-webui:session_pool")
+    USER_POOL = RedisUserPool(redis_client, "open-webui:user_sessions")
+    USAGE_POOL = RedisUsagePool(redis_client, "open-webui:usage_models")
 
     clean_up_lock = RedisLock(
-        redis_url=WEBSOCKET_REDIS_URL,
+        redis_client,
         lock_name="usage_cleanup_lock",
         timeout_secs=TIMEOUT_DURATION * 2,
     )
     aquire_func = clean_up_lock.aquire_lock
     renew_func = clean_up_lock.renew_lock
     release_func = clean_up_lock.release_lock
+
+    # Presence syncs are emitted to the clients of every worker, so one runs them
+    presence_sync_lock = RedisLock(
+        redis_client,
+        lock_name="presence_sync_lock",
+        timeout_secs=max(int(WEBSOCKET_PRESENCE_SYNC_INTERVAL * 2), 1),
+    )
+    presence_sync_aquire_func = presence_sync_lock.aquire_lock
+    presence_sync_renew_func = presence_sync_lock.renew_lock
+    presence_sync_release_func = presence_sync_lock.release_lock
 else:
-    SESSION_POOL = {}
-    USER_POOL = {}
-    USAGE_POOL = {}
-    aquire_func = release_func = renew_func = lambda: True
+    SESSION_POOL = SessionPool()
+    USER_POOL = UserPool()
+    USAGE_POOL = UsagePool()
+
+    async def aquire_func():
+        return True
+
+    release_func = renew_func = aquire_func
+    presence_sync_aquire_func = presence_sync_renew_func = aquire_func
+    presence_sync_release_func = aquire_func
 
 
 async def periodic_usage_pool_cleanup():
-    if not aquire_func():
+    if not await aquire_func():
         log.debug("Usage pool cleanup lock already exists. Not running it.")
         return
     log.debug("Running periodic_usage_pool_cleanup")
     try:
         while True:
-            if not renew_func():
+            if not await renew_func():
                 log.error(f"Unable to renew cleanup lock. Exiting usage pool cleanup.")
                 raise Exception("Unable to renew usage pool cleanup lock.")
 
-            now = int(time.time())
-            send_usage = False
-            for model_id, connections in list(USAGE_POOL.items()):
-                # Creating a list of sids to remove if they have timed out
-                expired_sids = [
-                    sid
-                    for sid, details in connections.items()
-                    if now - details["updated_at"] > TIMEOUT_DURATION
-                ]
-
-                for sid in expired_sids:
-                    del connections[sid]
-
-                if not connections:
-                    log.debug(f"Cleaning up model {model_id} from usage pool")
-                    del USAGE_POOL[model_id]
-                else:
-                    USAGE_POOL[model_id] = connections
-
-                send_usage = True
+            send_usage = await USAGE_POOL.remove_expired(
+                int(time.time()), TIMEOUT_DURATION
+            )
 
             if send_usage:
                 # Emit updated usage information after cleaning
-                await sio.emit("usage", {"models": get_models_in_use()})
+                presence.usage_updated()
 
             await asyncio.sleep(TIMEOUT_DURATION)
     finally:
-        release_func()
+        await release_func()
 
 
 app = socketio.ASGIApp(
@@ -119,10 +133,38 @@ app = socketio.ASGIApp(
 )
 
 
-def get_models_in_use():
+async def get_models_in_use():
     # List models that are currently in use
-    models_in_use = list(USAGE_POOL.keys())
-    return models_in_use
+    return await USAGE_POOL.model_ids()
+
+
+presence = PresenceBroadcaster(
+    sio.emit,
+    get_user_ids=USER_POOL.user_ids,
+    get_model_ids=get_models_in_use,
+    interval=WEBSOCKET_PRESENCE_INTERVAL,
+)
+
+
+async def periodic_presence_sync():
+    if not await presence_sync_aquire_func():
+        log.debug("Presence sync lock already exists. Not running it.")
+        return
+    log.debug("Running periodic_presence_sync")
+    try:
+        while True:
+            await asyncio.sleep(WEBSOCKET_PRESENCE_SYNC_INTERVAL)
+
+            if not await presence_sync_renew_func():
+                log.error("Unable to renew presence sync lock. Exiting presence sync.")
+                raise Exception("Unable to renew presence sync lock.")
+
+            try:
+                await presence.sync()
+            except Exception as e:
+                log.exception(e)
+    finally:
+        await presence_sync_release_func()
 
 
 @sio.on("usage")
@@ -132,13 +174,10 @@ async def usage(sid, data):
     current_time = int(time.time())
 
     # Store the new usage data and task
-    USAGE_POOL[model_id] = {
-        **(USAGE_POOL[model_id] if model_id in USAGE_POOL else {}),
-        sid: {"updated_at": current_time},
-    }
+    await USAGE_POOL.touch(model_id, sid, current_time)
 
     # Broadcast the usage data to all clients
-    await sio.emit("usage", {"models": get_models_in_use()})
+    presence.usage_updated()
 
 
 @sio.event
@@ -148,38 +187,29 @@ async def connect(sid, environ, auth):
         data = decode_token(auth["token"])
 
         if data is not None and "id" in data:
-            user = Users.get_user_by_id(data["id"])
+            user = await run_in_db_executor(Users.get_identity_by_id, data["id"])
 
         if user:
-            SESSION_POOL[sid] = user.model_dump()
-            if user.id in USER_POOL:
-                USER_POOL[user.id] = USER_POOL[user.id] + [sid]
-            else:
-                USER_POOL[user.id] = [sid]
+            await SESSION_POOL.set(sid, user.model_dump())
+            if await USER_POOL.add(user.id, sid):
+                presence.user_joined(user.id)
 
             # print(f"user {user.name}({user.id}) connected with session ID {sid}")
-            await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
-            await sio.emit("usage", {"models": get_models_in_use()})
+            # The new client gets the full lists, everyone else a delta later
+            await presence.sync(to=sid)
 
 
 @sio.on("user-list")
 async def user_list(sid):
-    await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
+    await sio.emit("user-list", {"user_ids": await USER_POOL.user_ids()}, to=sid)
 
 
 @sio.event
 async def disconnect(sid):
-    if sid in SESSION_POOL:
-        user = SESSION_POOL[sid]
-        del SESSION_POOL[sid]
-
-        user_id = user["id"]
-        USER_POOL[user_id] = [_sid for _sid in USER_POOL[user_id] if _sid != sid]
-
-        if len(USER_POOL[user_id]) == 0:
-            del USER_POOL[user_id]
-
-        await sio.emit("user-list", {"user_ids": list(USER_POOL.keys())})
+    user = await SESSION_POOL.pop(sid)
+    if user:
+        if await USER_POOL.remove(user["id"], sid):
+            presence.user_left(user["id"])
     else:
         pass
         # print(f"Unknown session ID {sid} disconnected")
@@ -189,7 +219,7 @@ def get_event_emitter(request_info):
     async def __event_emitter__(event_data):
         user_id = request_info["user_id"]
         session_ids = list(
-            set(USER_POOL.get(user_id, []) + [request_info["session_id"]])
+            set(await USER_POOL.get(user_id) + [request_info["session_id"]])
         )
 
         for session_id in session_ids:
@@ -204,14 +234,25 @@ def get_event_emitter(request_info):
             )
 
         if "type" in event_data and event_data["type"] == "status":
-            Chats.add_message_status_to_chat_by_id_and_message_id(
+            message = await message_buffer.get_message(
                 request_info["chat_id"],
                 request_info["message_id"],
-                event_data.get("data", {}),
             )
 
+            if message:
+                await message_buffer.update(
+                    request_info["chat_id"],
+                    request_info["message_id"],
+                    {
+                        "statusHistory": [
+                            *message.get("statusHistory", []),
+                            event_data.get("data", {}),
+                        ],
+                    },
+                )
+
         if "type" in event_data and event_data["type"] == "message":
-            message = Chats.get_message_by_id_and_message_id(
+            message = await message_buffer.get_message(
                 request_info["chat_id"],
                 request_info["message_id"],
             )
@@ -219,7 +260,7 @@ def get_event_emitter(request_info):
             content = message.get("content", "")
             content += event_data.get("data", {}).get("content", "")
 
-            Chats.upsert_message_to_chat_by_id_and_message_id(
+            await message_buffer.update(
                 request_info["chat_id"],
                 request_info["message_id"],
                 {
@@ -230,7 +271,7 @@ def get_event_emitter(request_info):
         if "type" in event_data and event_data["type"] == "replace":
             content = event_data.get("data", {}).get("content", "")
 
-            Chats.upsert_message_to_chat_by_id_and_message_id(
+            await message_buffer.update(
                 request_info["chat_id"],
                 request_info["message_id"],
                 {
@@ -257,14 +298,14 @@ def get_event_call(request_info):
     return __event_call__
 
 
-def get_user_id_from_session_pool(sid):
-    user = SESSION_POOL.get(sid)
+async def get_user_id_from_session_pool(sid):
+    user = await SESSION_POOL.get(sid)
     if user:
         return user["id"]
     return None
 
 
-def get_user_ids_from_room(room):
+async def get_user_ids_from_room(room):
     active_session_ids = sio.manager.get_participants(
         namespace="/",
         room=room,
@@ -272,13 +313,17 @@ def get_user_ids_from_room(room):
 
     active_user_ids = list(
         set(
-            [SESSION_POOL.get(session_id[0])["id"] for session_id in active_session_ids]
+            [
+                user["id"]
+                for user in await SESSION_POOL.get_many(
+                    [session_id[0] for session_id in active_session_ids]
+                )
+                if user
+            ]
         )
     )
     return active_user_ids
 
 
-def get_active_status_by_user_id(user_id):
-    if user_id in USER_POOL:
-        return True
-    return False
+async def get_active_status_by_user_id(user_id):
+    return await USER_POOL.contains(user_id)
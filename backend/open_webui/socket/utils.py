@@ -1,87 +1,348 @@
+import asyncio
 import json
-import redis
+import logging
 import uuid
+from typing import Awaitable, Callable, Optional
+
+import redis.asyncio as redis
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["SOCKET"])
+
+
+def get_redis(redis_url):
+    return redis.Redis.from_url(redis_url, decode_responses=True)
 
 
 class RedisLock:
-    def __init__(self, redis_url, lock_name, timeout_secs):
+    def __init__(self, redis_client, lock_name, timeout_secs):
         self.lock_name = lock_name
         self.lock_id = str(uuid.uuid4())
         self.timeout_secs = timeout_secs
         self.lock_obtained = False
-        self.redis = redis.Redis.from_url(redis_url, decode_responses=True)
+        self.redis = redis_client
 
-    def aquire_lock(self):
+    async def aquire_lock(self):
         # nx=True will only set this key if it _hasn't_ already been set
-        self.lock_obtained = self.redis.set(
+        self.lock_obtained = await self.redis.set(
             self.lock_name, self.lock_id, nx=True, ex=self.timeout_secs
         )
         return self.lock_obtained
 
-    def renew_lock(self):
+    async def renew_lock(self):
         # xx=True will only set this key if it _has_ already been set
-        return self.redis.set(
+        return await self.redis.set(
             self.lock_name, self.lock_id, xx=True, ex=self.timeout_secs
         )
 
-    def release_lock(self):
-        lock_value = self.redis.get(self.lock_name)
-        if lock_value and lock_value.decode("utf-8") == self.lock_id:
-            self.redis.delete(self.lock_name)
+    async def release_lock(self):
+        lock_value = await self.redis.get(self.lock_name)
+        if lock_value and lock_value == self.lock_id:
+            await self.redis.delete(self.lock_name)
+
+
+####################
+# Session pool: sid -> user
+####################
+
 
+class SessionPool:
+    def __init__(self):
+        self.sessions: dict[str, dict] = {}
 
-class RedisDict:
-    def __init__(self, name, redis_url):
+    async def set(self, sid: str, user: dict):
+        self.sessions[sid] = user
+
+    async def get(self, sid: str) -> Optional[dict]:
+        return self.sessions.get(sid)
+
+    async def get_many(self, sids: list[str]) -> list[Optional[dict]]:
+        return [self.sessions.get(sid) for sid in sids]
+
+    async def pop(self, sid: str) -> Optional[dict]:
+        return self.sessions.pop(sid, None)
+
+
+class RedisSessionPool:
+    def __init__(self, redis_client, name: str):
+        self.redis = redis_client
         self.name = name
-        self.redis = redis.Redis.from_url(redis_url, decode_responses=True)
 
-    def __setitem__(self, key, value):
-        serialized_value = json.dumps(value)
-        self.redis.hset(self.name, key, serialized_value)
+    async def set(self, sid: str, user: dict):
+        await self.redis.hset(self.name, sid, json.dumps(user))
+
+    async def get(self, sid: str) -> Optional[dict]:
+        value = await self.redis.hget(self.name, sid)
+        return json.loads(value) if value is not None else None
+
+    async def get_many(self, sids: list[str]) -> list[Optional[dict]]:
+        if not sids:
+            return []
+        return [
+            json.loads(value) if value is not None else None
+            for value in await self.redis.hmget(self.name, sids)
+        ]
+
+    async def pop(self, sid: str) -> Optional[dict]:
+        # Read and delete in one MULTI so only one disconnect handler gets the user
+        async with self.redis.pipeline(transaction=True) as pipe:
+            value, _ = await pipe.hget(self.name, sid).hdel(self.name, sid).execute()
+        return json.loads(value) if value is not None else None
 
-    def __getitem__(self, key):
-        value = self.redis.hget(self.name, key)
-        if value is None:
-            raise KeyError(key)
-        return json.loads(value)
 
-    def __delitem__(self, key):
-        result = self.redis.hdel(self.name, key)
-        if result == 0:
-            raise KeyError(key)
+####################
+# User pool: user_id -> sids
+####################
+
+
+class UserPool:
+    def __init__(self):
+        self.users: dict[str, set[str]] = {}
+
+    async def add(self, user_id: str, sid: str) -> bool:
+        """
+        Adds a session, returning whether it is the user's first.
+        """
+        joined = user_id not in self.users
+        self.users.setdefault(user_id, set()).add(sid)
+        return joined
+
+    async def remove(self, user_id: str, sid: str) -> bool:
+        """
+        Removes a session, returning whether it was the user's last.
+        """
+        sids = self.users.get(user_id)
+        if sids is not None:
+            sids.discard(sid)
+            if not sids:
+                del self.users[user_id]
+                return True
+        return False
+
+    async def get(self, user_id: str) -> list[str]:
+        return list(self.users.get(user_id, ()))
+
+    async def contains(self, user_id: str) -> bool:
+        return user_id in self.users
+
+    async def user_ids(self) -> list[str]:
+        return list(self.users.keys())
+
+
+class RedisUserPool:
+    # Removes the sid and, if it was the user's last one, the user, atomically
+    # so that a concurrent connect on another worker cannot be lost
+    REMOVE_SCRIPT = """
+    redis.call('SREM', KEYS[1], ARGV[1])
+    if redis.call('SCARD', KEYS[1]) == 0 then
+        return redis.call('SREM', KEYS[2], ARGV[2])
+    end
+    return 0
+    """
+
+    def __init__(self, redis_client, name: str):
+        # `name` is a set of connected user ids, `name:user_id` a set of sids
+        self.redis = redis_client
+        self.name = name
+        self.remove_script = self.redis.register_script(self.REMOVE_SCRIPT)
+
+    async def add(self, user_id: str, sid: str) -> bool:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            _, joined = await (
+                pipe.sadd(f"{self.name}:{user_id}", sid)
+                .sadd(self.name, user_id)
+                .execute()
+            )
+        return joined == 1
+
+    async def remove(self, user_id: str, sid: str) -> bool:
+        left = await self.remove_script(
+            keys=[f"{self.name}:{user_id}", self.name], args=[sid, user_id]
+        )
+        return left == 1
+
+    async def get(self, user_id: str) -> list[str]:
+        return list(await self.redis.smembers(f"{self.name}:{user_id}"))
 
-    def __contains__(self, key):
-        return self.redis.hexists(self.name, key)
+    async def contains(self, user_id: str) -> bool:
+        return bool(await self.redis.sismember(self.name, user_id))
 
-    def __len__(self):
-        return self.redis.hlen(self.name)
+    async def user_ids(self) -> list[str]:
+        return list(await self.redis.smembers(self.name))
 
-    def keys(self):
-        return self.redis.hkeys(self.name)
 
-    def values(self):
-        return [json.loads(v) for v in self.redis.hvals(self.name)]
+####################
+# Usage pool: model_id -> sid -> last update
+####################
 
-    def items(self):
-        return [(k, json.loads(v)) for k, v in self.redis.hgetall(self.name).items()]
 
-    def get(self, key, default=None):
+class UsagePool:
+    def __init__(self):
+        self.models: dict[str, dict[str, int]] = {}
+
+    async def touch(self, model_id: str, sid: str, now: int):
+        self.models.setdefault(model_id, {})[sid] = now
+
+    async def model_ids(self) -> list[str]:
+        return list(self.models.keys())
+
+    async def remove_expired(self, now: int, timeout: int) -> bool:
+        """
+        Drops sessions not updated within `timeout` seconds, and models left
+        without sessions. Returns whether there were any models to check.
+        """
+        had_models = bool(self.models)
+        for model_id, sessions in list(self.models.items()):
+            for sid, updated_at in list(sessions.items()):
+                if now - updated_at > timeout:
+                    del sessions[sid]
+            if not sessions:
+                del self.models[model_id]
+        return had_models
+
+
+class RedisUsagePool:
+    # Drops the sessions updated before ARGV[2] and, if none are left, the
+    # model, atomically so that a concurrent touch cannot be undone
+    EXPIRE_SCRIPT = """
+    local sessions = redis.call('HGETALL', KEYS[1])
+    for i = 1, #sessions, 2 do
+        if tonumber(sessions[i + 1]) < tonumber(ARGV[2]) then
+            redis.call('HDEL', KEYS[1], sessions[i])
+        end
+    end
+    if redis.call('HLEN', KEYS[1]) == 0 then
+        redis.call('SREM', KEYS[2], ARGV[1])
+    end
+    return 0
+    """
+
+    def __init__(self, redis_client, name: str):
+        # `name` is a set of model ids, `name:model_id` a hash of sid -> timestamp
+        self.redis = redis_client
+        self.name = name
+        self.expire_script = self.redis.register_script(self.EXPIRE_SCRIPT)
+
+    async def touch(self, model_id: str, sid: str, now: int):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            await (
+                pipe.hset(f"{self.name}:{model_id}", sid, now)
+                .sadd(self.name, model_id)
+                .execute()
+            )
+
+    async def model_ids(self) -> list[str]:
+        return list(await self.redis.smembers(self.name))
+
+    async def remove_expired(self, now: int, timeout: int) -> bool:
+        model_ids = await self.model_ids()
+        if not model_ids:
+            return False
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for model_id in model_ids:
+                await self.expire_script(
+                    keys=[f"{self.name}:{model_id}", self.name],
+                    args=[model_id, now - timeout],
+                    client=pipe,
+                )
+            await pipe.execute()
+        return True
+
+
+####################
+# Presence and usage broadcasts
+####################
+
+
+class PresenceBroadcaster:
+    """
+    Collects user joins/leaves and model usage changes for `interval` seconds
+    and emits them to all clients as one delta, instead of the full user and
+    model lists on every change. `sync` emits the full lists, which clients
+    use to recover from deltas that arrived out of order across workers.
+    """
+
+    def __init__(
+        self,
+        emit: Callable[..., Awaitable],
+        get_user_ids: Callable[[], Awaitable[list[str]]],
+        get_model_ids: Callable[[], Awaitable[list[str]]],
+        interval: float,
+    ):
+        self.emit = emit
+        self.get_user_ids = get_user_ids
+        self.get_model_ids = get_model_ids
+        self.interval = interval
+
+        # user_id -> whether the user is connected, as of the latest change
+        self.presence: dict[str, bool] = {}
+        self.usage_changed = False
+        # Models in use as of the last broadcast from this worker
+        self.model_ids: set[str] = set()
+
+        self.task: Optional[asyncio.Task] = None
+
+    def user_joined(self, user_id: str):
+        self.presence[user_id] = True
+        self._schedule()
+
+    def user_left(self, user_id: str):
+        self.presence[user_id] = False
+        self._schedule()
+
+    def usage_updated(self):
+        self.usage_changed = True
+        self._schedule()
+
+    def _schedule(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.interval)
         try:
-            return self[key]
-        except KeyError:
-            return default
-
-    def clear(self):
-        self.redis.delete(self.name)
-
-    def update(self, other=None, **kwargs):
-        if other is not None:
-            for k, v in other.items() if hasattr(other, "items") else other:
-                self[k] = v
-        for k, v in kwargs.items():
-            self[k] = v
-
-    def setdefault(self, key, default=None):
-        if key not in self:
-            self[key] = default
-        return self[key]
+            await self.flush()
+        except Exception as e:
+            log.exception(e)
+
+        # Changes made while flushing found this task still running, so were
+        # not scheduled
+        if self.presence or self.usage_changed:
+            self.task = asyncio.create_task(self._flush_later())
+
+    async def flush(self):
+        presence, self.presence = self.presence, {}
+        if presence:
+            await self.emit(
+                "user-list",
+                {
+                    "joined": [user_id for user_id, on in presence.items() if on],
+                    "left": [user_id for user_id, on in presence.items() if not on],
+                },
+            )
+
+        if self.usage_changed:
+            self.usage_changed = False
+
+            model_ids = set(await self.get_model_ids())
+            added, removed = model_ids - self.model_ids, self.model_ids - model_ids
+            self.model_ids = model_ids
+
+            if added or removed:
+                await self.emit(
+                    "usage", {"added": list(added), "removed": list(removed)}
+                )
+
+    async def sync(self, **kwargs):
+        """
+        Emits the full user and model lists, to everyone or e.g. `to=sid`.
+        """
+        model_ids = await self.get_model_ids()
+        if not kwargs:
+            self.model_ids = set(model_ids)
+
+        await self.emit("user-list", {"user_ids": await self.get_user_ids()}, **kwargs)
+        await self.emit("usage", {"models": model_ids}, **kwargs)
@@ -1,11 +1,282 @@
 # tasks.py
 import asyncio
-from typing import Dict
+import json
+import logging
+import math
+import time
+from typing import Dict, Optional
 from uuid import uuid4
 
-# A dictionary to keep track of active tasks
+from open_webui.env import (
+    CHAT_RESPONSE_MAX_CONCURRENCY,
+    CHAT_RESPONSE_MAX_CONCURRENCY_PER_USER,
+    CHAT_RESPONSE_MAX_QUEUE,
+    SRC_LOG_LEVELS,
+    WEBSOCKET_MANAGER,
+    WEBSOCKET_REDIS_URL,
+)
+from open_webui.internal.cache import invalidation_bus
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+# Identifies this worker as the owner of the tasks it runs
+WORKER_ID = str(uuid4())
+
+# Seconds a worker may go without a heartbeat before its tasks are dropped
+WORKER_TIMEOUT = 30
+
+# Seconds to wait for another worker to confirm that it stopped a task
+STOP_TASK_TIMEOUT = 5
+
+# A dictionary to keep track of active tasks on this worker
 tasks: Dict[str, asyncio.Task] = {}
 
+# Pending registry removals of finished tasks, referenced until they complete
+cleanup_tasks: set[asyncio.Task] = set()
+
+
+class TaskRegistry:
+    """
+    Metadata (owner worker, user id, chat id, start time) of the running tasks.
+    """
+
+    def __init__(self):
+        self.tasks: dict[str, dict] = {}
+
+    async def add(self, task_id: str, task: dict):
+        self.tasks[task_id] = task
+
+    async def remove(self, task_id: str):
+        self.tasks.pop(task_id, None)
+
+    async def get(self, task_id: str) -> Optional[dict]:
+        return self.tasks.get(task_id)
+
+    async def list(self, user_id: Optional[str] = None) -> dict[str, dict]:
+        return {
+            task_id: task
+            for task_id, task in self.tasks.items()
+            if user_id is None or task["user_id"] == user_id
+        }
+
+    async def heartbeat(self):
+        pass
+
+
+class RedisTaskRegistry:
+    """
+    Shares running tasks between workers: `name` is a hash of task id -> task,
+    `name:user:<id>` the set of a user's task ids, and `name:worker:<id>` a
+    heartbeat key whose expiry marks the tasks of a dead worker as stale.
+    """
+
+    def __init__(self, redis_client, name: str):
+        self.redis = redis_client
+        self.name = name
+
+    async def add(self, task_id: str, task: dict):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self.name, task_id, json.dumps(task))
+            if task["user_id"]:
+                pipe.sadd(f"{self.name}:user:{task['user_id']}", task_id)
+            await pipe.execute()
+
+    async def remove(self, task_id: str, task: Optional[dict] = None):
+        task = task or await self.get(task_id, check_worker=False)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hdel(self.name, task_id)
+            if task and task["user_id"]:
+                pipe.srem(f"{self.name}:user:{task['user_id']}", task_id)
+            await pipe.execute()
+
+    async def _drop_stale(self, tasks: dict[str, dict]) -> dict[str, dict]:
+        workers = list({task["worker"] for task in tasks.values()})
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for worker in workers:
+                pipe.exists(f"{self.name}:worker:{worker}")
+            alive = {
+                worker
+                for worker, exists in zip(workers, await pipe.execute())
+                if exists
+            }
+
+        for task_id, task in list(tasks.items()):
+            if task["worker"] not in alive:
+                log.info(f"Dropping task {task_id} of stopped worker {task['worker']}")
+                await self.remove(task_id, task)
+                del tasks[task_id]
+        return tasks
+
+    async def get(self, task_id: str, check_worker: bool = True) -> Optional[dict]:
+        value = await self.redis.hget(self.name, task_id)
+        if value is None:
+            return None
+
+        tasks = {task_id: json.loads(value)}
+        if check_worker:
+            tasks = await self._drop_stale(tasks)
+        return tasks.get(task_id)
+
+    async def list(self, user_id: Optional[str] = None) -> dict[str, dict]:
+        if user_id is None:
+            values = await self.redis.hgetall(self.name)
+        else:
+            task_ids = list(await self.redis.smembers(f"{self.name}:user:{user_id}"))
+            values = dict(
+                zip(task_ids, await self.redis.hmget(self.name, task_ids))
+                if task_ids
+                else []
+            )
+
+        return await self._drop_stale(
+            {
+                task_id: json.loads(value)
+                for task_id, value in values.items()
+                if value is not None
+            }
+        )
+
+    async def heartbeat(self):
+        await self.redis.set(f"{self.name}:worker:{WORKER_ID}", 1, ex=WORKER_TIMEOUT)
+
+
+if WEBSOCKET_MANAGER == "redis":
+    from open_webui.socket.utils import get_redis
+
+    task_registry = RedisTaskRegistry(
+        get_redis(WEBSOCKET_REDIS_URL), "open-webui:tasks"
+    )
+else:
+    task_registry = TaskRegistry()
+
+
+class TaskLimitExceeded(Exception):
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TaskLimiter:
+    """
+    Runs at most `max_tasks` tasks of this worker at once and queues up to
+    `max_queue` more, and admits at most `max_user_tasks` running or queued
+    tasks per user. Tasks beyond that are rejected with `TaskLimitExceeded`.
+    """
+
+    def __init__(self, max_tasks: int, max_queue: int, max_user_tasks: int):
+        self.max_tasks = max_tasks
+        self.max_queue = max_queue
+        self.max_user_tasks = max_user_tasks
+        self.semaphore = asyncio.Semaphore(max_tasks) if max_tasks > 0 else None
+
+        # user_id -> running or queued tasks
+        self.users: dict[str, int] = {}
+        self.admitted = 0
+        self.running = 0
+        self.stats = {"completed": 0, "rejected": 0, "wait": 0.0, "work": 0.0}
+
+    @property
+    def queued(self) -> int:
+        return self.admitted - self.running
+
+    def retry_after(self) -> int:
+        # Time for the queue ahead to drain at the average task duration
+        if not self.stats["completed"] or self.max_tasks <= 0:
+            return 1
+        work = self.stats["work"] / self.stats["completed"]
+        return max(1, math.ceil(work * (self.queued + 1) / self.max_tasks))
+
+    def check(self, user_id: Optional[str] = None):
+        """
+        Raises `TaskLimitExceeded` if a task of the user would be rejected.
+        """
+        if self.max_user_tasks > 0 and user_id is not None:
+            if self.users.get(user_id, 0) >= self.max_user_tasks:
+                self.stats["rejected"] += 1
+                raise TaskLimitExceeded(
+                    f"Too many concurrent tasks, limit is {self.max_user_tasks} per user.",
+                    self.retry_after(),
+                )
+
+        if self.max_tasks > 0 and self.admitted >= self.max_tasks + self.max_queue:
+            self.stats["rejected"] += 1
+            raise TaskLimitExceeded(
+                "Server is busy, please try again later.", self.retry_after()
+            )
+
+    def admit(self, user_id: Optional[str] = None):
+        self.check(user_id)
+        self.admitted += 1
+        if user_id is not None:
+            self.users[user_id] = self.users.get(user_id, 0) + 1
+
+    def release(self, user_id: Optional[str] = None):
+        self.admitted -= 1
+        if user_id is not None:
+            self.users[user_id] -= 1
+            if not self.users[user_id]:
+                del self.users[user_id]
+
+    async def run(self, coroutine):
+        """
+        Runs an admitted `coroutine` once a slot is free. The caller releases
+        the admission when the task is done, even if stopped while queued.
+        """
+        queued_at = time.perf_counter()
+        if self.semaphore:
+            await self.semaphore.acquire()
+
+        started_at = time.perf_counter()
+        self.running += 1
+        try:
+            return await coroutine
+        finally:
+            self.running -= 1
+            if self.semaphore:
+                self.semaphore.release()
+
+            self.stats["completed"] += 1
+            self.stats["wait"] += started_at - queued_at
+            self.stats["work"] += time.perf_counter() - started_at
+
+    def metrics(self) -> dict:
+        completed = self.stats["completed"]
+        return {
+            "worker": WORKER_ID,
+            "running": self.running,
+            "queued": self.queued,
+            "users": len(self.users),
+            "max_tasks": self.max_tasks,
+            "max_queue": self.max_queue,
+            "max_user_tasks": self.max_user_tasks,
+            "completed": completed,
+            "rejected": self.stats["rejected"],
+            "avg_wait": self.stats["wait"] / completed if completed else 0.0,
+            "avg_work": self.stats["work"] / completed if completed else 0.0,
+        }
+
+
+task_limiter = TaskLimiter(
+    CHAT_RESPONSE_MAX_CONCURRENCY,
+    CHAT_RESPONSE_MAX_QUEUE,
+    CHAT_RESPONSE_MAX_CONCURRENCY_PER_USER,
+)
+
+
+def cancel_local_task(task_id: Optional[str]):
+    """
+    Cancel a task if it runs on this worker. Called for every stop request,
+    possibly from the invalidation bus listener thread.
+    """
+    task = tasks.get(task_id)
+    if task:
+        task.get_loop().call_soon_threadsafe(task.cancel)
+
+
+invalidation_bus.subscribe("tasks", cancel_local_task)
+
 
 def cleanup_task(task_id: str):
     """
@@ -13,33 +284,70 @@ def cleanup_task(task_id: str):
     """
     tasks.pop(task_id, None)  # Remove the task if it exists
 
+    cleanup = asyncio.create_task(task_registry.remove(task_id))
+    cleanup_tasks.add(cleanup)
+    cleanup.add_done_callback(cleanup_tasks.discard)
 
-def create_task(coroutine):
+
+async def create_task(
+    coroutine, user_id: Optional[str] = None, chat_id: Optional[str] = None
+):
     """
-    Create a new asyncio task and add it to the global task dictionary.
+    Create a new asyncio task and add it to the global task dictionary. The
+    task waits for a slot of the `task_limiter`, and raises `TaskLimitExceeded`
+    if even its queue is full.
     """
+    try:
+        task_limiter.admit(user_id)
+    except TaskLimitExceeded:
+        coroutine.close()
+        raise
+
     task_id = str(uuid4())  # Generate a unique ID for the task
-    task = asyncio.create_task(coroutine)  # Create the task
+
+    # Registered before the task starts, so that its removal comes after
+    try:
+        await task_registry.add(
+            task_id,
+            {
+                "worker": WORKER_ID,
+                "user_id": user_id,
+                "chat_id": chat_id,
+                "created_at": int(time.time()),
+            },
+        )
+    except Exception:
+        task_limiter.release(user_id)
+        coroutine.close()
+        raise
+
+    task = asyncio.create_task(task_limiter.run(coroutine))  # Create the task
+
+    def done(_):
+        # Closes the coroutine if the task was stopped before it started
+        coroutine.close()
+        task_limiter.release(user_id)
+        cleanup_task(task_id)
 
     # Add a done callback for cleanup
-    task.add_done_callback(lambda _: cleanup_task(task_id))
+    task.add_done_callback(done)
 
     tasks[task_id] = task
     return task_id, task
 
 
-def get_task(task_id: str):
+async def get_task(task_id: str) -> Optional[dict]:
     """
-    Retrieve a task by its task ID.
+    Retrieve a task's metadata by its task ID, from any worker.
     """
-    return tasks.get(task_id)
+    return await task_registry.get(task_id)
 
 
-def list_tasks():
+async def list_tasks(user_id: Optional[str] = None) -> list[str]:
     """
-    List all currently active task IDs.
+    List the IDs of the active tasks on all workers, optionally of one user.
     """
-    return list(tasks.keys())
+    return list((await task_registry.list(user_id)).keys())
 
 
 async def stop_task(task_id: str):
@@ -48,7 +356,23 @@ async def stop_task(task_id: str):
     """
     task = tasks.get(task_id)
     if not task:
-        raise ValueError(f"Task with ID {task_id} not found.")
+        if await task_registry.get(task_id) is None:
+            raise ValueError(f"Task with ID {task_id} not found.")
+
+        # The task runs on another worker, which cancels it on receipt and
+        # removes it from the registry once it is done
+        invalidation_bus.publish("tasks", task_id)
+
+        deadline = time.monotonic() + STOP_TASK_TIMEOUT
+        while await task_registry.get(task_id) is not None:
+            if time.monotonic() >= deadline:
+                return {
+                    "status": False,
+                    "message": f"Task {task_id} stop requested but not confirmed.",
+                }
+            await asyncio.sleep(0.1)
+
+        return {"status": True, "message": f"Task {task_id} successfully stopped."}
 
     task.cancel()  # Request task cancellation
     try:
@@ -59,3 +383,12 @@ async def stop_task(task_id: str):
         return {"status": True, "message": f"Task {task_id} successfully stopped."}
 
     return {"status": False, "message": f"Failed to stop task {task_id}."}
+
+
+async def periodic_heartbeat():
+    while True:
+        try:
+            await task_registry.heartbeat()
+        except Exception as e:
+            log.warning(f"Task registry heartbeat failed: {e}")
+        await asyncio.sleep(WORKER_TIMEOUT / 3)
@@ -0,0 +1,45 @@
+import asyncio
+import threading
+import uuid
+
+from sqlalchemy import event
+
+import open_webui.config  # noqa: F401, runs the migrations
+from open_webui.internal.db import engine, run_in_db_executor
+from open_webui.models.chats import ChatForm, Chats
+
+
+def test_event_loop_runs_while_db_call_blocks():
+    user_id = str(uuid.uuid4())
+    chat = Chats.insert_new_chat(user_id, ChatForm(chat={"title": "chat"}))
+
+    # Holds the chat lookup on its query until the event loop has moved on
+    started, release = threading.Event(), threading.Event()
+
+    def block(*args):
+        if threading.current_thread().name.startswith("open-webui-db"):
+            started.set()
+            assert release.wait(timeout=10)
+
+    async def run():
+        lookup = asyncio.create_task(
+            run_in_db_executor(Chats.get_chat_title_by_id, chat.id)
+        )
+
+        # Other coroutines keep running while the query is blocked
+        ticks = 0
+        while not started.is_set() or ticks < 10:
+            await asyncio.sleep(0.001)
+            ticks += 1
+        assert not lookup.done()
+
+        release.set()
+        return await lookup
+
+    event.listen(engine, "before_cursor_execute", block)
+    try:
+        assert asyncio.run(run()) == "chat"
+    finally:
+        event.remove(engine, "before_cursor_execute", block)
+        release.set()
+        Chats.delete_chats_by_user_id(user_id)
@@ -0,0 +1,96 @@
+import re
+
+import pytest
+from sqlalchemy import inspect, or_, select
+
+import open_webui.config  # noqa: F401, runs the migrations
+from open_webui.internal.db import engine
+from open_webui.models.chats import Chat, ChatTag
+from open_webui.models.feedbacks import Feedback
+from open_webui.models.folders import Folder
+from open_webui.models.groups import GroupMember
+from open_webui.models.messages import Message, MessageReaction
+
+# Hot queries from `models/`, reduced to their filter and ordering shape
+HOT_QUERIES = {
+    "chat_list": select(Chat.id)
+    .filter_by(user_id="u", folder_id=None, archived=False)
+    .order_by(Chat.updated_at.desc(), Chat.id.desc())
+    .limit(60),
+    "chat_list_all": select(Chat.id)
+    .filter_by(user_id="u")
+    .order_by(Chat.updated_at.desc()),
+    "chat_pinned": select(Chat.id)
+    .filter_by(user_id="u", pinned=True, archived=False)
+    .order_by(Chat.updated_at.desc()),
+    "chat_archived": select(Chat.id)
+    .filter_by(user_id="u", archived=True)
+    .order_by(Chat.updated_at.desc()),
+    "chat_folder": select(Chat.id)
+    .filter_by(user_id="u", folder_id="f")
+    .filter(or_(Chat.pinned == False, Chat.pinned == None))
+    .filter_by(archived=False)
+    .order_by(Chat.updated_at.desc()),
+    "chat_share": select(Chat.id).filter_by(share_id="s"),
+    "chat_tag": select(ChatTag.chat_id).filter_by(user_id="u", tag_id="t"),
+    "channel_messages": select(Message.id)
+    .filter_by(channel_id="c", parent_id=None)
+    .order_by(Message.created_at.desc(), Message.id.desc())
+    .limit(50),
+    "thread_messages": select(Message.id)
+    .filter_by(channel_id="c", parent_id="p")
+    .order_by(Message.created_at.desc()),
+    "message_replies": select(Message.id)
+    .filter_by(parent_id="p")
+    .order_by(Message.created_at.desc()),
+    "message_reactions": select(MessageReaction.id).filter_by(message_id="m"),
+    "feedbacks_by_user": select(Feedback.id)
+    .filter_by(user_id="u")
+    .order_by(Feedback.updated_at.desc()),
+    "feedbacks_by_type": select(Feedback.id)
+    .filter_by(type="t")
+    .order_by(Feedback.updated_at.desc()),
+    "folders_by_user": select(Folder.id).filter_by(user_id="u"),
+    "folders_by_parent": select(Folder.id).filter_by(parent_id="p", user_id="u"),
+    "groups_by_member": select(GroupMember.group_id).filter_by(user_id="u"),
+}
+
+# A table access that walks the whole table or index instead of searching it,
+# e.g. "SCAN chat", "SCAN TABLE chat" or "SCAN chat USING INDEX chat_idx"
+FULL_SCAN = re.compile(r"^SCAN (TABLE )?\w+")
+
+
+def get_missing_columns(query):
+    # Columns the models have but the migrations never added to the database
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+
+    missing = []
+    for table in query.get_final_froms():
+        if table.name not in tables:
+            missing.append(table.name)
+            continue
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        missing.extend(
+            f"{table.name}.{column.name}"
+            for column in table.columns
+            if column.name not in existing
+        )
+    return missing
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_index(name):
+    # Runs against the schema built by `alembic upgrade head`, as deployed
+    query = HOT_QUERIES[name]
+    missing = get_missing_columns(query)
+    if missing:
+        pytest.skip(f"Not in the migrated schema: {', '.join(missing)}")
+
+    sql = str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as connection:
+        plan = [
+            row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+        ]
+
+    assert not any(FULL_SCAN.match(step) for step in plan), (sql, plan)
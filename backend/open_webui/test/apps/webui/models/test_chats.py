@@ -0,0 +1,145 @@
+import threading
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+import open_webui.config  # noqa: F401, runs the migrations
+from open_webui.internal.db import engine
+from open_webui.models.chats import ChatForm, Chats
+
+
+@pytest.fixture
+def chat():
+    user_id = str(uuid.uuid4())
+    chat = Chats.insert_new_chat(
+        user_id,
+        ChatForm(
+            chat={
+                "title": "chat",
+                "history": {
+                    "currentId": "1",
+                    "messages": {"1": {"id": "1", "content": "hello"}},
+                },
+            }
+        ),
+    )
+    yield chat
+    Chats.delete_chats_by_user_id(user_id)
+
+
+def test_full_save_supersedes_pending_messages(chat):
+    Chats.upsert_message_to_chat_by_id_and_message_id(
+        chat.id, "1", {"content": "streamed"}
+    )
+
+    # e.g. the user edits the message in the frontend, which saves the chat
+    edited = Chats.get_chat_by_id(chat.id).chat
+    edited["history"]["messages"]["1"]["content"] = "edited"
+    Chats.update_chat_by_id(chat.id, edited)
+
+    assert Chats.get_pending_messages_by_chat_id(chat.id) == []
+    assert Chats.get_messages_by_chat_id(chat.id)["1"]["content"] == "edited"
+
+    Chats.compact_messages_by_chat_id(chat.id)
+    assert Chats.get_messages_by_chat_id(chat.id)["1"]["content"] == "edited"
+
+
+def test_current_id_is_last_upserted_message(chat):
+    # Upserts within the same second share `updated_at`
+    for message_id in ["3", "2", "4", "2"]:
+        Chats.upsert_message_to_chat_by_id_and_message_id(
+            chat.id, message_id, {"id": message_id, "content": message_id}
+        )
+
+    assert Chats.get_chat_by_id(chat.id).chat["history"]["currentId"] == "2"
+
+    Chats.compact_messages_by_chat_id(chat.id)
+    chat = Chats.get_chat_by_id(chat.id)
+    assert chat.chat["history"]["currentId"] == "2"
+    assert set(chat.chat["history"]["messages"]) == {"1", "2", "3", "4"}
+
+
+def test_chat_lists_include_pending_messages(chat):
+    Chats.upsert_message_to_chat_by_id_and_message_id(
+        chat.id, "1", {"content": "streamed"}
+    )
+
+    def contents(chats):
+        return [
+            c.chat["history"]["messages"]["1"]["content"]
+            for c in chats
+            if c.id == chat.id
+        ]
+
+    assert contents(Chats.get_chats_by_user_id(chat.user_id)) == ["streamed"]
+    assert contents(Chats.get_chats()) == ["streamed"]
+
+    Chats.update_chat_folder_id_by_id_and_user_id(chat.id, chat.user_id, "folder")
+    assert contents(
+        Chats.get_chats_by_folder_ids_and_user_id(["folder"], chat.user_id)
+    ) == ["streamed"]
+
+    Chats.toggle_chat_archive_by_id(chat.id)
+    assert contents(Chats.get_archived_chats_by_user_id(chat.user_id)) == ["streamed"]
+
+
+def test_concurrent_upserts_get_distinct_seqs(chat):
+    Chats.upsert_message_to_chat_by_id_and_message_id(chat.id, "1", {})
+
+    # Once an update has read the next seq, another worker takes it first
+    raced = threading.Event()
+
+    def race(conn, cursor, statement, *args):
+        if statement.startswith("INSERT INTO chat_message") and not raced.is_set():
+            raced.set()
+            thread = threading.Thread(
+                target=Chats.upsert_message_to_chat_by_id_and_message_id,
+                args=(chat.id, "2", {"content": "2"}),
+            )
+            thread.start()
+            thread.join()
+
+    event.listen(engine, "before_cursor_execute", race)
+    try:
+        assert Chats.upsert_message_to_chat_by_id_and_message_id(
+            chat.id, "3", {"content": "3"}
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", race)
+
+    assert raced.is_set()
+    assert [
+        (message.message_id, message.seq)
+        for message in Chats.get_pending_messages_by_chat_id(chat.id)
+    ] == [("1", 1), ("2", 2), ("3", 3)]
+    assert Chats.get_chat_by_id(chat.id).chat["history"]["currentId"] == "3"
+
+
+def search(user_id, text):
+    return [
+        chat.title for chat in Chats.get_chats_by_user_id_and_search_text(user_id, text)
+    ]
+
+
+def test_search_matches_content_and_title_substrings(chat):
+    Chats.insert_new_chat(
+        chat.user_id,
+        ChatForm(
+            chat={
+                "title": "Quarterly foobar report",
+                "messages": [{"role": "user", "content": "revenue numbers"}],
+            }
+        ),
+    )
+
+    assert search(chat.user_id, "revenue") == ["Quarterly foobar report"]
+    assert search(chat.user_id, "hel") == ["chat"]
+    # Not a word prefix, so only the title substring match finds it
+    assert search(chat.user_id, "oobar") == ["Quarterly foobar report"]
+
+
+def test_search_without_terms_returns_nothing(chat):
+    assert search(chat.user_id, "?!") == []
+    assert search(chat.user_id, "...") == []
+    assert search(chat.user_id, "") == ["chat"]
@@ -0,0 +1,160 @@
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+import open_webui.config  # noqa: F401, runs the migrations
+from open_webui.internal.db import Base
+from open_webui.models.chats import ChatImportForm, Chats
+from open_webui.models.folders import Folder, Folders
+
+NODES = 1000
+USER_ID = "u"
+
+
+def build_tree(session, branching):
+    # Node i is a child of node (i - 1) // branching; branching=1 is a chain
+    session.add_all(
+        [
+            Folder(
+                id=str(i),
+                parent_id=str((i - 1) // branching) if i else None,
+                user_id=USER_ID,
+                name=str(i),
+            )
+            for i in range(NODES)
+        ]
+    )
+    session.commit()
+
+
+def get_subtree_ids_per_node(session, id):
+    # The previous implementation: one query per folder (iterative here, as a
+    # 1,000-deep chain exceeds Python's recursion limit)
+    ids, pending = [], [id]
+    while pending:
+        id = pending.pop()
+        ids.append(id)
+        pending.extend(
+            child_id
+            for (child_id,) in session.execute(
+                select(Folder.id).filter_by(parent_id=id, user_id=USER_ID)
+            ).all()
+        )
+    return ids
+
+
+@pytest.fixture(params=[1, 4], ids=["chain", "wide"])
+def session(request):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+
+    with Session(engine) as session:
+        build_tree(session, request.param)
+        session.info["statements"] = statements
+        yield session
+
+
+def test_subtree_in_one_query(session):
+    statements = session.info["statements"]
+
+    statements.clear()
+    per_node = get_subtree_ids_per_node(session, "0")
+    per_node_queries = len(statements)
+
+    statements.clear()
+    cte = [
+        id for (id,) in session.execute(Folders._get_subtree_ids_query("0", USER_ID))
+    ]
+    cte_queries = len(statements)
+
+    assert sorted(cte) == sorted(per_node) and len(cte) == NODES
+    assert per_node_queries == NODES
+    assert cte_queries == 1
+
+
+def test_ancestors_in_one_query(session):
+    statements = session.info["statements"]
+    leaf = str(NODES - 1)
+
+    statements.clear()
+    ancestors = [
+        id for (id,) in session.execute(Folders._get_ancestor_ids_query(leaf, USER_ID))
+    ]
+
+    assert len(statements) == 1
+    assert ancestors[0] == leaf and "0" in ancestors
+    assert set(ancestors) <= set(get_subtree_ids_per_node(session, "0"))
+
+
+def test_subtree_stops_on_cycle(session):
+    # Data written before move-cycle checks existed may contain loops
+    session.get(Folder, "0").parent_id = str(NODES - 1)
+    session.commit()
+
+    ids = [
+        id for (id,) in session.execute(Folders._get_subtree_ids_query("0", USER_ID))
+    ]
+    assert len(ids) == NODES
+
+
+def test_delete_folder_deletes_subtree_and_its_chats():
+    user_id, other_user_id = str(uuid.uuid4()), str(uuid.uuid4())
+
+    # root -> child -> grandchild, and a sibling tree that stays
+    root = Folders.insert_new_folder(user_id, "root")
+    child = Folders.insert_new_folder(user_id, "child", root.id)
+    grandchild = Folders.insert_new_folder(user_id, "grandchild", child.id)
+    sibling = Folders.insert_new_folder(user_id, "sibling")
+
+    def import_chat(user_id, folder_id, title):
+        return Chats.import_chat(
+            user_id,
+            ChatImportForm(
+                chat={"title": title},
+                meta={"tags": ["work"]},
+                folder_id=folder_id,
+            ),
+        )
+
+    deleted = [
+        import_chat(user_id, folder.id, folder.name)
+        for folder in [root, child, grandchild]
+    ]
+    kept = [
+        import_chat(user_id, sibling.id, "sibling"),
+        import_chat(user_id, None, "unfiled"),
+        # Another user's chat that claims one of the folders
+        import_chat(other_user_id, child.id, "other"),
+    ]
+    Chats.upsert_message_to_chat_by_id_and_message_id(
+        deleted[2].id, "1", {"content": "pending"}
+    )
+
+    try:
+        assert Folders.delete_folder_by_id_and_user_id(root.id, user_id)
+
+        assert [folder.id for folder in Folders.get_folders_by_user_id(user_id)] == [
+            sibling.id
+        ]
+        for chat in deleted:
+            assert Chats.get_chat_by_id(chat.id) is None
+            assert Chats.get_pending_messages_by_chat_id(chat.id) == []
+        for chat in kept:
+            assert Chats.get_chat_by_id(chat.id) is not None
+
+        assert {
+            chat.title
+            for chat in Chats.get_chat_list_by_user_id_and_tag_name(user_id, "work")
+        } == {"sibling", "unfiled"}
+        assert not Folders.delete_folder_by_id_and_user_id(root.id, user_id)
+    finally:
+        Chats.delete_chats_by_user_id(user_id)
+        Chats.delete_chats_by_user_id(other_user_id)
+        Folders.delete_folder_by_id_and_user_id(sibling.id, user_id)
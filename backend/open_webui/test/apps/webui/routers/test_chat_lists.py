@@ -0,0 +1,41 @@
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import open_webui.config  # noqa: F401, runs the migrations
+from open_webui.models.chats import ChatForm, Chats
+from open_webui.routers import chats
+from test.util.mock_user import mock_user
+
+app = FastAPI()
+app.include_router(chats.router, prefix="/api/v1/chats")
+
+
+def test_pinned_chats_keep_chat_fields():
+    user_id = str(uuid.uuid4())
+    chat = Chats.insert_new_chat(user_id, ChatForm(chat={"title": "pinned"}))
+    Chats.toggle_chat_pinned_by_id(chat.id)
+
+    client = TestClient(app)
+    try:
+        with mock_user(app, id=user_id):
+            response = client.get("/api/v1/chats/pinned")
+        assert response.status_code == 200
+
+        (pinned,) = response.json()
+        assert "chat" not in pinned
+        assert pinned == {
+            "id": chat.id,
+            "user_id": user_id,
+            "title": "pinned",
+            "updated_at": pinned["updated_at"],
+            "created_at": chat.created_at,
+            "share_id": None,
+            "archived": False,
+            "pinned": True,
+            "meta": {},
+            "folder_id": None,
+        }
+    finally:
+        Chats.delete_chats_by_user_id(user_id)
@@ -0,0 +1,48 @@
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import open_webui.config  # noqa: F401, runs the migrations
+from open_webui.models.folders import Folders
+from open_webui.routers import folders
+from test.util.mock_user import mock_user
+
+app = FastAPI()
+app.include_router(folders.router, prefix="/api/v1/folders")
+
+
+def test_move_folder_into_its_subtree():
+    user_id = str(uuid.uuid4())
+    root = Folders.insert_new_folder(user_id, "root")
+    child = Folders.insert_new_folder(user_id, "child", root.id)
+    grandchild = Folders.insert_new_folder(user_id, "grandchild", child.id)
+    other = Folders.insert_new_folder(user_id, "other")
+
+    def move(id, parent_id):
+        return client.post(
+            f"/api/v1/folders/{id}/update/parent", json={"parent_id": parent_id}
+        )
+
+    client = TestClient(app)
+    try:
+        with mock_user(app, id=user_id):
+            for parent_id in [root.id, grandchild.id]:
+                response = move(root.id, parent_id)
+                assert response.status_code == 400
+                assert "cannot be moved into itself" in response.json()["detail"]
+            assert (
+                Folders.get_folder_by_id_and_user_id(root.id, user_id).parent_id is None
+            )
+
+            # Moving into an unrelated folder, or back to the top level, works
+            assert move(child.id, other.id).status_code == 200
+            assert move(root.id, grandchild.id).status_code == 200
+            assert move(child.id, None).status_code == 200
+            assert (
+                Folders.get_folder_by_id_and_user_id(child.id, user_id).parent_id
+                is None
+            )
+    finally:
+        for folder in [child, other]:
+            Folders.delete_folder_by_id_and_user_id(folder.id, user_id)
@@ -0,0 +1,133 @@
+import json
+import uuid
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import open_webui.config  # noqa: F401, runs the migrations
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.models.auths import Auths
+from open_webui.models.users import Users
+from open_webui.routers import auths
+from test.util.mock_user import mock_user
+
+app = FastAPI()
+app.include_router(auths.router, prefix="/api/v1/auths")
+
+
+@pytest.fixture
+def domain():
+    domain = f"{uuid.uuid4().hex}.example.com"
+    yield domain
+    for user in Users.get_users():
+        if user.email.endswith(f"@{domain}"):
+            Users.delete_user_by_id(user.id)
+
+
+def import_users(filename, content, content_type="text/plain"):
+    client = TestClient(app)
+    with mock_user(app, role="admin"):
+        response = client.post(
+            "/api/v1/auths/add/bulk",
+            files={"file": (filename, content.encode(), content_type)},
+        )
+    assert response.status_code == 200
+    *results, summary = [json.loads(line) for line in response.text.splitlines()]
+    return results, summary
+
+
+def test_import_csv(domain):
+    Auths.insert_new_auth(f"taken@{domain}", "password", "Taken")
+
+    results, summary = import_users(
+        "users.csv",
+        "Name,Email,Password,Role\n"
+        f"Alice,Alice@{domain},secret,admin\n"
+        f"Bob,bob@{domain},secret\n"
+        f"Alice again,alice@{domain},secret,user\n"
+        f"Taken,taken@{domain},secret,user\n"
+        f"Extra,extra@{domain},secret,user,extra\n"
+        f"Mallory,mallory@{domain},secret,owner\n"
+        ",no-name,secret,user\n",
+    )
+
+    assert [(r["row"], r["status"]) for r in results] == [
+        (2, "created"),
+        (3, "created"),
+        (4, "error"),
+        (5, "error"),
+        (6, "error"),
+        (7, "error"),
+        (8, "error"),
+    ]
+    assert results[2]["detail"] == ERROR_MESSAGES.DEFAULT("Duplicate email in file")
+    assert results[3]["detail"] == ERROR_MESSAGES.EMAIL_TAKEN
+    assert results[4]["detail"] == "Invalid row"
+    assert summary == {"created": 2, "failed": 5}
+
+    alice = Users.get_user_by_email(f"alice@{domain}")
+    assert alice.id == results[0]["id"] and alice.role == "admin"
+    assert Auths.authenticate_user(f"alice@{domain}", "secret").id == alice.id
+    assert Users.get_user_by_email(f"extra@{domain}") is None
+
+
+def test_import_jsonl(domain):
+    results, summary = import_users(
+        "users.jsonl",
+        json.dumps({"name": "Carol", "email": f"carol@{domain}", "password": "s"})
+        + "\n\nnot json\n[1, 2]\n"
+        + json.dumps({"name": "Dave", "email": f"dave@{domain}"})
+        + "\n",
+    )
+
+    assert [(r["row"], r["status"]) for r in results] == [
+        (1, "created"),
+        (3, "error"),
+        (4, "error"),
+        (5, "error"),
+    ]
+    assert results[1]["detail"] == "Invalid JSON"
+    assert results[2]["detail"] == "Invalid row"
+    assert results[3]["email"] == f"dave@{domain}"
+    assert "password" in results[3]["detail"]
+    assert summary == {"created": 1, "failed": 3}
+
+
+def test_failed_batch_does_not_stop_the_import(domain, monkeypatch):
+    monkeypatch.setattr(auths, "USER_IMPORT_BATCH_SIZE", 2)
+
+    insert_new_auths = Auths.insert_new_auths
+    batches = []
+
+    def fail_second_batch(form_data):
+        batches.append([form.email for form in form_data])
+        if len(batches) == 2:
+            raise Exception("insert failed")
+        return insert_new_auths(form_data)
+
+    monkeypatch.setattr(Auths, "insert_new_auths", fail_second_batch)
+
+    emails = [f"user{i}@{domain}" for i in range(5)]
+    results, summary = import_users(
+        "users.csv",
+        "name,email,password\n" + "".join(f"U,{email},p\n" for email in emails),
+    )
+
+    assert batches == [emails[:2], emails[2:4], emails[4:]]
+    assert [r["status"] for r in results] == [
+        "created",
+        "created",
+        "error",
+        "error",
+        "created",
+    ]
+    assert results[2]["detail"] == ERROR_MESSAGES.CREATE_USER_ERROR
+    assert summary == {"created": 3, "failed": 2}
+    assert [Users.get_user_by_email(email) is not None for email in emails] == [
+        True,
+        True,
+        False,
+        False,
+        True,
+    ]
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import random
+import time
+
+import pytest
+
+from open_webui.socket.utils import (
+    PresenceBroadcaster,
+    RedisUsagePool,
+    RedisUserPool,
+    UsagePool,
+    UserPool,
+    get_redis,
+)
+
+WORKERS = 4
+USERS = 200
+SESSIONS = 4000
+
+REDIS_URL = os.environ.get("WEBSOCKET_REDIS_URL", "redis://localhost:6379/0")
+
+
+async def redis_available():
+    client = get_redis(REDIS_URL)
+    try:
+        return await client.ping()
+    except Exception:
+        return False
+    finally:
+        await client.aclose()
+
+
+async def simulate(pools):
+    # Each session connects through a random worker, and half of them later
+    # disconnect through another one, all interleaved
+    rng = random.Random(0)
+    sessions = [(f"user-{i % USERS}", f"sid-{i}") for i in range(SESSIONS)]
+    disconnected = set(rng.sample(range(SESSIONS), SESSIONS // 2))
+    joins, leaves = 0, 0
+
+    async def session(i, user_id, sid):
+        nonlocal joins, leaves
+        joins += await rng.choice(pools).add(user_id, sid)
+        await asyncio.sleep(0)
+        if i in disconnected:
+            leaves += await rng.choice(pools).remove(user_id, sid)
+
+    await asyncio.gather(
+        *[session(i, user_id, sid) for i, (user_id, sid) in enumerate(sessions)]
+    )
+
+    expected = {}
+    for i, (user_id, sid) in enumerate(sessions):
+        if i not in disconnected:
+            expected.setdefault(user_id, set()).add(sid)
+    return expected, joins - leaves
+
+
+async def check(pools):
+    expected, connected = await simulate(pools)
+
+    # Every user still connected joined once more than they left
+    assert connected == len(expected)
+
+    pool = pools[0]
+    assert set(await pool.user_ids()) == set(expected)
+    for i in range(USERS):
+        user_id = f"user-{i}"
+        assert set(await pool.get(user_id)) == expected.get(user_id, set())
+        assert await pool.contains(user_id) == (user_id in expected)
+
+    # Disconnecting every remaining session leaves no user connected
+    for user_id, sids in expected.items():
+        await asyncio.gather(*[pools[-1].remove(user_id, sid) for sid in sids])
+    assert await pool.user_ids() == []
+
+
+def test_memory_user_pool_connect_disconnect_storm():
+    # Workers of a single-node deployment share the in-process pool
+    pool = UserPool()
+    asyncio.run(check([pool] * WORKERS))
+
+
+def test_redis_user_pool_connect_disconnect_storm():
+    async def run():
+        if not await redis_available():
+            pytest.skip(f"Redis is not reachable at {REDIS_URL}")
+
+        # One client (and connection pool) per simulated worker
+        clients = [get_redis(REDIS_URL) for _ in range(WORKERS)]
+        name = f"open-webui:test:user_sessions:{time.time_ns()}"
+        try:
+            await check([RedisUserPool(client, name) for client in clients])
+        finally:
+            keys = [name] + [f"{name}:user-{i}" for i in range(USERS)]
+            await clients[0].delete(*keys)
+            for client in clients:
+                await client.aclose()
+
+    asyncio.run(run())
+
+
+async def check_usage(pool):
+    await pool.touch("idle", "a", 0)
+    await pool.touch("busy", "a", 0)
+    await pool.touch("busy", "b", 90)
+    assert await pool.remove_expired(100, 20)
+    assert await pool.model_ids() == ["busy"]
+
+    # A session touching a model whose sessions have all expired keeps it in use
+    await pool.touch("busy", "c", 115)
+    assert await pool.remove_expired(115, 20)
+    assert await pool.model_ids() == ["busy"]
+
+    assert await pool.remove_expired(200, 20)
+    assert await pool.model_ids() == []
+    assert not await pool.remove_expired(200, 20)
+
+
+def test_memory_usage_pool_expiry():
+    asyncio.run(check_usage(UsagePool()))
+
+
+def test_redis_usage_pool_expiry():
+    async def run():
+        if not await redis_available():
+            pytest.skip(f"Redis is not reachable at {REDIS_URL}")
+
+        client = get_redis(REDIS_URL)
+        name = f"open-webui:test:usage_models:{time.time_ns()}"
+        try:
+            await check_usage(RedisUsagePool(client, name))
+        finally:
+            await client.delete(name, f"{name}:idle", f"{name}:busy")
+            await client.aclose()
+
+    asyncio.run(run())
+
+
+def test_presence_changes_during_a_flush_are_emitted():
+    async def run():
+        emitted = []
+        emitting, release = asyncio.Event(), asyncio.Event()
+
+        async def emit(event, data):
+            emitted.append((event, data))
+            emitting.set()
+            await release.wait()
+
+        presence = PresenceBroadcaster(
+            emit, get_user_ids=None, get_model_ids=None, interval=0
+        )
+
+        presence.user_joined("a")
+        await emitting.wait()
+
+        # Arrives while the first delta is being emitted
+        presence.user_left("b")
+        release.set()
+
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        assert emitted == [
+            ("user-list", {"joined": ["a"], "left": []}),
+            ("user-list", {"joined": [], "left": ["b"]}),
+        ]
+        assert presence.task.done()
+
+    asyncio.run(run())
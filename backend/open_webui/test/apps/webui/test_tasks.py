@@ -0,0 +1,202 @@
+import asyncio
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from open_webui import tasks
+from open_webui.main import app
+from open_webui.tasks import (
+    TaskLimiter,
+    TaskLimitExceeded,
+    TaskRegistry,
+    create_task,
+    stop_task,
+)
+from test.util.mock_user import mock_user
+
+
+MAX_TASKS = 8
+MAX_QUEUE = 16
+MAX_USER_TASKS = 4
+USERS = 50
+
+
+class SlowTaskRegistry(TaskRegistry):
+    # Yields to the event loop like a Redis round trip would
+    async def add(self, task_id, task):
+        for _ in range(5):
+            await asyncio.sleep(0)
+        await super().add(task_id, task)
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = SlowTaskRegistry()
+    monkeypatch.setattr(tasks, "task_registry", registry)
+    return registry
+
+
+async def remote_task(registry, user_id):
+    # A task of another (live) worker, which only exists in the registry
+    task_id = str(uuid.uuid4())
+    await registry.add(
+        task_id,
+        {"worker": "other", "user_id": user_id, "chat_id": None, "created_at": 0},
+    )
+    return task_id
+
+
+def test_registry_tracks_running_tasks(registry):
+    async def run():
+        release = asyncio.Event()
+
+        async def work():
+            await release.wait()
+
+        async def noop():
+            pass
+
+        (a, task_a), (b, task_b) = [
+            await create_task(work(), user_id) for user_id in ["alice", "bob"]
+        ]
+        assert set(await tasks.list_tasks()) == {a, b}
+        assert await tasks.list_tasks("alice") == [a]
+        assert (await tasks.get_task(b))["user_id"] == "bob"
+
+        # A task that finishes at once is not left behind in the registry
+        short, task = await create_task(noop(), "alice")
+        await task
+        release.set()
+        await asyncio.gather(task_a, task_b)
+        await asyncio.gather(*tasks.cleanup_tasks)
+
+        assert await tasks.list_tasks() == []
+        assert tasks.tasks == {} and tasks.cleanup_tasks == set()
+        assert await tasks.get_task(short) is None
+
+    asyncio.run(run())
+
+
+def test_stop_local_task(registry):
+    async def run():
+        task_id, task = await create_task(asyncio.sleep(60), "alice")
+        result = await stop_task(task_id)
+        assert result["status"] is True
+        assert task.cancelled()
+
+        await asyncio.gather(*tasks.cleanup_tasks)
+        assert await tasks.list_tasks() == []
+
+        with pytest.raises(ValueError):
+            await stop_task(task_id)
+
+    asyncio.run(run())
+
+
+def test_stop_remote_task(registry, monkeypatch):
+    monkeypatch.setattr(tasks, "STOP_TASK_TIMEOUT", 0.3)
+
+    async def run():
+        # The other worker removes its task once it is stopped
+        stopped = await remote_task(registry, "alice")
+        asyncio.get_running_loop().call_later(
+            0.1, lambda: asyncio.ensure_future(registry.remove(stopped))
+        )
+        assert (await stop_task(stopped))["status"] is True
+
+        # Until then, the stop is only requested
+        result = await stop_task(await remote_task(registry, "alice"))
+        assert result["status"] is False
+        assert "not confirmed" in result["message"]
+
+    asyncio.run(run())
+
+
+def test_stop_task_endpoint_checks_owner(registry, monkeypatch):
+    monkeypatch.setattr(tasks, "STOP_TASK_TIMEOUT", 0)
+    task_id = asyncio.run(remote_task(registry, "alice"))
+
+    def stop(**user):
+        with mock_user(app, **user):
+            return client.post(f"/api/tasks/stop/{task_id}")
+
+    client = TestClient(app)
+    assert stop(id="bob").status_code == 401
+    assert stop(id="alice").status_code == 200
+    assert stop(id="admin", role="admin").status_code == 200
+
+    with mock_user(app, id="bob"):
+        assert client.get("/api/tasks").json() == {"tasks": []}
+        assert client.post(f"/api/tasks/stop/{uuid.uuid4()}").status_code == 404
+    with mock_user(app, id="admin", role="admin"):
+        assert client.get("/api/tasks").json() == {"tasks": [task_id]}
+
+
+def test_task_limiter_sheds_generation_spike(registry, monkeypatch):
+    async def run():
+        limiter = TaskLimiter(MAX_TASKS, MAX_QUEUE, MAX_USER_TASKS)
+        monkeypatch.setattr(tasks, "task_limiter", limiter)
+
+        started, peak = 0, 0
+        release = asyncio.Event()
+
+        async def generation():
+            nonlocal started, peak
+            started += 1
+            peak = max(peak, limiter.running)
+            await release.wait()
+
+        # Every user starts more generations at once than they are allowed
+        admitted, rejected = [], []
+        for i in range(USERS * MAX_USER_TASKS * 2):
+            try:
+                task_id, task = await create_task(
+                    generation(), user_id=f"user-{i % USERS}"
+                )
+                admitted.append((task_id, task))
+            except TaskLimitExceeded as e:
+                assert e.retry_after >= 1
+                rejected.append(e)
+
+        for _ in range(10):
+            await asyncio.sleep(0)
+        metrics = limiter.metrics()
+
+        assert len(admitted) == MAX_TASKS + MAX_QUEUE
+        assert started == metrics["running"] == MAX_TASKS
+        assert metrics["queued"] == MAX_QUEUE
+        assert metrics["rejected"] == len(rejected)
+        assert all(count <= MAX_USER_TASKS for count in limiter.users.values())
+
+        # Stopping queued tasks frees their slots without running them
+        for task_id, task in admitted[-4:]:
+            await stop_task(task_id)
+        assert limiter.queued == MAX_QUEUE - 4
+
+        release.set()
+        await asyncio.gather(*[task for _, task in admitted], return_exceptions=True)
+        await asyncio.gather(*tasks.cleanup_tasks)
+
+        assert started == len(admitted) - 4
+        assert peak == MAX_TASKS
+        assert limiter.metrics()["running"] == 0
+        assert limiter.queued == 0
+        assert limiter.users == {}
+        assert tasks.tasks == {}
+        assert await tasks.list_tasks() == []
+
+    asyncio.run(run())
+
+
+def test_task_limiter_per_user_limit():
+    limiter = TaskLimiter(0, 0, MAX_USER_TASKS)
+    for _ in range(MAX_USER_TASKS):
+        limiter.admit("user")
+    limiter.admit("other")
+
+    with pytest.raises(TaskLimitExceeded):
+        limiter.check("user")
+
+    limiter.release("user")
+    limiter.admit("user")
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from open_webui.routers import auths
+from open_webui.utils.auth import PasswordHashPool, verify_password
+from test.util.mock_user import mock_user
+
+MAX_WORKERS = 2
+LOGINS = 4
+
+
+def test_login_burst_runs_off_the_event_loop():
+    pool = PasswordHashPool(max_workers=MAX_WORKERS)
+    assert pool.metrics()["avg_wait"] == 0.0
+
+    # Each login holds its worker until the event loop has moved on
+    release = threading.Event()
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def login():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        assert release.wait(timeout=10)
+        with lock:
+            running -= 1
+        return True
+
+    async def run():
+        logins = asyncio.gather(*[pool.run(login) for _ in range(LOGINS)])
+
+        # The event loop keeps serving other requests meanwhile
+        ticks = 0
+        while running < MAX_WORKERS or ticks < 10:
+            await asyncio.sleep(0.001)
+            ticks += 1
+        assert not logins.done()
+        assert pool.stats["pending"] == LOGINS
+
+        release.set()
+        return await logins
+
+    assert asyncio.run(run()) == [True] * LOGINS
+    assert peak == MAX_WORKERS
+    assert pool.stats["completed"] == LOGINS and pool.stats["pending"] == 0
+
+    metrics = pool.metrics()
+    assert metrics["max_workers"] == MAX_WORKERS and metrics["completed"] == LOGINS
+    # The logins beyond MAX_WORKERS waited for a worker
+    assert metrics["avg_wait"] > 0 and metrics["avg_work"] > 0
+
+
+def test_hash_and_verify():
+    pool = PasswordHashPool(max_workers=MAX_WORKERS)
+
+    async def run():
+        hashes = await pool.hash_many(["a", "b"])
+        return (
+            hashes,
+            await pool.verify("a", hashes[0]),
+            await pool.verify("a", hashes[1]),
+        )
+
+    hashes, valid, invalid = asyncio.run(run())
+    assert verify_password("b", hashes[1])
+    assert valid and not invalid
+
+
+def test_metrics_endpoint(monkeypatch):
+    pool = PasswordHashPool(max_workers=MAX_WORKERS)
+    monkeypatch.setattr(auths, "password_hash_pool", pool)
+    asyncio.run(pool.hash("password"))
+
+    app = FastAPI()
+    app.include_router(auths.router, prefix="/api/v1/auths")
+    with mock_user(app, role="admin"):
+        response = TestClient(app).get("/api/v1/auths/admin/password/metrics")
+
+    assert response.status_code == 200
+    assert response.json() == {**pool.metrics(), "completed": 1, "pending": 0}
@@ -0,0 +1,165 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from fastapi import FastAPI, Request
+
+from open_webui.internal.cache import invalidation_bus
+from open_webui.models.models import ModelMeta, ModelModel, ModelParams
+from open_webui.models.users import UserModel
+from open_webui.routers import openai
+from open_webui.utils.http_client import HTTPClientRegistry
+from open_webui.utils.models import merge_custom_models, model_registry
+
+
+class CountingModel(dict):
+    # Counts the reads of a base model's fields, as a measure of merge work
+    reads = 0
+
+    def __getitem__(self, key):
+        CountingModel.reads += 1
+        return super().__getitem__(key)
+
+
+def get_models(count):
+    base_models = [
+        CountingModel(
+            {"id": f"model-{i}:latest", "name": f"Model {i}", "owned_by": "openai"}
+        )
+        for i in range(count)
+    ]
+
+    custom_models = []
+    for i in range(count):
+        custom_models.append(
+            ModelModel(
+                id=f"model-{i}" if i % 2 else f"preset-{i}",
+                user_id="user",
+                base_model_id=None if i % 2 else f"model-{i}",
+                name=f"Custom {i}",
+                params=ModelParams(),
+                meta=ModelMeta(),
+                is_active=i % 5 != 0,
+                updated_at=0,
+                created_at=0,
+            )
+        )
+
+    return base_models, custom_models
+
+
+def count_merge_reads(count):
+    base_models, custom_models = get_models(count)
+    CountingModel.reads = 0
+    merge_custom_models(base_models, custom_models)
+    return CountingModel.reads
+
+
+def test_merge_custom_models():
+    models = {model["id"]: model for model in merge_custom_models(*get_models(10))}
+
+    # Inactive overrides hide the base model, active ones rename it
+    assert "model-5:latest" not in models
+    assert models["model-1:latest"]["name"] == "Custom 1"
+
+    # Active presets inherit from their base model, inactive ones are skipped
+    assert models["preset-2"]["owned_by"] == "openai"
+    assert models["preset-2"]["preset"] is True
+    assert "preset-0" not in models
+
+
+def test_merge_custom_models_scales_linearly():
+    # Each model is looked up through the index, not compared with every other
+    # model, so 8x the models cost 8x the reads (a list scan would be ~64x)
+    assert count_merge_reads(4000) == count_merge_reads(500) * 8
+
+
+@pytest.fixture
+def upstream():
+    # An OpenAI-compatible server, counting the requests to each path
+    hits = {}
+
+    async def handle(request):
+        hits[request.path] = hits.get(request.path, 0) + 1
+        if request.path == "/v1/models":
+            return web.json_response({"data": [{"id": "gpt-test"}]})
+
+        body = await request.json()
+        return web.json_response(
+            {"choices": [{"message": {"content": f"hello from {body['model']}"}}]}
+        )
+
+    app = web.Application()
+    app.router.add_route("*", "/{path:.*}", handle)
+    return app, hits
+
+
+async def start_upstream(app):
+    server = TestServer(app, host="127.0.0.1")
+    await server.start_server()
+    return server, str(server.make_url("/v1"))
+
+
+def get_app(url):
+    app = FastAPI()
+    app.state.config = SimpleNamespace(
+        ENABLE_OPENAI_API=True,
+        OPENAI_API_BASE_URLS=[url],
+        OPENAI_API_KEYS=["key"],
+        OPENAI_API_CONFIGS={},
+    )
+    app.state.HTTP_CLIENTS = HTTPClientRegistry()
+    app.state.OPENAI_MODELS = {}
+    app.state.MODELS = {}
+    app.state.FUNCTIONS = {}
+    return app
+
+
+ADMIN = UserModel(
+    id="admin",
+    name="Admin",
+    email="admin@example.com",
+    role="admin",
+    profile_image_url="/user.png",
+    last_active_at=0,
+    updated_at=0,
+    created_at=0,
+)
+
+
+def test_worker_completes_with_model_lists_from_the_bus(upstream, monkeypatch):
+    async def run():
+        server, url = await start_upstream(upstream[0])
+        app = get_app(url)
+        monkeypatch.setattr(model_registry, "app", app)
+        monkeypatch.setattr(model_registry, "openai_models", None)
+        try:
+            # Another worker fetched the lists and shared them
+            invalidation_bus.publish(
+                "openai_models",
+                json.dumps([{"id": "gpt-test", "owned_by": "openai", "urlIdx": 0}]),
+            )
+
+            request = Request({"type": "http", "app": app})
+            response = await openai.generate_chat_completion(
+                request,
+                {"model": "gpt-test", "messages": [{"role": "user", "content": "hi"}]},
+                user=ADMIN,
+            )
+            assert response["choices"][0]["message"]["content"] == (
+                "hello from gpt-test"
+            )
+
+            # The model list is served from the shared lists, not re-fetched
+            for _ in range(3):
+                models = await openai.get_models(request, user=ADMIN)
+                assert [model["id"] for model in models["data"]] == ["gpt-test"]
+            assert upstream[1] == {"/v1/chat/completions": 1}
+        finally:
+            await app.state.HTTP_CLIENTS.close()
+            await server.close()
+
+    asyncio.run(run())
@@ -0,0 +1,60 @@
+import asyncio
+
+from open_webui.utils import webhook
+from open_webui.utils.http_client import HTTPClientRegistry
+from open_webui.utils.webhook import WebhookDispatcher
+
+DEAD_URL = "https://dead.example.com/hook"
+URLS = [f"https://{i}.example.com/hook" for i in range(3)]
+
+
+def test_dead_receiver_does_not_hold_up_other_webhooks(monkeypatch):
+    async def run():
+        delivered = []
+        dead_attempts = 0
+        release = asyncio.Event()
+
+        async def send_webhook(http_clients, url, message, event_data, timeout):
+            nonlocal dead_attempts
+            assert http_clients is registry
+            if url == DEAD_URL:
+                dead_attempts += 1
+                await release.wait()
+                return False
+            delivered.append((url, message))
+            return True
+
+        monkeypatch.setattr(webhook, "send_webhook", send_webhook)
+
+        registry = HTTPClientRegistry()
+        dispatcher = WebhookDispatcher(queue_size=10, max_retries=1, timeout=1)
+        dispatcher.start(registry)
+
+        assert dispatcher.enqueue(DEAD_URL, "dead", {})
+        for url in URLS:
+            assert dispatcher.enqueue(url, "first", {})
+            assert dispatcher.enqueue(url, "second", {})
+
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+        # Every other receiver got its webhooks, in order, while the dead one hangs
+        assert sorted(delivered) == sorted(
+            (url, message) for url in URLS for message in ["first", "second"]
+        )
+        assert [m for url, m in delivered if url == URLS[0]] == ["first", "second"]
+        assert dead_attempts == 1
+        assert list(dispatcher.workers) == [DEAD_URL]
+        assert dispatcher.pending == 1
+
+        # The queue bound covers all receivers
+        for i in range(9):
+            dispatcher.enqueue(URLS[0], str(i), {})
+        assert not dispatcher.enqueue(URLS[1], "dropped", {})
+
+        release.set()
+        await dispatcher.stop()
+        assert dispatcher.workers == {} and dispatcher.pending == 0
+        assert not dispatcher.enqueue(URLS[0], "stopped", {})
+
+    asyncio.run(run())
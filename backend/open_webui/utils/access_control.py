@@ -108,10 +108,6 @@ def get_users_with_access(
     permitted_user_ids = permission_access.get("user_ids", [])
 
     user_ids_with_access = set(permitted_user_ids)
-
-    for group_id in permitted_group_ids:
-        group_user_ids = Groups.get_group_user_ids_by_id(group_id)
-        if group_user_ids:
-            user_ids_with_access.update(group_user_ids)
+    user_ids_with_access.update(Groups.get_user_ids_by_group_ids(permitted_group_ids))
 
     return Users.get_users_by_user_ids(list(user_ids_with_access))
@@ -1,14 +1,19 @@
+import asyncio
 import logging
+import time
 import uuid
 import jwt
 
+from concurrent.futures import ThreadPoolExecutor
+
 from datetime import UTC, datetime, timedelta
 from typing import Optional, Union, List, Dict
 
 from open_webui.models.users import Users
+from open_webui.utils.last_active import last_active_buffer
 
 from open_webui.constants import ERROR_MESSAGES
-from open_webui.env import WEBUI_SECRET_KEY
+from open_webui.env import PASSWORD_HASH_MAX_WORKERS, SRC_LOG_LEVELS, WEBUI_SECRET_KEY
 
 from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -16,6 +21,9 @@ from passlib.context import CryptContext
 
 logging.getLogger("passlib").setLevel(logging.ERROR)
 
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
 
 SESSION_SECRET = WEBUI_SECRET_KEY
 ALGORITHM = "HS256"
@@ -38,6 +46,69 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
+class PasswordHashPool:
+    """
+    Runs bcrypt hashing and verification (~250ms each) on a bounded thread pool
+    so that login bursts queue up there instead of blocking the event loop.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="open-webui-password"
+        )
+        self.stats = {"pending": 0, "completed": 0, "wait": 0.0, "work": 0.0}
+
+    async def run(self, func, *args):
+        """
+        Runs `func`, typically one that calls `verify_password` or
+        `get_password_hash`, on the pool.
+        """
+        queued_at = time.perf_counter()
+
+        def timed():
+            started_at = time.perf_counter()
+            return func(*args), started_at, time.perf_counter()
+
+        loop = asyncio.get_running_loop()
+        self.stats["pending"] += 1
+        try:
+            result, started_at, finished_at = await loop.run_in_executor(
+                self.executor, timed
+            )
+        finally:
+            self.stats["pending"] -= 1
+
+        self.stats["completed"] += 1
+        self.stats["wait"] += started_at - queued_at
+        self.stats["work"] += finished_at - started_at
+
+        log.debug(f"Password hash pool: {self.metrics()}")
+        return result
+
+    def metrics(self) -> dict:
+        completed = self.stats["completed"]
+        return {
+            "max_workers": self.max_workers,
+            "pending": self.stats["pending"],
+            "completed": completed,
+            "avg_wait": self.stats["wait"] / completed if completed else 0.0,
+            "avg_work": self.stats["work"] / completed if completed else 0.0,
+        }
+
+    async def hash(self, password: str) -> str:
+        return await self.run(get_password_hash, password)
+
+    async def hash_many(self, passwords: list[str]) -> list[str]:
+        return await asyncio.gather(*[self.hash(password) for password in passwords])
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, plain_password, hashed_password)
+
+
+password_hash_pool = PasswordHashPool(max_workers=PASSWORD_HASH_MAX_WORKERS)
+
+
 def create_token(data: dict, expires_delta: Union[timedelta, None] = None) -> str:
     payload = data.copy()
 
@@ -121,14 +192,14 @@ def get_current_user(
         )
 
     if data is not None and "id" in data:
-        user = Users.get_user_by_id(data["id"])
+        user = Users.get_identity_by_id(data["id"])
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=ERROR_MESSAGES.INVALID_TOKEN,
             )
         else:
-            Users.update_user_last_active_by_id(user.id)
+            last_active_buffer.touch(user.id)
         return user
     else:
         raise HTTPException(
@@ -138,7 +209,7 @@ def get_current_user(
 
 
 def get_current_user_by_api_key(api_key: str):
-    user = Users.get_user_by_api_key(api_key)
+    user = Users.get_identity_by_api_key(api_key)
 
     if user is None:
         raise HTTPException(
@@ -146,7 +217,7 @@ def get_current_user_by_api_key(api_key: str):
             detail=ERROR_MESSAGES.INVALID_TOKEN,
         )
     else:
-        Users.update_user_last_active_by_id(user.id)
+        last_active_buffer.touch(user.id)
 
     return user
 
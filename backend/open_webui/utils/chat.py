@@ -18,6 +18,7 @@ from open_webui.routers.openai import (
 )
 
 
+from open_webui.internal.db import run_in_db_executor
 from open_webui.models.functions import Functions
 
 
@@ -52,7 +53,7 @@ async def generate_chat_completion(
     # Check if user has access to the model
     if not bypass_filter and user.role == "user":
         try:
-            check_model_access(user, model)
+            await run_in_db_executor(check_model_access, user, model)
         except Exception as e:
             raise e
 
@@ -79,8 +80,7 @@ async def chat_action(request: Request, action_id: str, form_data: dict, user: A
     if not action:
         raise Exception(f"Action not found: {action_id}")
 
-    if not request.app.state.MODELS:
-        await get_all_models(request)
+    await get_all_models(request)
     models = request.app.state.MODELS
 
     data = form_data
@@ -0,0 +1,62 @@
+import logging
+from urllib.parse import urlparse
+
+import aiohttp
+
+from open_webui.env import (
+    AIOHTTP_CLIENT_DNS_CACHE_TTL,
+    AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+    AIOHTTP_CLIENT_POOL_LIMIT,
+    AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["OPENAI"])
+
+
+class HTTPClientRegistry:
+    """
+    Keeps one pooled `aiohttp.ClientSession` per upstream origin for the lifetime of
+    the app, so requests to the same backend reuse keep-alive connections.
+    """
+
+    def __init__(
+        self,
+        limit: int = AIOHTTP_CLIENT_POOL_LIMIT,
+        limit_per_host: int = AIOHTTP_CLIENT_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = AIOHTTP_CLIENT_KEEPALIVE_TIMEOUT,
+        dns_cache_ttl: int = AIOHTTP_CLIENT_DNS_CACHE_TTL,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+
+        self.sessions: dict[str, aiohttp.ClientSession] = {}
+
+    def get_session(self, url: str) -> aiohttp.ClientSession:
+        parsed_url = urlparse(url)
+        origin = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+        session = self.sessions.get(origin)
+        if session is None or session.closed:
+            log.debug(f"Creating HTTP client session for {origin}")
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=self.dns_cache_ttl,
+                ),
+                trust_env=True,
+            )
+            self.sessions[origin] = session
+
+        return session
+
+    async def close(self):
+        sessions, self.sessions = self.sessions, {}
+        for origin, session in sessions.items():
+            log.debug(f"Closing HTTP client session for {origin}")
+            await session.close()
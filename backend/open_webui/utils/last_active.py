@@ -0,0 +1,54 @@
+import asyncio
+import logging
+import threading
+import time
+
+from open_webui.env import SRC_LOG_LEVELS, USER_LAST_ACTIVE_FLUSH_INTERVAL
+from open_webui.internal.db import run_in_db_executor
+from open_webui.models.users import Users
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["DB"])
+
+
+class LastActiveBuffer:
+    """
+    Records user activity in memory and writes it through
+    `Users.update_users_last_active` in one batch every `interval` seconds,
+    instead of an UPDATE per authenticated request.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+
+        # user_id -> latest activity timestamp not yet written
+        self.pending: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def touch(self, user_id: str):
+        with self.lock:
+            self.pending[user_id] = int(time.time())
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+
+        if not pending:
+            return
+
+        if not Users.update_users_last_active(pending):
+            # Keep the activity for the next flush, unless newer activity replaced it
+            with self.lock:
+                for user_id, timestamp in pending.items():
+                    self.pending.setdefault(user_id, timestamp)
+            return
+
+        log.debug(f"Flushed last activity of {len(pending)} users")
+
+    async def periodic_flush(self):
+        while True:
+            await asyncio.sleep(self.interval or 1)
+            await run_in_db_executor(self.flush)
+
+
+last_active_buffer = LastActiveBuffer(interval=USER_LAST_ACTIVE_FLUSH_INTERVAL)
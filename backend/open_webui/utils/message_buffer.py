@@ -0,0 +1,132 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Optional
+
+from open_webui.env import (
+    CHAT_SAVE_FLUSH_BYTES,
+    CHAT_SAVE_FLUSH_INTERVAL,
+    SRC_LOG_LEVELS,
+)
+from open_webui.internal.db import run_in_db_executor
+from open_webui.models.chats import Chats
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["DB"])
+
+
+class BufferedMessage:
+    def __init__(self):
+        # Last known state of the message (database + buffered updates)
+        self.message: Optional[dict] = None
+        # Updates not yet written to the database
+        self.pending: dict = {}
+        self.pending_bytes = 0
+        self.sizes: dict = {}
+
+        self.dirty_at: Optional[float] = None
+        self.updated_at = time.monotonic()
+
+        # Keeps writes for the same message in order
+        self.lock = asyncio.Lock()
+
+
+class MessageWriteBuffer:
+    """
+    Coalesces message updates per (chat_id, message_id) and writes them through
+    `Chats.upsert_message_to_chat_by_id_and_message_id` once `interval` seconds
+    have passed or `max_bytes` of new data has accumulated.
+    """
+
+    def __init__(self, interval: float, max_bytes: int):
+        self.interval = interval
+        self.max_bytes = max_bytes
+
+        self.entries: dict[tuple[str, str], BufferedMessage] = {}
+        self.stats = {"updates": 0, "writes": 0}
+
+    def get_pending_bytes(self) -> int:
+        return sum(entry.pending_bytes for entry in self.entries.values())
+
+    async def get_message(self, chat_id: str, message_id: str) -> dict:
+        entry = self.entries.setdefault((chat_id, message_id), BufferedMessage())
+        if entry.message is None:
+            message = await run_in_db_executor(
+                Chats.get_message_by_id_and_message_id, chat_id, message_id
+            )
+            entry.message = {**(message or {}), **entry.pending}
+
+        return {**entry.message}
+
+    async def update(self, chat_id: str, message_id: str, message: dict):
+        entry = self.entries.setdefault((chat_id, message_id), BufferedMessage())
+
+        for key, value in message.items():
+            size = len(json.dumps(value))
+            entry.pending_bytes += max(size - entry.sizes.get(key, 0), 0)
+            entry.sizes[key] = size
+
+        entry.pending.update(message)
+        if entry.message is not None:
+            entry.message.update(message)
+
+        now = time.monotonic()
+        if entry.dirty_at is None:
+            entry.dirty_at = now
+        entry.updated_at = now
+        self.stats["updates"] += 1
+
+        if (
+            entry.pending_bytes >= self.max_bytes
+            or now - entry.dirty_at >= self.interval
+        ):
+            await self._write(chat_id, message_id, entry)
+
+    async def flush(self, chat_id: str, message_id: str):
+        entry = self.entries.pop((chat_id, message_id), None)
+        if entry is not None:
+            await self._write(chat_id, message_id, entry)
+
+    async def flush_all(self):
+        for chat_id, message_id in list(self.entries.keys()):
+            await self.flush(chat_id, message_id)
+
+    async def _write(self, chat_id: str, message_id: str, entry: BufferedMessage):
+        async with entry.lock:
+            if not entry.pending:
+                return
+
+            pending, pending_bytes = entry.pending, entry.pending_bytes
+            entry.pending, entry.pending_bytes, entry.dirty_at = {}, 0, None
+
+            await run_in_db_executor(
+                Chats.upsert_message_to_chat_by_id_and_message_id,
+                chat_id,
+                message_id,
+                pending,
+            )
+            self.stats["writes"] += 1
+
+        log.debug(
+            f"Flushed {pending_bytes} bytes for message {message_id} in chat {chat_id} "
+            f"(updates: {self.stats['updates']}, writes: {self.stats['writes']})"
+        )
+
+    async def periodic_flush(self):
+        while True:
+            await asyncio.sleep(self.interval or 1)
+
+            now = time.monotonic()
+            for key, entry in list(self.entries.items()):
+                if entry.dirty_at is not None and now - entry.dirty_at >= self.interval:
+                    await self._write(*key, entry)
+
+                # Drop messages that are no longer being streamed
+                if now - entry.updated_at >= self.interval and not entry.pending:
+                    self.entries.pop(key, None)
+
+
+message_buffer = MessageWriteBuffer(
+    interval=CHAT_SAVE_FLUSH_INTERVAL, max_bytes=CHAT_SAVE_FLUSH_BYTES
+)
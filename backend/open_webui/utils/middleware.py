@@ -11,6 +11,7 @@ from open_webui.env import (
     GLOBAL_LOG_LEVEL,
     SRC_LOG_LEVELS,
 )
+from open_webui.internal.db import run_in_db_executor
 from open_webui.models.chats import Chats
 from open_webui.models.functions import Functions
 from open_webui.models.users import Users
@@ -20,10 +21,11 @@ from open_webui.socket.main import (
     get_event_call,
     get_event_emitter,
 )
-from open_webui.tasks import create_task
+from open_webui.tasks import TaskLimitExceeded, create_task
 from open_webui.utils.misc import (
     get_message_list,
 )
+from open_webui.utils.message_buffer import message_buffer
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.webhook import post_webhook
 from starlette.responses import StreamingResponse
@@ -63,9 +65,9 @@ async def chat_completion_filter_functions_handler(request, body, model, extra_p
         filter_ids.sort(key=get_priority)
         return filter_ids
 
-    filter_ids = get_filter_function_ids(model)
+    filter_ids = await run_in_db_executor(get_filter_function_ids, model)
     for filter_id in filter_ids:
-        filter = Functions.get_function_by_id(filter_id)
+        filter = await run_in_db_executor(Functions.get_function_by_id, filter_id)
         if not filter:
             continue
 
@@ -81,7 +83,9 @@ async def chat_completion_filter_functions_handler(request, body, model, extra_p
 
         # Apply valves to the function
         if hasattr(function_module, "valves") and hasattr(function_module, "Valves"):
-            valves = Functions.get_function_valves_by_id(filter_id)
+            valves = await run_in_db_executor(
+                Functions.get_function_valves_by_id, filter_id
+            )
             function_module.valves = function_module.Valves(
                 **(valves if valves else {})
             )
@@ -103,10 +107,13 @@ async def chat_completion_filter_functions_handler(request, body, model, extra_p
 
                 if "__user__" in params and hasattr(function_module, "UserValves"):
                     try:
+                        user_valves = await run_in_db_executor(
+                            Functions.get_user_valves_by_id_and_user_id,
+                            filter_id,
+                            params["__user__"]["id"],
+                        )
                         params["__user__"]["valves"] = function_module.UserValves(
-                            **Functions.get_user_valves_by_id_and_user_id(
-                                filter_id, params["__user__"]["id"]
-                            )
+                            **user_valves
                         )
                     except Exception as e:
                         print(e)
@@ -195,7 +202,9 @@ async def process_chat_response(
     request, response, form_data, user, events, metadata, tasks
 ):
     async def background_tasks_handler():
-        message_map = Chats.get_messages_by_chat_id(metadata["chat_id"])
+        message_map = await run_in_db_executor(
+            Chats.get_messages_by_chat_id, metadata["chat_id"]
+        )
         message = message_map.get(metadata["message_id"]) if message_map else None
         if not message:
             return
@@ -229,7 +238,9 @@ async def process_chat_response(
                     if not title:
                         title = messages[0].get("content", "New Chat")
 
-                    Chats.update_chat_title_by_id(metadata["chat_id"], title)
+                    await run_in_db_executor(
+                        Chats.update_chat_title_by_id, metadata["chat_id"], title
+                    )
 
                     if event_emitter:
                         await event_emitter(
@@ -241,7 +252,9 @@ async def process_chat_response(
             elif len(messages) == 2:
                 title = messages[0].get("content", "New Chat")
 
-                Chats.update_chat_title_by_id(metadata["chat_id"], title)
+                await run_in_db_executor(
+                    Chats.update_chat_title_by_id, metadata["chat_id"], title
+                )
                 if event_emitter:
                     await event_emitter(
                         {
@@ -263,7 +276,7 @@ async def process_chat_response(
             return response
 
         if "selected_model_id" in response:
-            Chats.upsert_message_to_chat_by_id_and_message_id(
+            await message_buffer.update(
                 metadata["chat_id"],
                 metadata["message_id"],
                 {
@@ -282,7 +295,9 @@ async def process_chat_response(
                     }
                 )
 
-                title = Chats.get_chat_title_by_id(metadata["chat_id"])
+                title = await run_in_db_executor(
+                    Chats.get_chat_title_by_id, metadata["chat_id"]
+                )
 
                 await event_emitter(
                     {
@@ -296,17 +311,23 @@ async def process_chat_response(
                 )
 
                 # Save message in the database
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+                await message_buffer.update(
                     metadata["chat_id"],
                     metadata["message_id"],
                     {
                         "content": content,
                     },
                 )
+                await message_buffer.flush(metadata["chat_id"], metadata["message_id"])
+                await run_in_db_executor(
+                    Chats.compact_messages_by_chat_id, metadata["chat_id"]
+                )
 
                 # Send a webhook notification if the user is not active
-                if get_active_status_by_user_id(user.id) is None:
-                    webhook_url = Users.get_user_webhook_url_by_id(user.id)
+                if not await get_active_status_by_user_id(user.id):
+                    webhook_url = await run_in_db_executor(
+                        Users.get_user_webhook_url_by_id, user.id
+                    )
                     if webhook_url:
                         post_webhook(
                             webhook_url,
@@ -350,7 +371,7 @@ async def process_chat_response(
 
     # Handle as a background task
     async def post_response_handler(response, events):
-        message = Chats.get_message_by_id_and_message_id(
+        message = await message_buffer.get_message(
             metadata["chat_id"], metadata["message_id"]
         )
         content = message.get("content", "") if message else ""
@@ -365,7 +386,7 @@ async def process_chat_response(
                 )
 
                 # Save message in the database
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+                await message_buffer.update(
                     metadata["chat_id"],
                     metadata["message_id"],
                     {
@@ -392,7 +413,7 @@ async def process_chat_response(
                     data = json.loads(data)
 
                     if "selected_model_id" in data:
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        await message_buffer.update(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -410,7 +431,7 @@ async def process_chat_response(
 
                             if ENABLE_REALTIME_CHAT_SAVE:
                                 # Save message in the database
-                                Chats.upsert_message_to_chat_by_id_and_message_id(
+                                await message_buffer.update(
                                     metadata["chat_id"],
                                     metadata["message_id"],
                                     {
@@ -437,12 +458,14 @@ async def process_chat_response(
                     else:
                         continue
 
-            title = Chats.get_chat_title_by_id(metadata["chat_id"])
+            title = await run_in_db_executor(
+                Chats.get_chat_title_by_id, metadata["chat_id"]
+            )
             data = {"done": True, "content": content, "title": title}
 
             if not ENABLE_REALTIME_CHAT_SAVE:
                 # Save message in the database
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+                await message_buffer.update(
                     metadata["chat_id"],
                     metadata["message_id"],
                     {
@@ -450,9 +473,17 @@ async def process_chat_response(
                     },
                 )
 
+            # Fold the pending message updates into the chat
+            await message_buffer.flush(metadata["chat_id"], metadata["message_id"])
+            await run_in_db_executor(
+                Chats.compact_messages_by_chat_id, metadata["chat_id"]
+            )
+
             # Send a webhook notification if the user is not active
-            if get_active_status_by_user_id(user.id) is None:
-                webhook_url = Users.get_user_webhook_url_by_id(user.id)
+            if not await get_active_status_by_user_id(user.id):
+                webhook_url = await run_in_db_executor(
+                    Users.get_user_webhook_url_by_id, user.id
+                )
                 if webhook_url:
                     post_webhook(
                         webhook_url,
@@ -479,7 +510,7 @@ async def process_chat_response(
 
             if not ENABLE_REALTIME_CHAT_SAVE:
                 # Save message in the database
-                Chats.upsert_message_to_chat_by_id_and_message_id(
+                await message_buffer.update(
                     metadata["chat_id"],
                     metadata["message_id"],
                     {
@@ -487,9 +518,24 @@ async def process_chat_response(
                     },
                 )
 
+            await message_buffer.flush(metadata["chat_id"], metadata["message_id"])
+            await run_in_db_executor(
+                Chats.compact_messages_by_chat_id, metadata["chat_id"]
+            )
+
         if response.background is not None:
             await response.background()
 
     # background_tasks.add_task(post_response_handler, response, events)
-    task_id, _ = create_task(post_response_handler(response, events))
+    try:
+        task_id, _ = await create_task(
+            post_response_handler(response, events),
+            user_id=user.id,
+            chat_id=metadata.get("chat_id"),
+        )
+    except TaskLimitExceeded:
+        # Release the upstream stream, which the handler would have consumed
+        if response.background is not None:
+            await response.background()
+        raise
     return {"status": True, "task_id": task_id}
@@ -1,6 +1,10 @@
+import asyncio
+import json
 import logging
+import random
 import time
 import sys
+from typing import Optional
 
 from fastapi import Request
 
@@ -9,14 +13,19 @@ from open_webui.functions import get_function_models
 
 
 from open_webui.models.functions import Functions
-from open_webui.models.models import Models
+from open_webui.models.models import Models, ModelModel
 
 
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.access_control import has_access
 
 
-from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+from open_webui.internal.cache import invalidation_bus
+from open_webui.env import (
+    MODEL_LIST_REFRESH_INTERVAL,
+    SRC_LOG_LEVELS,
+    GLOBAL_LOG_LEVEL,
+)
 
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
@@ -42,81 +51,97 @@ async def get_all_base_models(request: Request):
     return models
 
 
-async def get_all_models(request):
-    t_start = time.time()
-    models = await get_all_base_models(request)
-    t_end = time.time()
-    log.info(f"get_all_models() took {t_end - t_start} seconds")
+def merge_custom_models(models: list[dict], custom_models: list[ModelModel]):
+    """
+    Applies custom models to the base model list: custom models without a base
+    model override (or hide) the base models they match, the others are added
+    as presets. Models are matched on their id or on their id without the
+    ":tag" suffix, both looked up through an index rather than a list scan.
+    """
+    index: dict[str, list[dict]] = {}
+    removed = set()
 
-    # If there are no models, return an empty list
-    if len(models) == 0:
-        return []
+    def add_to_index(model):
+        for key in dict.fromkeys([model["id"], model["id"].split(":")[0]]):
+            index.setdefault(key, []).append(model)
 
-    global_action_ids = [
-        function.id for function in Functions.get_global_action_functions()
-    ]
-    enabled_action_ids = [
-        function.id
-        for function in Functions.get_functions_by_type("action", active_only=True)
-    ]
+    def find_models(key):
+        return [model for model in index.get(key, []) if id(model) not in removed]
+
+    for model in models:
+        add_to_index(model)
 
-    custom_models = Models.get_all_models()
     for custom_model in custom_models:
         if custom_model.base_model_id is None:
-            for model in models:
-                if (
-                    custom_model.id == model["id"]
-                    or custom_model.id == model["id"].split(":")[0]
-                ):
-                    if custom_model.is_active:
-                        model["name"] = custom_model.name
-                        model["info"] = custom_model.model_dump()
-
-                        action_ids = []
-                        if "info" in model and "meta" in model["info"]:
-                            action_ids.extend(
-                                model["info"]["meta"].get("actionIds", [])
-                            )
-
-                        model["action_ids"] = action_ids
-                    else:
-                        models.remove(model)
-
-        elif custom_model.is_active and (
-            custom_model.id not in [model["id"] for model in models]
+            for model in find_models(custom_model.id):
+                if custom_model.is_active:
+                    model["name"] = custom_model.name
+                    model["info"] = custom_model.model_dump()
+
+                    action_ids = []
+                    if "info" in model and "meta" in model["info"]:
+                        action_ids.extend(model["info"]["meta"].get("actionIds", []))
+
+                    model["action_ids"] = action_ids
+                else:
+                    removed.add(id(model))
+
+        elif custom_model.is_active and not any(
+            model["id"] == custom_model.id for model in find_models(custom_model.id)
         ):
             owned_by = "openai"
             pipe = None
             action_ids = []
 
-            for model in models:
-                if (
-                    custom_model.base_model_id == model["id"]
-                    or custom_model.base_model_id == model["id"].split(":")[0]
-                ):
-                    owned_by = model["owned_by"]
-                    if "pipe" in model:
-                        pipe = model["pipe"]
-                    break
+            base_models = find_models(custom_model.base_model_id)
+            if base_models:
+                owned_by = base_models[0]["owned_by"]
+                if "pipe" in base_models[0]:
+                    pipe = base_models[0]["pipe"]
 
             if custom_model.meta:
                 meta = custom_model.meta.model_dump()
                 if "actionIds" in meta:
                     action_ids.extend(meta["actionIds"])
 
-            models.append(
-                {
-                    "id": f"{custom_model.id}",
-                    "name": custom_model.name,
-                    "object": "model",
-                    "created": custom_model.created_at,
-                    "owned_by": owned_by,
-                    "info": custom_model.model_dump(),
-                    "preset": True,
-                    **({"pipe": pipe} if pipe is not None else {}),
-                    "action_ids": action_ids,
-                }
-            )
+            model = {
+                "id": f"{custom_model.id}",
+                "name": custom_model.name,
+                "object": "model",
+                "created": custom_model.created_at,
+                "owned_by": owned_by,
+                "info": custom_model.model_dump(),
+                "preset": True,
+                **({"pipe": pipe} if pipe is not None else {}),
+                "action_ids": action_ids,
+            }
+            models.append(model)
+            add_to_index(model)
+
+    return [model for model in models if id(model) not in removed]
+
+
+async def build_all_models(request: Request, openai_models: list[dict]):
+    t_start = time.time()
+    function_models = await get_function_models(request)
+    log.info(f"get_function_models() took {time.time() - t_start} seconds")
+
+    # Copy the upstream models, they are shared across builds
+    models = function_models + [{**model} for model in openai_models]
+
+    # If there are no models, return an empty list
+    if len(models) == 0:
+        return []
+
+    global_action_ids = [
+        function.id for function in Functions.get_global_action_functions()
+    ]
+    enabled_action_ids = [
+        function.id
+        for function in Functions.get_functions_by_type("action", active_only=True)
+    ]
+
+    models = merge_custom_models(models, Models.get_all_models())
 
     # Process action_ids to get the actions
     def get_action_items_from_module(function, module):
@@ -168,12 +193,111 @@ async def get_all_models(request):
             model["actions"].extend(
                 get_action_items_from_module(action_function, function_module)
             )
-    log.debug(f"get_all_models() returned {len(models)} models")
-
-    request.app.state.MODELS = {model["id"]: model for model in models}
+    log.debug(f"build_all_models() returned {len(models)} models")
     return models
 
 
+class ModelRegistry:
+    """
+    Serves the merged model list from a snapshot that is rebuilt once per
+    generation. Model and function changes bump the generation (on every
+    worker, through the invalidation bus) and the next caller rebuilds the
+    snapshot while concurrent callers wait for the same rebuild.
+
+    Upstream /models lists are refreshed in the background and shared with the
+    other workers, so a rebuild never waits on upstream servers unless no list
+    has been fetched yet or the connection settings changed.
+    """
+
+    def __init__(self, refresh_interval: int):
+        self.refresh_interval = refresh_interval
+
+        self.generation = 0
+        self.snapshot_generation = -1
+        self.models: list[dict] = []
+
+        self.openai_models: Optional[list[dict]] = None
+        self.openai_models_refreshed_at = 0.0
+
+        self.task: Optional[asyncio.Task] = None
+        self.app = None
+
+        invalidation_bus.subscribe("models", lambda _: self.invalidate())
+        invalidation_bus.subscribe("functions", lambda _: self.invalidate())
+        invalidation_bus.subscribe("openai_models", self._set_openai_models)
+
+    def invalidate(self):
+        self.generation += 1
+
+    def _set_openai_models(self, payload: Optional[str]):
+        # No payload means the upstream lists must be fetched again
+        if payload is None:
+            self.openai_models = None
+        else:
+            self.openai_models = json.loads(payload)
+            self.openai_models_refreshed_at = time.monotonic()
+
+            # Workers that did not fetch the lists route completions with them too
+            if self.app is not None:
+                self.app.state.OPENAI_MODELS = {
+                    model["id"]: model for model in self.openai_models
+                }
+        self.invalidate()
+
+    async def refresh_openai_models(self, request: Request):
+        openai_models = []
+        if request.app.state.config.ENABLE_OPENAI_API:
+            openai_models = (await openai.get_all_models(request))["data"]
+
+        invalidation_bus.publish("openai_models", json.dumps(openai_models))
+
+    async def get_models(self, request: Request) -> list[dict]:
+        while self.snapshot_generation != self.generation:
+            if self.task is None or self.task.done():
+                self.task = asyncio.create_task(self._build(request))
+            await asyncio.shield(self.task)
+
+        return list(self.models)
+
+    async def get_openai_models(self, request: Request) -> list[dict]:
+        await self.get_models(request)
+        return list(self.openai_models or [])
+
+    async def _build(self, request: Request):
+        if self.openai_models is None:
+            await self.refresh_openai_models(request)
+
+        generation = self.generation
+        models = await build_all_models(request, self.openai_models or [])
+
+        self.models = models
+        self.snapshot_generation = generation
+        request.app.state.MODELS = {model["id"]: model for model in models}
+
+    async def periodic_refresh(self, app):
+        self.app = app
+        request = Request({"type": "http", "app": app})
+        while True:
+            # Jitter so that a single worker refreshes and shares the lists
+            await asyncio.sleep(self.refresh_interval * random.uniform(0.5, 1))
+
+            if (
+                time.monotonic() - self.openai_models_refreshed_at
+                >= self.refresh_interval
+            ):
+                try:
+                    await self.refresh_openai_models(request)
+                except Exception as e:
+                    log.exception(f"Failed to refresh model lists: {e}")
+
+
+model_registry = ModelRegistry(refresh_interval=MODEL_LIST_REFRESH_INTERVAL)
+
+
+async def get_all_models(request: Request) -> list[dict]:
+    return await model_registry.get_models(request)
+
+
 def check_model_access(user, model):
     if model.get("arena"):
         if not has_access(
@@ -185,7 +309,7 @@ def check_model_access(user, model):
         ):
             raise Exception("Model not found")
     else:
-        model_info = Models.get_model_by_id(model.get("id"))
+        model_info = next(iter(Models.get_models_by_ids([model.get("id")])), None)
         if not model_info:
             raise Exception("Model not found")
         elif not (
@@ -37,7 +37,7 @@ from open_webui.config import (
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import WEBUI_SESSION_COOKIE_SAME_SITE, WEBUI_SESSION_COOKIE_SECURE
 from open_webui.utils.misc import parse_duration
-from open_webui.utils.auth import get_password_hash, create_token
+from open_webui.utils.auth import create_token, password_hash_pool
 from open_webui.utils.webhook import post_webhook
 
 log = logging.getLogger(__name__)
@@ -284,7 +284,7 @@ class OAuthManager:
 
                 user = Auths.insert_new_auth(
                     email=email,
-                    password=get_password_hash(
+                    password=await password_hash_pool.hash(
                         str(uuid.uuid4())
                     ),  # Random password, not used
                     name=user_data.get(username_claim, "User"),
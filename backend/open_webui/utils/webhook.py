@@ -1,60 +1,176 @@
+import asyncio
 import json
 import logging
+from collections import deque
+from typing import Optional
 
-import requests
+import aiohttp
 from open_webui.config import WEBUI_FAVICON_URL, WEBUI_NAME
-from open_webui.env import SRC_LOG_LEVELS, VERSION
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    VERSION,
+    WEBHOOK_MAX_RETRIES,
+    WEBHOOK_QUEUE_SIZE,
+    WEBHOOK_TIMEOUT,
+)
+from open_webui.utils.http_client import HTTPClientRegistry
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["WEBHOOK"])
 
 
-def post_webhook(url: str, message: str, event_data: dict) -> bool:
-    try:
-        log.debug(f"post_webhook: {url}, {message}, {event_data}")
-        payload = {}
-
-        # Slack and Google Chat Webhooks
-        if "https://hooks.slack.com" in url or "https://chat.googleapis.com" in url:
-            payload["text"] = message
-        # Discord Webhooks
-        elif "https://discord.com/api/webhooks" in url:
-            payload["content"] = (
-                message
-                if len(message) < 2000
-                else f"{message[: 2000 - 20]}... (truncated)"
-            )
-        # Microsoft Teams Webhooks
-        elif "webhook.office.com" in url:
-            action = event_data.get("action", "undefined")
-            facts = [
-                {"name": name, "value": value}
-                for name, value in json.loads(event_data.get("user", {})).items()
-            ]
-            payload = {
-                "@type": "MessageCard",
-                "@context": "http://schema.org/extensions",
-                "themeColor": "0076D7",
-                "summary": message,
-                "sections": [
-                    {
-                        "activityTitle": message,
-                        "activitySubtitle": f"{WEBUI_NAME} ({VERSION}) - {action}",
-                        "activityImage": WEBUI_FAVICON_URL,
-                        "facts": facts,
-                        "markdown": True,
-                    }
-                ],
-            }
-        # Default Payload
-        else:
-            payload = {**event_data}
+def get_webhook_payload(url: str, message: str, event_data: dict) -> dict:
+    payload = {}
+
+    # Slack and Google Chat Webhooks
+    if "https://hooks.slack.com" in url or "https://chat.googleapis.com" in url:
+        payload["text"] = message
+    # Discord Webhooks
+    elif "https://discord.com/api/webhooks" in url:
+        payload["content"] = (
+            message if len(message) < 2000 else f"{message[: 2000 - 20]}... (truncated)"
+        )
+    # Microsoft Teams Webhooks
+    elif "webhook.office.com" in url:
+        action = event_data.get("action", "undefined")
+        facts = [
+            {"name": name, "value": value}
+            for name, value in json.loads(event_data.get("user", {})).items()
+        ]
+        payload = {
+            "@type": "MessageCard",
+            "@context": "http://schema.org/extensions",
+            "themeColor": "0076D7",
+            "summary": message,
+            "sections": [
+                {
+                    "activityTitle": message,
+                    "activitySubtitle": f"{WEBUI_NAME} ({VERSION}) - {action}",
+                    "activityImage": WEBUI_FAVICON_URL,
+                    "facts": facts,
+                    "markdown": True,
+                }
+            ],
+        }
+    # Default Payload
+    else:
+        payload = {**event_data}
+
+    return payload
+
+
+class WebhookDispatcher:
+    """
+    Delivers webhooks in the background, so a slow receiver never blocks the
+    request or stream that triggered it. Each receiver URL has its own queue
+    and worker, so retries and timeouts of one endpoint do not hold up the
+    webhooks to the others; at most `queue_size` webhooks are pending overall.
+    """
+
+    def __init__(self, queue_size: int, max_retries: int, timeout: int):
+        self.queue_size = queue_size
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self.http_clients: Optional[HTTPClientRegistry] = None
+        # url -> (message, event_data) pending delivery to that url
+        self.queues: dict[str, deque] = {}
+        self.workers: dict[str, asyncio.Task] = {}
+        self.pending = 0
+
+    def start(self, http_clients: HTTPClientRegistry):
+        self.http_clients = http_clients
+
+    async def stop(self):
+        if self.workers:
+            # Give queued webhooks a chance to go out before shutting down
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*self.workers.values(), return_exceptions=True),
+                    timeout=self.timeout,
+                )
+            except asyncio.TimeoutError:
+                log.warning(f"Dropping {self.pending} undelivered webhooks")
+
+        self.queues.clear()
+        self.workers.clear()
+        self.pending = 0
+        self.http_clients = None
+
+    def enqueue(self, url: str, message: str, event_data: dict) -> bool:
+        if self.http_clients is None:
+            log.warning(f"Webhook dispatcher is not running, dropping webhook to {url}")
+            return False
+
+        if self.pending >= self.queue_size:
+            log.warning(f"Webhook queue is full, dropping webhook to {url}")
+            return False
 
+        self.queues.setdefault(url, deque()).append((message, event_data))
+        self.pending += 1
+        if url not in self.workers:
+            self.workers[url] = asyncio.create_task(self.run(url))
+        return True
+
+    async def run(self, url: str):
+        queue = self.queues[url]
+        try:
+            while queue:
+                message, event_data = queue[0]
+                try:
+                    for attempt in range(self.max_retries + 1):
+                        if await send_webhook(
+                            self.http_clients, url, message, event_data, self.timeout
+                        ):
+                            break
+
+                        if attempt < self.max_retries:
+                            await asyncio.sleep(2**attempt)
+                    else:
+                        log.error(
+                            f"Giving up on webhook to {url} after {self.max_retries + 1} attempts"
+                        )
+                finally:
+                    queue.popleft()
+                    self.pending -= 1
+        finally:
+            self.workers.pop(url, None)
+            self.queues.pop(url, None)
+
+
+async def send_webhook(
+    http_clients: HTTPClientRegistry,
+    url: str,
+    message: str,
+    event_data: dict,
+    timeout: int = WEBHOOK_TIMEOUT,
+) -> bool:
+    try:
+        log.debug(f"send_webhook: {url}, {message}, {event_data}")
+        payload = get_webhook_payload(url, message, event_data)
         log.debug(f"payload: {payload}")
-        r = requests.post(url, json=payload)
-        r.raise_for_status()
-        log.debug(f"r.text: {r.text}")
+
+        session = http_clients.get_session(url)
+        async with session.post(
+            url, json=payload, timeout=aiohttp.ClientTimeout(total=timeout)
+        ) as r:
+            r.raise_for_status()
+            log.debug(f"r.text: {await r.text()}")
         return True
     except Exception as e:
         log.exception(e)
         return False
+
+
+webhook_dispatcher = WebhookDispatcher(
+    queue_size=WEBHOOK_QUEUE_SIZE,
+    max_retries=WEBHOOK_MAX_RETRIES,
+    timeout=WEBHOOK_TIMEOUT,
+)
+
+
+def post_webhook(url: str, message: str, event_data: dict) -> bool:
+    """
+    Queues a webhook for background delivery; returns False if the queue is full.
+    """
+    return webhook_dispatcher.enqueue(url, message, event_data)